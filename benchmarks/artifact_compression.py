@@ -0,0 +1,117 @@
+"""Compares uploading artifact files uncompressed and compressed with each available codec to a local stub server.
+
+The files resemble typical artifacts: a pickled tree ensemble (node arrays with repeated feature indices and
+quantized thresholds) and a CSV dataset. The stub server limits the bandwidth (default 12.5 MiB/s, i.e. 100 Mbit/s),
+because compression only pays off if the network is slower than the compressor.
+
+Usage: python -m benchmarks.artifact_compression [size in MiB] [bandwidth in MiB/s]
+"""
+import array
+import io
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cloudpickle
+
+from mlaide import _compression
+from mlaide._api_client import Client
+from mlaide._api_client.api import artifact_api
+from mlaide._file_utils import BufferReader, ChunkedFileReader
+from mlaide.model import InMemoryArtifactFile
+
+
+class StubServer(object):
+    """Accepts file uploads on localhost with limited bandwidth and counts the received bytes"""
+
+    def __init__(self, bandwidth: float):
+        self.received_bytes = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                length = int(self.headers['Content-Length'])
+                start = time.perf_counter()
+                received = 0
+                while received < length:
+                    received += len(self.rfile.read(min(length - received, 64 * 1024)))
+                    time.sleep(max(0.0, start + received / bandwidth - time.perf_counter()))
+                server.received_bytes += int(self.headers['Content-Length'])
+                self.send_response(204)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.__http_server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}'.format(self.__http_server.server_address[1])
+        threading.Thread(target=self.__http_server.serve_forever, daemon=True).start()
+
+    def shutdown(self):
+        self.__http_server.shutdown()
+        self.__http_server.server_close()
+
+
+def create_model_file(size: int) -> bytes:
+    rng = random.Random(42)
+    nodes = size // 24
+    model = {
+        'feature': array.array('q', (rng.randrange(30) for _ in range(nodes))),
+        'threshold': array.array('d', (round(rng.gauss(0, 1), 2) for _ in range(nodes))),
+        'children': array.array('q', (rng.choice((-1, rng.randrange(nodes))) for _ in range(nodes))),
+    }
+    return cloudpickle.dumps(model)
+
+
+def create_csv_file(size: int) -> bytes:
+    rng = random.Random(42)
+    lines = ['sepal_length,sepal_width,petal_length,petal_width,species']
+    length = 0
+    while length < size:
+        line = '{:.1f},{:.1f},{:.1f},{:.1f},{}'.format(rng.uniform(4, 8), rng.uniform(2, 4.5), rng.uniform(1, 7),
+                                                       rng.uniform(0.1, 2.5), rng.choice(('setosa', 'versicolor')))
+        lines.append(line)
+        length += len(line) + 1
+    return '\n'.join(lines).encode('utf-8')
+
+
+def upload(client: Client, file_name: str, file) -> None:
+    artifact_api.upload_file(client=client, project_key='benchmark', artifact_name='artifact', artifact_version=1,
+                             filename=file_name, file_hash='hash', file=file)
+
+
+def measure(server: StubServer, client: Client, file_name: str, content: bytes, codec):
+    server.received_bytes = 0
+    start = time.perf_counter()
+    if codec is None:
+        # Iterating a BytesIO yields lines, chunks keep the comparison fair
+        upload(client, file_name, BufferReader(content))
+    else:
+        with _compression.compressed_copy(InMemoryArtifactFile(file_name, io.BytesIO(content)), codec) as path, \
+                ChunkedFileReader(open(path, 'rb')) as file:
+            upload(client, file_name, file)
+    duration = time.perf_counter() - start
+
+    print(f'{file_name:<10} {codec or "none":<5} {server.received_bytes / 1024 / 1024:8.2f} MiB sent, '
+          f'{len(content) / max(server.received_bytes, 1):5.1f}x, {duration:7.3f} s')
+
+
+if __name__ == '__main__':
+    file_size = int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 32 * 1024 * 1024
+    bytes_per_second = float(sys.argv[2]) * 1024 * 1024 if len(sys.argv) > 2 else 12.5 * 1024 * 1024
+    codecs = [None, 'gzip'] + (['zstd'] if _compression.zstandard is not None else [])
+
+    stub_server = StubServer(bytes_per_second)
+    api_client = Client(base_url=stub_server.url)
+    try:
+        for name, data in [('model.pkl', create_model_file(file_size)), ('data.csv', create_csv_file(file_size))]:
+            for compression_codec in codecs:
+                measure(stub_server, api_client, name, data, compression_codec)
+    finally:
+        api_client.close()
+        stub_server.shutdown()
@@ -0,0 +1,71 @@
+"""Compares the precompiled DTO codec with `dataclasses_json` for the DTOs of the hot API calls.
+
+Usage: python -m benchmarks.dto_codec
+"""
+import json
+import time
+from datetime import datetime, timezone
+
+from dataclasses_json import DataClassJsonMixin
+
+from mlaide._api_client import _json
+from mlaide._api_client.dto import ArtifactDto, GitDto, RunDto, StatusDto
+from mlaide._api_client.dto.artifact_dto import ArtifactFileDto, ModelDto
+from mlaide._api_client.dto.artifact_ref_dto import ArtifactRefDto
+from mlaide._api_client.dto.experiment_ref_dto import ExperimentRefDto
+
+
+def create_run() -> RunDto:
+    now = datetime.now(timezone.utc)
+    return RunDto(created_at=now,
+                  experiment_refs=[ExperimentRefDto('experiment')],
+                  git=GitDto(is_dirty=False, commit_time=now, commit_hash='0' * 40, repository_uri='repo'),
+                  key=1,
+                  metrics={f'metric-{i}': i / 10 for i in range(20)},
+                  name='run',
+                  parameters={f'param-{i}': i for i in range(10)},
+                  start_time=now,
+                  status=StatusDto.RUNNING,
+                  used_artifacts=[ArtifactRefDto('dataset', 1)])
+
+
+def create_artifact() -> ArtifactDto:
+    now = datetime.now(timezone.utc)
+    return ArtifactDto(created_at=now,
+                       files=[ArtifactFileDto(str(i), f'file-{i}.bin') for i in range(100)],
+                       metadata={'key': 'value'},
+                       model=ModelDto(created_at=now, stage='PRODUCTION'),
+                       name='model',
+                       type='model',
+                       updated_at=now,
+                       version=1)
+
+
+def measure(name: str, function, iterations: int):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    duration = time.perf_counter() - start
+    print(f'{name:<40} {duration / iterations * 1e6:10.1f} us')
+
+
+def main():
+    iterations = 2000
+    for dto in [create_run(), create_artifact()]:
+        cls = type(dto)
+        d = dto.to_dict()
+        content = json.dumps(dto.to_dict(encode_json=True)).encode('utf-8')
+
+        measure(f'{cls.__name__} encode dataclasses_json',
+                lambda: {k: v for k, v in dto.to_dict().items() if v is not None}, iterations)
+        measure(f'{cls.__name__} encode codec', dto.to_dict_without_none_values, iterations)
+        measure(f'{cls.__name__} decode dataclasses_json',
+                lambda: DataClassJsonMixin.from_dict.__func__(cls, d), iterations)
+        measure(f'{cls.__name__} decode codec', lambda: cls.from_dict(d), iterations)
+        measure(f'{cls.__name__} parse json', lambda: json.loads(content), iterations)
+        measure(f'{cls.__name__} parse {"orjson" if _json.orjson else "json"}', lambda: _json.loads(content),
+                iterations)
+
+
+if __name__ == '__main__':
+    main()
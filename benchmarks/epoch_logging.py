@@ -0,0 +1,61 @@
+"""Compares the cost of logging epoch metrics with the previous full-history strategy.
+
+Usage: python -m benchmarks.epoch_logging [epochs]
+"""
+import json
+import sys
+import time
+from typing import Any, Dict
+from unittest import mock
+
+from mlaide.active_run import ActiveRun
+from mlaide.model import Experiment, Run
+
+
+def log_epochs_with_full_history(epochs: int) -> int:
+    """The previous implementation: rebuild the epoch dict and send the whole history on every epoch."""
+    metrics: Dict[str, Any] = {}
+    sent_bytes = 0
+    for epoch in range(epochs):
+        if metrics.get('loss'):
+            new_dict = dict(metrics.get('loss'))
+            new_dict.update({str(epoch): 1 / (epoch + 1)})
+            metrics['loss'] = new_dict
+        else:
+            metrics['loss'] = {str(epoch): 1 / (epoch + 1)}
+        sent_bytes += len(json.dumps({'loss': metrics['loss']}))
+
+    return sent_bytes
+
+
+def log_epochs_with_active_run(epochs: int) -> int:
+    sent_bytes = 0
+
+    def update_run_metrics(*, metrics, **_):
+        nonlocal sent_bytes
+        sent_bytes += len(json.dumps(metrics))
+
+    with mock.patch('mlaide.active_run.run_api') as run_api, \
+            mock.patch('mlaide.active_run.dto_to_run', return_value=Run(key=1)), \
+            mock.patch('mlaide.active_run.run_to_dto'):
+        run_api.update_run_metrics.side_effect = update_run_metrics
+        active_run = ActiveRun(api_client=mock.Mock(), project_key='benchmark', experiment=Experiment(),
+                               run_name='benchmark')
+
+        for epoch in range(epochs):
+            active_run.log_metric_epoch('loss', str(epoch), 1 / (epoch + 1))
+
+    return sent_bytes
+
+
+def measure(name: str, fn, epochs: int):
+    start = time.perf_counter()
+    sent_bytes = fn(epochs)
+    duration = time.perf_counter() - start
+    print(f'{name:<14} {epochs} epochs: {sent_bytes / 1024 / 1024:10.2f} MiB sent, {duration:8.3f} s')
+
+
+if __name__ == '__main__':
+    number_of_epochs = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    measure('full history', log_epochs_with_full_history, number_of_epochs)
+    measure('delta', log_epochs_with_active_run, number_of_epochs)
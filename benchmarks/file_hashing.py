@@ -0,0 +1,53 @@
+"""Measures file hashing throughput of artifacts with many small files and with few large files.
+
+Usage: python -m benchmarks.file_hashing
+"""
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import List
+
+from mlaide import _file_utils
+
+
+def create_files(directory: Path, count: int, size: int) -> List[str]:
+    directory.mkdir()
+    files = []
+    for i in range(count):
+        path = directory / f'file-{i}.bin'
+        path.write_bytes(os.urandom(size))
+        files.append(str(path))
+    return files
+
+
+def measure(layout: str, files: List[str], max_workers: int, buffer_size: int):
+    total_size = sum(os.path.getsize(file) for file in files)
+    hash_file = partial(_file_utils.calculate_checksum_of_file, buffer_size=buffer_size)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(hash_file, files))
+    duration = time.perf_counter() - start
+
+    throughput = total_size / 1024 / 1024 / duration
+    print(f'{layout:<14} workers={max_workers:<3} buffer={buffer_size // 1024:>5} KiB: {throughput:10.1f} MiB/s')
+
+
+def main():
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        layouts = [
+            ('2000 x 64 KiB', create_files(Path(tmp, 'small'), 2000, 64 * 1024)),
+            ('4 x 128 MiB', create_files(Path(tmp, 'large'), 4, 128 * 1024 * 1024))
+        ]
+        for layout, files in layouts:
+            measure(layout, files, max_workers=1, buffer_size=8 * 1024)
+            measure(layout, files, max_workers=1, buffer_size=_file_utils.DEFAULT_BUFFER_SIZE)
+            measure(layout, files, max_workers=workers, buffer_size=_file_utils.DEFAULT_BUFFER_SIZE)
+
+
+if __name__ == '__main__':
+    main()
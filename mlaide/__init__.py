@@ -1,3 +1,61 @@
-from .active_artifact import ActiveArtifact
-from .active_run import ActiveRun
-from .client import *
+import importlib
+from typing import TYPE_CHECKING
+
+# The public classes are imported on first access, so that `import mlaide` does not pay for the synchronous and the
+# asynchronous client (and their dependencies) when only one of them is used.
+_lazy_attributes = {
+    'ActiveArtifact': '.active_artifact',
+    'ActiveExperiment': '.active_experiment',
+    'ActiveRun': '.active_run',
+    'ArtifactCacheStats': '.model',
+    'AsyncActiveArtifact': '.async_active_artifact',
+    'AsyncActiveExperiment': '.async_active_experiment',
+    'AsyncActiveRun': '.async_active_run',
+    'AsyncMLAideClient': '.async_client',
+    'AuthenticatedClient': '._api_client',
+    'BackgroundWriterOptions': '.background_writer',
+    'BackpressureStrategy': '.background_writer',
+    'Client': '._api_client',
+    'ConnectionOptions': '.connection_options',
+    'EndpointStats': '.model',
+    'LatencyHistogram': '.model',
+    'MLAideClient': '.client',
+    'ModelFlavor': '.model_flavor',
+    'ModelStage': '.model',
+    'ModelWatcher': '.model_watcher',
+    'RequestEvent': '.model',
+    'SweepTrialResult': '.model',
+    'register_model_flavor': '.model_flavor',
+}
+
+__all__ = list(_lazy_attributes)
+
+if TYPE_CHECKING:
+    from ._api_client import AuthenticatedClient, Client
+    from .active_artifact import ActiveArtifact
+    from .active_experiment import ActiveExperiment
+    from .active_run import ActiveRun
+    from .async_active_artifact import AsyncActiveArtifact
+    from .async_active_experiment import AsyncActiveExperiment
+    from .async_active_run import AsyncActiveRun
+    from .async_client import AsyncMLAideClient
+    from .background_writer import BackgroundWriterOptions, BackpressureStrategy
+    from .client import MLAideClient
+    from .connection_options import ConnectionOptions
+    from .model import ArtifactCacheStats, EndpointStats, LatencyHistogram, ModelStage, RequestEvent, \
+        SweepTrialResult
+    from .model_flavor import ModelFlavor, register_model_flavor
+    from .model_watcher import ModelWatcher
+
+
+def __getattr__(name: str):
+    if name not in _lazy_attributes:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_lazy_attributes[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
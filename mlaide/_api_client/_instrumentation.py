@@ -0,0 +1,84 @@
+"""Aggregates the requests to the ML Aide server per endpoint.
+
+Every function of `api` and `async_api` is decorated with `endpoint`, which names the endpoint of the requests it
+sends (e.g. `artifact_api.upload_file`). The transport of the HTTP clients (see `_transport`) measures each request
+and passes a `RequestEvent` to the `Client`, which adds it to its `RequestStats` and forwards it to its listeners.
+"""
+import copy
+import functools
+import inspect
+from contextvars import ContextVar
+from threading import Lock
+from typing import Callable, Dict, Optional, TypeVar
+
+from mlaide.model import EndpointStats, RequestEvent
+
+UNKNOWN_ENDPOINT = 'unknown'
+
+_current_endpoint: ContextVar[Optional[str]] = ContextVar('mlaide_endpoint', default=None)
+
+F = TypeVar('F', bound=Callable)
+
+
+def endpoint(func: F) -> F:
+    """Names the endpoint of all requests that are sent by the decorated (sync or async) function"""
+    name = '{}.{}'.format(func.__module__.rsplit('.', 1)[-1], func.__name__)
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            token = _current_endpoint.set(name)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _current_endpoint.reset(token)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        token = _current_endpoint.set(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _current_endpoint.reset(token)
+
+    return wrapper
+
+
+def current_endpoint() -> str:
+    return _current_endpoint.get() or UNKNOWN_ENDPOINT
+
+
+class RequestStats(object):
+    """Thread-safe latency histograms, byte and error counts per endpoint"""
+
+    __endpoints: Dict[str, EndpointStats]
+    __lock: Lock
+
+    def __init__(self):
+        self.__endpoints = {}
+        self.__lock = Lock()
+
+    def add(self, event: RequestEvent):
+        with self.__lock:
+            stats = self.__endpoints.get(event.endpoint)
+            if stats is None:
+                stats = self.__endpoints[event.endpoint] = EndpointStats(endpoint=event.endpoint)
+
+            stats.requests += 1
+            stats.errors += 1 if event.failed else 0
+            stats.request_bytes += event.request_bytes
+            stats.response_bytes += event.response_bytes
+            if event.time_to_first_byte is not None:
+                stats.time_to_first_byte.add(event.time_to_first_byte)
+            stats.duration.add(event.duration)
+
+    def snapshot(self, reset: bool = False) -> Dict[str, EndpointStats]:
+        """Returns a copy of the stats of all endpoints and optionally starts over"""
+        with self.__lock:
+            if reset:
+                endpoints, self.__endpoints = self.__endpoints, {}
+                return endpoints
+
+            return copy.deepcopy(self.__endpoints)
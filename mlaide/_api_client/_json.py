@@ -0,0 +1,15 @@
+"""Parses JSON responses with `orjson`, if it is installed, and falls back to the standard library otherwise."""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(content: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(content)
+
+    return json.loads(content)
@@ -0,0 +1,184 @@
+"""Transports for the pooled HTTP clients that measure every request.
+
+The HTTP clients are created by httpx as usual, so that proxies from the environment (HTTP_PROXY, HTTPS_PROXY, ...)
+are still used. Afterwards their transport and the transports of all proxies are wrapped to record the time to the
+first byte (the response headers), the total time until the response body was read and the size of the request and
+response bodies. httpcore does not expose the time of DNS resolution and connecting, so these are part of the time to
+the first byte of the first request on a connection.
+"""
+from time import perf_counter
+from typing import Callable, Tuple, TypeVar, Union
+
+import httpcore
+import httpx
+
+from ._instrumentation import current_endpoint
+from mlaide.model import RequestEvent
+
+OnRequest = Callable[[RequestEvent], None]
+
+C = TypeVar('C', bound=Union[httpx.Client, httpx.AsyncClient])
+
+
+def instrument(httpx_client: C, on_request: OnRequest) -> C:
+    """Wraps the transport and the proxy transports of an HTTP client, so that every request is passed to
+    `on_request`. Passing a transport to the client instead would disable the proxies from the environment, and httpx
+    0.16 has no public way to replace the proxy transports (`mounts` was added in httpx 0.18).
+
+    The attributes are private to httpx, which is therefore restricted to 0.16.x in pyproject.toml. If they do not
+    exist, the client is returned as it is and requests are not measured.
+    """
+    if not hasattr(httpx_client, '_transport') or not isinstance(getattr(httpx_client, '_proxies', None), dict):
+        return httpx_client
+
+    wrap = AsyncInstrumentedTransport if isinstance(httpx_client, httpx.AsyncClient) else InstrumentedTransport
+    httpx_client._transport = wrap(httpx_client._transport, on_request)
+    httpx_client._proxies = {pattern: None if transport is None else wrap(transport, on_request)
+                             for pattern, transport in httpx_client._proxies.items()}
+    return httpx_client
+
+
+def _create_event(method: bytes, url: Tuple[bytes, bytes, int, bytes]) -> RequestEvent:
+    scheme, host, port, path = url
+    # The query is left out, it may contain values that should not end up in a metrics system
+    target = '{}://{}{}{}'.format(scheme.decode('ascii'), host.decode('ascii'), f':{port}' if port else '',
+                                  path.split(b'?', 1)[0].decode('ascii'))
+    return RequestEvent(endpoint=current_endpoint(), method=method.decode('ascii'), url=target)
+
+
+class _RequestStream(httpcore.SyncByteStream, httpcore.AsyncByteStream):
+    """Counts the bytes of a request body while it is sent"""
+
+    def __init__(self, stream, event: RequestEvent):
+        self.__stream = stream
+        self.__event = event
+
+    def __iter__(self):
+        for chunk in self.__stream:
+            self.__event.request_bytes += len(chunk)
+            yield chunk
+
+    async def __aiter__(self):
+        async for chunk in self.__stream:
+            self.__event.request_bytes += len(chunk)
+            yield chunk
+
+
+class _Measurement(object):
+    """Completes the event of a request when its response was closed and reports it once"""
+
+    def __init__(self, event: RequestEvent, start: float, on_request: OnRequest):
+        self.event = event
+        self.start = start
+        self.__on_request = on_request
+        self.__reported = False
+
+    def fail(self, e: BaseException):
+        self.event.error = type(e).__name__
+
+    def report(self):
+        if self.__reported:
+            return
+
+        self.__reported = True
+        self.event.duration = perf_counter() - self.start
+        self.__on_request(self.event)
+
+
+class _ResponseStream(httpcore.SyncByteStream):
+    def __init__(self, stream: httpcore.SyncByteStream, measurement: _Measurement):
+        self.__stream = stream
+        self.__measurement = measurement
+
+    def __iter__(self):
+        try:
+            for chunk in self.__stream:
+                self.__measurement.event.response_bytes += len(chunk)
+                yield chunk
+        except Exception as e:
+            self.__measurement.fail(e)
+            raise
+
+    def close(self):
+        try:
+            self.__stream.close()
+        finally:
+            self.__measurement.report()
+
+
+class _AsyncResponseStream(httpcore.AsyncByteStream):
+    def __init__(self, stream: httpcore.AsyncByteStream, measurement: _Measurement):
+        self.__stream = stream
+        self.__measurement = measurement
+
+    async def __aiter__(self):
+        try:
+            async for chunk in self.__stream:
+                self.__measurement.event.response_bytes += len(chunk)
+                yield chunk
+        except Exception as e:
+            self.__measurement.fail(e)
+            raise
+
+    async def aclose(self):
+        try:
+            await self.__stream.aclose()
+        finally:
+            self.__measurement.report()
+
+
+class InstrumentedTransport(httpcore.SyncHTTPTransport):
+    __transport: httpcore.SyncHTTPTransport
+    __on_request: OnRequest
+
+    def __init__(self, transport: httpcore.SyncHTTPTransport, on_request: OnRequest):
+        self.__transport = transport
+        self.__on_request = on_request
+
+    def request(self, method, url, headers=None, stream=None, ext=None):
+        measurement = _Measurement(_create_event(method, url), perf_counter(), self.__on_request)
+        if stream is not None:
+            stream = _RequestStream(stream, measurement.event)
+
+        try:
+            status_code, headers, response_stream, ext = self.__transport.request(method, url, headers, stream, ext)
+        except Exception as e:
+            measurement.fail(e)
+            measurement.report()
+            raise
+
+        measurement.event.status_code = status_code
+        measurement.event.time_to_first_byte = perf_counter() - measurement.start
+        return status_code, headers, _ResponseStream(response_stream, measurement), ext
+
+    def close(self):
+        self.__transport.close()
+
+
+class AsyncInstrumentedTransport(httpcore.AsyncHTTPTransport):
+    __transport: httpcore.AsyncHTTPTransport
+    __on_request: OnRequest
+
+    def __init__(self, transport: httpcore.AsyncHTTPTransport, on_request: OnRequest):
+        self.__transport = transport
+        self.__on_request = on_request
+
+    async def arequest(self, method, url, headers=None, stream=None, ext=None):
+        measurement = _Measurement(_create_event(method, url), perf_counter(), self.__on_request)
+        if stream is not None:
+            stream = _RequestStream(stream, measurement.event)
+
+        try:
+            status_code, headers, response_stream, ext = await self.__transport.arequest(method, url, headers, stream,
+                                                                                         ext)
+        except Exception as e:
+            measurement.fail(e)
+            measurement.report()
+            raise
+
+        measurement.event.status_code = status_code
+        measurement.event.time_to_first_byte = perf_counter() - measurement.start
+        return status_code, headers, _AsyncResponseStream(response_stream, measurement), ext
+
+    async def aclose(self):
+        await self.__transport.aclose()
@@ -1,5 +1,15 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, TYPE_CHECKING
+
 from mlaide.error import *
-from httpx import Response
+
+if TYPE_CHECKING:
+    from httpx import Response
+
+
+content_type_merge_patch = 'application/merge-patch+json'
 
 
 def assert_response_status(response: Response, is_404_valid: bool = False):
@@ -24,3 +34,33 @@ def assert_response_status(response: Response, is_404_valid: bool = False):
 
 def _http_error(response: Response):
     return HttpError.from_response(response)
+
+
+def split_merge_patch(patch: Dict[str, Any], max_payload_size: int) -> List[Dict[str, Any]]:
+    """Splits a merge patch into multiple merge patches, whose JSON representation does not exceed max_payload_size
+    bytes. Applying all returned patches in order has the same effect as applying the original patch. Nested dicts
+    that exceed the size on their own are split recursively; a single scalar value that exceeds the size will be sent
+    in a patch of its own."""
+    chunks: List[Dict[str, Any]] = []
+    chunk: Dict[str, Any] = {}
+    chunk_size = len("{}")
+
+    for key, value in patch.items():
+        entry_size = len(json.dumps({key: value})) - len("{}") + len(", ")
+        if entry_size > max_payload_size and isinstance(value, dict) and len(value) > 1:
+            key_size = len(json.dumps({key: {}})) - len("{}")
+            chunks.extend({key: sub_chunk} for sub_chunk in split_merge_patch(value, max_payload_size - key_size))
+            continue
+
+        if chunk and chunk_size + entry_size > max_payload_size:
+            chunks.append(chunk)
+            chunk = {}
+            chunk_size = len("{}")
+
+        chunk[key] = value
+        chunk_size += entry_size
+
+    if chunk or not chunks:
+        chunks.append(chunk)
+
+    return chunks
@@ -1,21 +1,26 @@
 import io
 import cgi
-from typing import Any, Collection, Tuple, cast, Dict, Optional
-
-import httpx
+from typing import Any, BinaryIO, Collection, Tuple, cast, Dict, Optional
 
+from mlaide._file_utils import SpooledFile
 from ._api_commons import assert_response_status
+from .. import _json
+from .._instrumentation import endpoint
 from ..client import Client
-from ..dto import ArtifactDto, FileHashDto
+from ..dto import ArtifactDto, FileHashDto, UploadDto
+
+# Downloaded archives up to this size are kept in memory, larger ones are written to a temporary file
+DEFAULT_SPOOL_SIZE = 32 * 1024 * 1024
 
 
+@endpoint
 def create_model(*, client: Client, project_key: str, artifact_name: str, artifact_version: int) -> None:
     url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/model"\
         .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version)
 
     headers: Dict[str, Any] = client.get_headers()
 
-    response = httpx.request(
+    response = client.get_httpx_client().request(
         method="PUT",
         url=url,
         headers=headers,
@@ -24,13 +29,14 @@ def create_model(*, client: Client, project_key: str, artifact_name: str, artifa
     assert_response_status(response)
 
 
+@endpoint
 def create_artifact(*, client: Client, project_key: str, artifact: ArtifactDto, run_key: int) -> ArtifactDto:
     url = "{}/projects/{projectKey}/artifacts?run-key={runKey}"\
         .format(client.base_url, projectKey=project_key, runKey=run_key)
 
     headers: Dict[str, Any] = client.get_headers()
 
-    response = httpx.request(
+    response = client.get_httpx_client().request(
         method="POST",
         url=url,
         headers=headers,
@@ -39,9 +45,10 @@ def create_artifact(*, client: Client, project_key: str, artifact: ArtifactDto,
 
     assert_response_status(response)
 
-    return ArtifactDto.from_dict(response.json())
+    return ArtifactDto.from_dict(_json.loads(response.content))
 
 
+@endpoint
 def upload_file(*, client: Client, project_key: str, artifact_name: str, artifact_version: int, filename: str, file_hash: str, file: io.BytesIO):
     url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/files"\
         .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version)
@@ -51,7 +58,7 @@ def upload_file(*, client: Client, project_key: str, artifact_name: str, artifac
 
     files = {'file': (filename, file)}
 
-    response = httpx.request(
+    response = client.get_httpx_client().request(
         method="POST",
         url=url,
         headers=headers,
@@ -62,6 +69,104 @@ def upload_file(*, client: Client, project_key: str, artifact_name: str, artifac
     assert_response_status(response)
 
 
+@endpoint
+def create_upload(*,
+                  client: Client,
+                  project_key: str,
+                  artifact_name: str,
+                  artifact_version: int,
+                  upload: UploadDto) -> UploadDto:
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/uploads"\
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = client.get_httpx_client().request(
+        method="POST",
+        url=url,
+        headers=headers,
+        json=upload.to_dict_without_none_values()
+    )
+
+    assert_response_status(response)
+
+    return UploadDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
+
+
+@endpoint
+def get_upload(*,
+               client: Client,
+               project_key: str,
+               artifact_name: str,
+               artifact_version: int,
+               upload_id: str) -> Optional[UploadDto]:
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/uploads/{uploadId}"\
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version,
+                uploadId=upload_id)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = client.get_httpx_client().request(
+        method="GET",
+        url=url,
+        headers=headers
+    )
+
+    assert_response_status(response, is_404_valid=True)
+
+    if response.status_code == 404:
+        return None
+
+    return UploadDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
+
+
+@endpoint
+def upload_part(*,
+                client: Client,
+                project_key: str,
+                artifact_name: str,
+                artifact_version: int,
+                upload_id: str,
+                part_index: int,
+                part_hash: str,
+                content: bytes):
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/uploads/{uploadId}/parts/{partIndex}"\
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version,
+                uploadId=upload_id, partIndex=part_index)
+
+    headers: Dict[str, Any] = client.get_headers()
+    headers["Content-Type"] = "application/octet-stream"
+    query_params = {'part-hash': part_hash}
+
+    response = client.get_httpx_client().request(
+        method="PUT",
+        url=url,
+        headers=headers,
+        content=content,
+        params=query_params
+    )
+
+    assert_response_status(response)
+
+
+@endpoint
+def complete_upload(*, client: Client, project_key: str, artifact_name: str, artifact_version: int, upload_id: str):
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/uploads/{uploadId}/complete"\
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version,
+                uploadId=upload_id)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = client.get_httpx_client().request(
+        method="POST",
+        url=url,
+        headers=headers
+    )
+
+    assert_response_status(response)
+
+
+@endpoint
 def get_artifact(*, client: Client,
                  project_key: str,
                  artifact_name: str,
@@ -76,7 +181,39 @@ def get_artifact(*, client: Client,
 
     headers: Dict[str, Any] = client.get_headers()
 
-    response = httpx.request(
+    response = client.get_httpx_client().request(
+        method="GET",
+        url=url,
+        headers=headers,
+        params=query_params
+    )
+
+    assert_response_status(response)
+
+    return ArtifactDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
+
+
+@endpoint
+def get_artifact_if_modified(*, client: Client,
+                             project_key: str,
+                             artifact_name: str,
+                             artifact_version: Optional[int],
+                             model_stage: str = None,
+                             etag: Optional[str] = None) -> Tuple[Optional[ArtifactDto], Optional[str]]:
+    """Gets an artifact using a conditional request. Returns `None` and the given ETag if the artifact did not change
+    since the ETag was returned, otherwise the artifact and its new ETag."""
+    version = artifact_version if artifact_version is not None else "latest"
+
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}" \
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=version)
+
+    query_params = None if model_stage is None else {"model-stage": model_stage}
+
+    headers: Dict[str, Any] = client.get_headers()
+    if etag is not None:
+        headers["If-None-Match"] = etag
+
+    response = client.get_httpx_client().request(
         method="GET",
         url=url,
         headers=headers,
@@ -85,14 +222,19 @@ def get_artifact(*, client: Client,
 
     assert_response_status(response)
 
-    return ArtifactDto.from_dict(cast(Dict[str, Any], response.json()))
+    if response.status_code == 304:
+        return None, etag
 
+    return ArtifactDto.from_dict(cast(Dict[str, Any], _json.loads(response.content))), response.headers.get("ETag")
 
+
+@endpoint
 def download_artifact(*,
                       client: Client,
                       project_key: str,
                       artifact_name: str,
-                      artifact_version: int) -> Tuple[io.BytesIO, str]:
+                      artifact_version: int,
+                      max_memory_size: int = DEFAULT_SPOOL_SIZE) -> Tuple[BinaryIO, str]:
 
     url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/files" \
         .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version)
@@ -100,19 +242,55 @@ def download_artifact(*,
     headers: Dict[str, Any] = client.get_headers()
     headers["Accepts"] = "application/zip"
 
-    response = httpx.request(
+    # Stream the response, so that large artifacts are spooled to disk instead of being held in memory
+    with client.get_httpx_client().stream(
+        method="GET",
+        url=url,
+        headers=headers
+    ) as response:
+        if response.is_error:
+            response.read()
+        assert_response_status(response)
+
+        content_disposition = response.headers.get("Content-Disposition")
+        value, params = cgi.parse_header(content_disposition)
+        filename = params.get("filename")
+
+        file = SpooledFile(max_memory_size)
+        for chunk in response.iter_bytes():
+            file.write(chunk)
+
+    return file.rewind(), filename
+
+
+@endpoint
+def download_file(*,
+                 client: Client,
+                 project_key: str,
+                 artifact_name: str,
+                 artifact_version: int,
+                 file_id: str) -> Optional[io.BytesIO]:
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/files/{fileId}" \
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version,
+                fileId=file_id)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = client.get_httpx_client().request(
         method="GET",
         url=url,
         headers=headers
     )
 
-    assert_response_status(response)
+    assert_response_status(response, is_404_valid=True)
+
+    if response.status_code == 404:
+        return None
+
+    return io.BytesIO(response.content)
 
-    content_disposition = response.headers.get("Content-Disposition")
-    value, params = cgi.parse_header(content_disposition)
-    filename = params.get("filename")
-    return io.BytesIO(response.content), filename
 
+@endpoint
 def find_artifact_by_file_hashes(*, client: Client,
                                  project_key: str,
                                  artifact_name: str,
@@ -122,7 +300,7 @@ def find_artifact_by_file_hashes(*, client: Client,
 
     headers: Dict[str, Any] = client.get_headers()
 
-    response = httpx.request(
+    response = client.get_httpx_client().request(
         method="POST",
         url=url,
         headers=headers,
@@ -134,4 +312,4 @@ def find_artifact_by_file_hashes(*, client: Client,
     if response.status_code == 404:
         return None
 
-    return ArtifactDto.from_dict(cast(Dict[str, Any], response.json()))
+    return ArtifactDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
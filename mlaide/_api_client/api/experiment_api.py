@@ -1,12 +1,13 @@
 from typing import Any, cast, Dict, Optional
 
-import httpx
-
 from ._api_commons import assert_response_status
+from .. import _json
+from .._instrumentation import endpoint
 from ..client import Client
 from ..dto import ExperimentDto
 
 
+@endpoint
 def create_experiment(*, client: Client, project_key: str, experiment: ExperimentDto) -> ExperimentDto:
 
     url = "{}/projects/{projectKey}/experiments".format(client.base_url, projectKey=project_key)
@@ -15,13 +16,14 @@ def create_experiment(*, client: Client, project_key: str, experiment: Experimen
 
     json_body = experiment.to_dict_without_none_values()
 
-    response = httpx.post(url=url, headers=headers, json=json_body)
+    response = client.get_httpx_client().post(url=url, headers=headers, json=json_body)
 
     assert_response_status(response)
 
-    return ExperimentDto.from_dict(cast(Dict[str, Any], response.json()))
+    return ExperimentDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
 
 
+@endpoint
 def get_experiment(*, client: Client,
                    project_key: str,
                    experiment_key: str) -> Optional[ExperimentDto]:
@@ -30,7 +32,7 @@ def get_experiment(*, client: Client,
 
     headers: Dict[str, Any] = client.get_headers()
 
-    response = httpx.request(
+    response = client.get_httpx_client().request(
         method="GET",
         url=url,
         headers=headers,
@@ -41,4 +43,4 @@ def get_experiment(*, client: Client,
     if response.status_code == 404:
         return None
 
-    return ExperimentDto.from_dict(cast(Dict[str, Any], response.json()))
+    return ExperimentDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
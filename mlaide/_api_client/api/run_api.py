@@ -1,14 +1,13 @@
 from typing import Any, Dict, cast
 
-import httpx
-
-from ._api_commons import assert_response_status
+from ._api_commons import assert_response_status, content_type_merge_patch, split_merge_patch
+from .. import _json
+from .._instrumentation import endpoint
 from ..client import Client
 from ..dto import RunDto
 
-content_type_merge_patch = 'application/merge-patch+json'
-
 
+@endpoint
 def create_run(*, client: Client, project_key: str, run: RunDto) -> RunDto:
 
     url = "{}/projects/{projectKey}/runs".format(client.base_url, projectKey=project_key)
@@ -17,13 +16,14 @@ def create_run(*, client: Client, project_key: str, run: RunDto) -> RunDto:
 
     json_body = run.to_dict_without_none_values()
 
-    response = httpx.post(url=url, headers=headers, json=json_body)
+    response = client.get_httpx_client().post(url=url, headers=headers, json=json_body)
 
     assert_response_status(response)
 
-    return RunDto.from_dict(cast(Dict[str, Any], response.json()))
+    return RunDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
 
 
+@endpoint
 def partial_update_run(*, client: Client, project_key: str, run_key: int, run: RunDto) -> None:
 
     url = "{}/projects/{projectKey}/runs/{runKey}".format(
@@ -35,11 +35,12 @@ def partial_update_run(*, client: Client, project_key: str, run_key: int, run: R
 
     json_body = run.to_dict_without_none_values()
 
-    response = httpx.patch(url=url, headers=headers, json=json_body)
+    response = client.get_httpx_client().patch(url=url, headers=headers, json=json_body)
 
     assert_response_status(response)
 
 
+@endpoint
 def update_run_parameters(*, client: Client, project_key: str, run_key: int, parameters: Dict[str, Any]) -> None:
 
     url = "{}/projects/{projectKey}/runs/{runKey}/parameters".format(
@@ -49,11 +50,13 @@ def update_run_parameters(*, client: Client, project_key: str, run_key: int, par
     headers: Dict[str, Any] = client.get_headers()
     headers["content-type"] = content_type_merge_patch
 
-    response = httpx.patch(url=url, headers=headers, json=parameters)
+    for chunk in split_merge_patch(parameters, client.max_payload_size):
+        response = client.get_httpx_client().patch(url=url, headers=headers, json=chunk)
 
-    assert_response_status(response)
+        assert_response_status(response)
 
 
+@endpoint
 def update_run_metrics(*, client: Client, project_key: str, run_key: int, metrics: Dict[str, Any]) -> None:
 
     url = "{}/projects/{projectKey}/runs/{runKey}/metrics".format(
@@ -63,16 +66,19 @@ def update_run_metrics(*, client: Client, project_key: str, run_key: int, metric
     headers: Dict[str, Any] = client.get_headers()
     headers["content-type"] = content_type_merge_patch
 
-    response = httpx.patch(url=url, headers=headers, json=metrics)
+    for chunk in split_merge_patch(metrics, client.max_payload_size):
+        response = client.get_httpx_client().patch(url=url, headers=headers, json=chunk)
+
+        assert_response_status(response)
 
-    assert_response_status(response)
 
+@endpoint
 def attach_artifact_to_run(*, client: Client, project_key: str, run_key: int, artifact_name: str, artifact_version: int) -> None:
     url = "{}/projects/{projectKey}/runs/{runKey}/artifacts/{artifactName}/{artifactVersion}" \
         .format(client.base_url, projectKey=project_key, runKey=run_key, artifactName=artifact_name, artifactVersion=artifact_version)
 
     headers: Dict[str, Any] = client.get_headers()
 
-    response = httpx.put(url=url, headers=headers)
+    response = client.get_httpx_client().put(url=url, headers=headers)
 
     assert_response_status(response)
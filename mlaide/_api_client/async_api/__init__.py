@@ -0,0 +1 @@
+""" Contains asynchronous methods for accessing the API """
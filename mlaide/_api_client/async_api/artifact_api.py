@@ -0,0 +1,216 @@
+import asyncio
+import binascii
+import io
+import cgi
+import mimetypes
+import os
+import re
+from typing import Any, AsyncIterator, BinaryIO, Collection, Tuple, cast, Dict, Optional
+
+from mlaide._file_utils import DEFAULT_BUFFER_SIZE, SpooledFile
+from ..api._api_commons import assert_response_status
+from ..api.artifact_api import DEFAULT_SPOOL_SIZE
+from .. import _json
+from .._instrumentation import endpoint
+from ..client import Client
+from ..dto import ArtifactDto, FileHashDto
+
+# The filename in a multipart body is encoded like httpx encodes it (HTML5)
+_FORM_ENCODING_REPLACEMENTS = {'"': '%22', '\\': '\\\\', **{chr(c): f'%{c:02X}' for c in range(0x20) if c != 0x1B}}
+_FORM_ENCODING_RE = re.compile('|'.join(re.escape(c) for c in _FORM_ENCODING_REPLACEMENTS))
+
+
+@endpoint
+async def create_model(*, client: Client, project_key: str, artifact_name: str, artifact_version: int) -> None:
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/model"\
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = await client.get_async_httpx_client().request(
+        method="PUT",
+        url=url,
+        headers=headers,
+    )
+
+    assert_response_status(response)
+
+
+@endpoint
+async def create_artifact(*, client: Client, project_key: str, artifact: ArtifactDto, run_key: int) -> ArtifactDto:
+    url = "{}/projects/{projectKey}/artifacts?run-key={runKey}"\
+        .format(client.base_url, projectKey=project_key, runKey=run_key)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = await client.get_async_httpx_client().request(
+        method="POST",
+        url=url,
+        headers=headers,
+        json=artifact.to_dict_without_none_values()
+    )
+
+    assert_response_status(response)
+
+    return ArtifactDto.from_dict(_json.loads(response.content))
+
+
+@endpoint
+async def upload_file(*, client: Client, project_key: str, artifact_name: str, artifact_version: int, filename: str, file_hash: str, file: BinaryIO):
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/files"\
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version)
+
+    headers: Dict[str, Any] = client.get_headers()
+    query_params = {'file-hash': file_hash}
+
+    if isinstance(file, io.BytesIO):
+        body: Dict[str, Any] = {'files': {'file': (filename, file)}}
+    else:
+        # httpx reads files of multipart requests on the event loop, therefore the multipart body of files is built
+        # here and the file is read in the executor
+        boundary = binascii.hexlify(os.urandom(16)).decode('ascii')
+        head, tail = _get_multipart_frame(boundary, filename)
+        headers["Content-Type"] = f"multipart/form-data; boundary={boundary}"
+        headers["Content-Length"] = str(len(head) + os.fstat(file.fileno()).st_size - file.tell() + len(tail))
+        body = {'content': _iter_multipart_file(head, file, tail)}
+
+    response = await client.get_async_httpx_client().request(
+        method="POST",
+        url=url,
+        headers=headers,
+        params=query_params,
+        **body
+    )
+
+    assert_response_status(response)
+
+
+def _get_multipart_frame(boundary: str, filename: str) -> Tuple[bytes, bytes]:
+    encoded_filename = _FORM_ENCODING_RE.sub(lambda match: _FORM_ENCODING_REPLACEMENTS[match.group(0)], filename)
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    head = (f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="file"; filename="{encoded_filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n')
+    return head.encode('utf-8'), f'\r\n--{boundary}--\r\n'.encode('ascii')
+
+
+async def _iter_multipart_file(head: bytes, file: BinaryIO, tail: bytes) -> AsyncIterator[bytes]:
+    loop = asyncio.get_running_loop()
+    yield head
+    while chunk := await loop.run_in_executor(None, file.read, DEFAULT_BUFFER_SIZE):
+        yield chunk
+    yield tail
+
+
+@endpoint
+async def get_artifact(*, client: Client,
+                       project_key: str,
+                       artifact_name: str,
+                       artifact_version: Optional[int],
+                       model_stage: str = None) -> ArtifactDto:
+    version = artifact_version if artifact_version is not None else "latest"
+
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}" \
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=version)
+
+    query_params = None if model_stage is None else {"model-stage": model_stage}
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = await client.get_async_httpx_client().request(
+        method="GET",
+        url=url,
+        headers=headers,
+        params=query_params
+    )
+
+    assert_response_status(response)
+
+    return ArtifactDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
+
+
+@endpoint
+async def download_artifact(*,
+                            client: Client,
+                            project_key: str,
+                            artifact_name: str,
+                            artifact_version: int,
+                            max_memory_size: int = DEFAULT_SPOOL_SIZE) -> Tuple[BinaryIO, str]:
+
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/files" \
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version)
+
+    headers: Dict[str, Any] = client.get_headers()
+    headers["Accepts"] = "application/zip"
+
+    # Stream the response, so that large artifacts are spooled to disk instead of being held in memory
+    async with client.get_async_httpx_client().stream(
+        method="GET",
+        url=url,
+        headers=headers
+    ) as response:
+        if response.is_error:
+            await response.aread()
+        assert_response_status(response)
+
+        content_disposition = response.headers.get("Content-Disposition")
+        value, params = cgi.parse_header(content_disposition)
+        filename = params.get("filename")
+
+        file = SpooledFile(max_memory_size)
+        async for chunk in response.aiter_bytes():
+            file.write(chunk)
+
+    return file.rewind(), filename
+
+
+@endpoint
+async def download_file(*,
+                       client: Client,
+                       project_key: str,
+                       artifact_name: str,
+                       artifact_version: int,
+                       file_id: str) -> Optional[io.BytesIO]:
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/{artifactVersion}/files/{fileId}" \
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name, artifactVersion=artifact_version,
+                fileId=file_id)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = await client.get_async_httpx_client().request(
+        method="GET",
+        url=url,
+        headers=headers
+    )
+
+    assert_response_status(response, is_404_valid=True)
+
+    if response.status_code == 404:
+        return None
+
+    return io.BytesIO(response.content)
+
+
+@endpoint
+async def find_artifact_by_file_hashes(*, client: Client,
+                                       project_key: str,
+                                       artifact_name: str,
+                                       files: Collection[FileHashDto]) -> ArtifactDto:
+    url = "{}/projects/{projectKey}/artifacts/{artifactName}/find-by-file-hashes" \
+        .format(client.base_url, projectKey=project_key, artifactName=artifact_name)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = await client.get_async_httpx_client().request(
+        method="POST",
+        url=url,
+        headers=headers,
+        json=[file.to_dict_without_none_values() for file in files]
+    )
+    
+    assert_response_status(response, is_404_valid=True)
+
+    if response.status_code == 404:
+        return None
+
+    return ArtifactDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
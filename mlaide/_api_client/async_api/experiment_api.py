@@ -0,0 +1,46 @@
+from typing import Any, cast, Dict, Optional
+
+from ..api._api_commons import assert_response_status
+from .. import _json
+from .._instrumentation import endpoint
+from ..client import Client
+from ..dto import ExperimentDto
+
+
+@endpoint
+async def create_experiment(*, client: Client, project_key: str, experiment: ExperimentDto) -> ExperimentDto:
+
+    url = "{}/projects/{projectKey}/experiments".format(client.base_url, projectKey=project_key)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    json_body = experiment.to_dict_without_none_values()
+
+    response = await client.get_async_httpx_client().post(url=url, headers=headers, json=json_body)
+
+    assert_response_status(response)
+
+    return ExperimentDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
+
+
+@endpoint
+async def get_experiment(*, client: Client,
+                         project_key: str,
+                         experiment_key: str) -> Optional[ExperimentDto]:
+    url = "{}/projects/{projectKey}/experiments/{experimentKey}" \
+        .format(client.base_url, projectKey=project_key, experimentKey=experiment_key)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = await client.get_async_httpx_client().request(
+        method="GET",
+        url=url,
+        headers=headers,
+    )
+
+    assert_response_status(response, is_404_valid=True)
+
+    if response.status_code == 404:
+        return None
+
+    return ExperimentDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
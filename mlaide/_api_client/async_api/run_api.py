@@ -0,0 +1,86 @@
+from typing import Any, Dict, cast
+
+from ..api._api_commons import assert_response_status, content_type_merge_patch, split_merge_patch
+from .. import _json
+from .._instrumentation import endpoint
+from ..client import Client
+from ..dto import RunDto
+
+
+@endpoint
+async def create_run(*, client: Client, project_key: str, run: RunDto) -> RunDto:
+
+    url = "{}/projects/{projectKey}/runs".format(client.base_url, projectKey=project_key)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    json_body = run.to_dict_without_none_values()
+
+    response = await client.get_async_httpx_client().post(url=url, headers=headers, json=json_body)
+
+    assert_response_status(response)
+
+    return RunDto.from_dict(cast(Dict[str, Any], _json.loads(response.content)))
+
+
+@endpoint
+async def partial_update_run(*, client: Client, project_key: str, run_key: int, run: RunDto) -> None:
+
+    url = "{}/projects/{projectKey}/runs/{runKey}".format(
+        client.base_url, projectKey=project_key, runKey=run_key
+    )
+
+    headers: Dict[str, Any] = client.get_headers()
+    headers["content-type"] = content_type_merge_patch
+
+    json_body = run.to_dict_without_none_values()
+
+    response = await client.get_async_httpx_client().patch(url=url, headers=headers, json=json_body)
+
+    assert_response_status(response)
+
+
+@endpoint
+async def update_run_parameters(*, client: Client, project_key: str, run_key: int, parameters: Dict[str, Any]) -> None:
+
+    url = "{}/projects/{projectKey}/runs/{runKey}/parameters".format(
+        client.base_url, projectKey=project_key, runKey=run_key
+    )
+
+    headers: Dict[str, Any] = client.get_headers()
+    headers["content-type"] = content_type_merge_patch
+
+    for chunk in split_merge_patch(parameters, client.max_payload_size):
+        response = await client.get_async_httpx_client().patch(url=url, headers=headers, json=chunk)
+
+        assert_response_status(response)
+
+
+@endpoint
+async def update_run_metrics(*, client: Client, project_key: str, run_key: int, metrics: Dict[str, Any]) -> None:
+
+    url = "{}/projects/{projectKey}/runs/{runKey}/metrics".format(
+        client.base_url, projectKey=project_key, runKey=run_key
+    )
+
+    headers: Dict[str, Any] = client.get_headers()
+    headers["content-type"] = content_type_merge_patch
+
+    for chunk in split_merge_patch(metrics, client.max_payload_size):
+        response = await client.get_async_httpx_client().patch(url=url, headers=headers, json=chunk)
+
+        assert_response_status(response)
+
+
+@endpoint
+async def attach_artifact_to_run(*, client: Client, project_key: str, run_key: int, artifact_name: str,
+                                 artifact_version: int) -> None:
+    url = "{}/projects/{projectKey}/runs/{runKey}/artifacts/{artifactName}/{artifactVersion}" \
+        .format(client.base_url, projectKey=project_key, runKey=run_key, artifactName=artifact_name,
+                artifactVersion=artifact_version)
+
+    headers: Dict[str, Any] = client.get_headers()
+
+    response = await client.get_async_httpx_client().put(url=url, headers=headers)
+
+    assert_response_status(response)
@@ -1,5 +1,14 @@
-from dataclasses import dataclass
-from typing import Dict
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Callable, Dict, List, Optional, TYPE_CHECKING
+
+from ._instrumentation import RequestStats
+from mlaide.model import EndpointStats, RequestEvent
+
+if TYPE_CHECKING:
+    import httpx
 
 
 @dataclass
@@ -7,17 +16,106 @@ class Client:
     """ A class for keeping track of data related to the API """
 
     base_url: str
+    timeout: float = 30.0
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    max_payload_size: int = 1024 * 1024
+
+    _httpx_client: Optional[httpx.Client] = field(default=None, init=False, repr=False, compare=False)
+    _httpx_client_lock: Lock = field(default_factory=Lock, init=False, repr=False, compare=False)
+    _async_httpx_client: Optional[httpx.AsyncClient] = field(default=None, init=False, repr=False, compare=False)
+    _request_stats: RequestStats = field(default_factory=RequestStats, init=False, repr=False, compare=False)
+    _request_listeners: List[Callable[[RequestEvent], None]] = field(default_factory=list, init=False, repr=False,
+                                                                      compare=False)
 
     def get_headers(self) -> Dict[str, str]:
         """ Get headers to be used in all endpoints """
         return {}
 
+    def get_httpx_client(self) -> httpx.Client:
+        """ Get the pooled HTTP client that is shared by all endpoints. The client is created on first use. """
+        if self._httpx_client is None:
+            with self._httpx_client_lock:
+                if self._httpx_client is None:
+                    import httpx
+                    from ._transport import instrument
+                    self._httpx_client = instrument(httpx.Client(timeout=self.timeout, limits=self._get_limits()),
+                                                    self._record_request)
+
+        return self._httpx_client
+
+    def get_async_httpx_client(self) -> httpx.AsyncClient:
+        """ Get the pooled asynchronous HTTP client that is shared by all async endpoints. The client is created on
+        first use and must be used from a single event loop. """
+        if self._async_httpx_client is None:
+            with self._httpx_client_lock:
+                if self._async_httpx_client is None:
+                    import httpx
+                    from ._transport import instrument
+                    self._async_httpx_client = instrument(
+                        httpx.AsyncClient(timeout=self.timeout, limits=self._get_limits()), self._record_request)
+
+        return self._async_httpx_client
+
+    def _get_limits(self) -> httpx.Limits:
+        import httpx
+        return httpx.Limits(max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_keepalive_connections)
+
+    def add_request_listener(self, listener: Callable[[RequestEvent], None]):
+        """ Add a callback that is invoked with every completed request, e.g. to forward it to a metrics system. The
+        callback is invoked in the thread (or event loop) that sent the request when its response was closed and must
+        not block; exceptions raised by the callback are ignored. """
+        self._request_listeners.append(listener)
+
+    def remove_request_listener(self, listener: Callable[[RequestEvent], None]):
+        """ Remove a callback that was added with `add_request_listener` """
+        self._request_listeners.remove(listener)
+
+    def get_request_stats(self, reset: bool = False) -> Dict[str, EndpointStats]:
+        """ Get the stats of all requests per endpoint. If `reset` is `True`, the stats start over afterwards. """
+        return self._request_stats.snapshot(reset=reset)
+
+    def _record_request(self, event: RequestEvent):
+        self._request_stats.add(event)
+        for listener in list(self._request_listeners):
+            try:
+                listener(event)
+            except Exception:
+                # Exporting metrics must never fail a request
+                pass
+
+    def close(self):
+        """ Close the pooled HTTP client and all of its open connections """
+        with self._httpx_client_lock:
+            if self._httpx_client is not None:
+                self._httpx_client.close()
+                self._httpx_client = None
+
+    async def aclose(self):
+        """ Close the pooled asynchronous HTTP client and all of its open connections """
+        async_httpx_client, self._async_httpx_client = self._async_httpx_client, None
+        if async_httpx_client is not None:
+            await async_httpx_client.aclose()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
 
 @dataclass
 class AuthenticatedClient(Client):
     """ A Client which has been authenticated for use on secured endpoints """
 
-    api_key: str
+    api_key: Optional[str] = None
 
     def get_headers(self) -> Dict[str, str]:
         """ Get headers to be used in authenticated endpoints """
@@ -9,3 +9,4 @@ from .git_dto import GitDto
 from .run_dto import RunDto
 from .runs_dto import ExperimentsDto
 from .status_dto import StatusDto
+from .upload_dto import UploadDto, UploadPartDto
@@ -0,0 +1,141 @@
+"""Fast encoders and decoders for the DTOs.
+
+`dataclasses_json` inspects the type of every field on every call. The functions in this module inspect a DTO class
+only once and generate specialised code for it, which produces the same dicts as `to_dict` and accepts the same dicts
+as `from_dict` (including the letter case of each class, the encoders and decoders of `datetime_field` and nested
+DTOs).
+"""
+
+import dataclasses
+import typing
+from enum import Enum
+from typing import Any, Callable, Dict, Type, TypeVar
+
+T = TypeVar('T')
+
+_MISSING = object()
+_encoders: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+_decoders: Dict[type, Callable[[Dict[str, Any]], Any]] = {}
+
+
+def encode(dto: Any) -> Dict[str, Any]:
+    """Converts a DTO into a dict that can be serialized as JSON"""
+    cls = type(dto)
+    encoder = _encoders.get(cls)
+    if encoder is None:
+        encoder = _encoders[cls] = _compile_encoder(cls)
+
+    return encoder(dto)
+
+
+def decode(cls: Type[T], d: Dict[str, Any]) -> T:
+    """Creates a DTO of the given class from a dict that was deserialized from JSON"""
+    decoder = _decoders.get(cls)
+    if decoder is None:
+        decoder = _decoders[cls] = _compile_decoder(cls)
+
+    return decoder(d)
+
+
+def _compile_encoder(cls: type) -> Callable[[Any], Dict[str, Any]]:
+    namespace: Dict[str, Any] = {}
+    type_hints = typing.get_type_hints(cls)
+    items = []
+    for index, (field, key) in enumerate(_get_fields(cls)):
+        metadata = field.metadata.get('dataclasses_json', {})
+        encoder = metadata.get('encoder') or _get_value_encoder(type_hints[field.name])
+        if encoder is None:
+            items.append('{!r}: dto.{}'.format(key, field.name))
+        else:
+            namespace['encode_{}'.format(index)] = encoder
+            items.append('{!r}: encode_{}(dto.{})'.format(key, index, field.name))
+
+    source = 'def encode(dto):\n    return {{{}}}\n'.format(', '.join(items))
+    exec(source, namespace)
+    return namespace['encode']
+
+
+def _compile_decoder(cls: type) -> Callable[[Dict[str, Any]], Any]:
+    # `dataclass_json` wraps `__init__` of classes with `Undefined.EXCLUDE`, which makes it slow. The attributes are
+    # set directly instead, unless the class has to run its own initialization code.
+    use_init = cls.__dataclass_params__.frozen or hasattr(cls, '__post_init__')
+    namespace: Dict[str, Any] = {'cls': cls, 'new': object.__new__, 'MISSING': _MISSING}
+    type_hints = typing.get_type_hints(cls)
+    lines = ['def decode(d):', '    kwargs = {}' if use_init else '    dto = new(cls)']
+    for index, (field, key) in enumerate(_get_fields(cls)):
+        metadata = field.metadata.get('dataclasses_json', {})
+        decoder = metadata.get('decoder') or _get_value_decoder(type_hints[field.name])
+        if decoder is not None:
+            namespace['decode_{}'.format(index)] = decoder
+        value = 'decode_{}(value)'.format(index) if decoder is not None else 'value'
+
+        lines.append('    value = d.get({!r}, MISSING)'.format(key))
+        if use_init:
+            lines.append('    if value is not MISSING:')
+            lines.append('        kwargs[{!r}] = {}'.format(field.name, value))
+            continue
+
+        lines.append('    if value is MISSING:')
+        if field.default is not dataclasses.MISSING:
+            namespace['default_{}'.format(index)] = field.default
+            lines.append('        dto.{} = default_{}'.format(field.name, index))
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace['default_factory_{}'.format(index)] = field.default_factory
+            lines.append('        dto.{} = default_factory_{}()'.format(field.name, index))
+        else:
+            lines.append('        raise TypeError({!r})'.format(
+                "{}() missing required argument: '{}'".format(cls.__name__, field.name)))
+        lines.append('    else:')
+        lines.append('        dto.{} = {}'.format(field.name, value))
+    lines.append('    return cls(**kwargs)' if use_init else '    return dto')
+
+    exec('\n'.join(lines) + '\n', namespace)
+    return namespace['decode']
+
+
+def _get_fields(cls: type):
+    config = getattr(cls, 'dataclass_json_config', None) or {}
+    class_letter_case = config.get('letter_case')
+    for field in dataclasses.fields(cls):
+        letter_case = field.metadata.get('dataclasses_json', {}).get('letter_case') or class_letter_case
+        yield field, letter_case(field.name) if letter_case is not None else field.name
+
+
+def _get_value_encoder(type_hint: Any) -> Callable[[Any], Any]:
+    """Returns a function that encodes a value of the given type or `None` if the value can be used as it is"""
+    if dataclasses.is_dataclass(type_hint):
+        return _optional(lambda value: encode(value))
+
+    return _get_container_codec(type_hint, _get_value_encoder)
+
+
+def _get_value_decoder(type_hint: Any) -> Callable[[Any], Any]:
+    """Returns a function that decodes a value of the given type or `None` if the value can be used as it is"""
+    if dataclasses.is_dataclass(type_hint):
+        return _optional(lambda value: decode(type_hint, value))
+    if isinstance(type_hint, type) and issubclass(type_hint, Enum):
+        return _optional(type_hint)
+
+    return _get_container_codec(type_hint, _get_value_decoder)
+
+
+def _get_container_codec(type_hint: Any, get_codec: Callable[[Any], Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    origin = typing.get_origin(type_hint)
+    arguments = typing.get_args(type_hint)
+
+    if origin is typing.Union:
+        types = [argument for argument in arguments if argument is not type(None)]
+        return get_codec(types[0]) if len(types) == 1 else None
+    if origin in (list, typing.Collection.__origin__) and arguments:
+        item_codec = get_codec(arguments[0])
+        return None if item_codec is None else _optional(lambda values: [item_codec(value) for value in values])
+    if origin is dict and len(arguments) == 2:
+        value_codec = get_codec(arguments[1])
+        return None if value_codec is None else \
+            _optional(lambda values: {key: value_codec(value) for key, value in values.items()})
+
+    return None
+
+
+def _optional(codec: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None else codec(value)
@@ -3,7 +3,11 @@ from dataclasses_json import config, DataClassJsonMixin
 from datetime import datetime
 from dateutil.parser import isoparse
 from marshmallow import fields
-from typing import Optional
+from typing import Any, Dict, Optional, Type, TypeVar
+
+from . import codec
+
+A = TypeVar('A', bound='ExtendedDtoSerializer')
 
 
 def optional_iso_datetime_encoder(value: Optional[datetime]) -> str:
@@ -26,8 +30,15 @@ def datetime_field():
 
 
 class ExtendedDtoSerializer(DataClassJsonMixin):
+    @classmethod
+    def from_dict(cls: Type[A], kvs: Dict[str, Any], *, infer_missing=False) -> A:
+        if infer_missing:
+            return super().from_dict(kvs, infer_missing=infer_missing)
+
+        return codec.decode(cls, kvs)
+
     def to_dict_without_none_values(self):
-        d = self.to_dict()
+        d = codec.encode(self)
 
         # Remove values from dict that are None
         return {k: v for k, v in d.items() if v is not None}
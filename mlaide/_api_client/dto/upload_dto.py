@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from dataclasses_json import DataClassJsonMixin, config, dataclass_json, LetterCase, Undefined
+from typing import List, Optional
+
+from .helper import ExtendedDtoSerializer
+
+
+@dataclass_json(letter_case=LetterCase.CAMEL, undefined=Undefined.EXCLUDE)
+@dataclass
+class UploadPartDto:
+    part_index: int
+    part_hash: str
+
+
+@dataclass
+class UploadDto(ExtendedDtoSerializer, DataClassJsonMixin):
+    dataclass_json_config = config(
+        letter_case=LetterCase.CAMEL,
+        undefined=Undefined.EXCLUDE
+    )['dataclasses_json']
+
+    upload_id: Optional[str] = None
+    file_name: Optional[str] = None
+    file_hash: Optional[str] = None
+    file_size: Optional[int] = None
+    part_size: Optional[int] = None
+    parts: Optional[List[UploadPartDto]] = None
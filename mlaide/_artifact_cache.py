@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Callable, Collection, Iterator, Optional
+
+from .model import ArtifactCacheStats
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+class _FileLock(object):
+    """An advisory lock on a file that is shared by all processes of the host. Shared locks can be held by many
+    processes at the same time, an exclusive lock by only one.
+
+    On platforms without `fcntl` (Windows) locking is a no-op. `msvcrt.locking` is not a replacement: it has no shared
+    locks and its locks are mandatory, so they would block reading and writing the locked files. There, concurrent
+    processes may download the same cache entry twice and evict entries that another process is using, and `sync`
+    of offline logs may replay a log that another process still writes.
+
+    A lock file may be removed while the lock is held exclusively. Processes that opened the file before it was removed
+    notice this after acquiring the lock and lock the new file at the same path instead."""
+
+    def __init__(self, path: str, shared: bool = False, blocking: bool = True):
+        self.__path = path
+        self.__shared = shared
+        self.__blocking = blocking
+        self.__file = None
+
+    def __enter__(self):
+        while True:
+            self.__file = open(self.__path, 'a+')
+            if fcntl is None:
+                return self
+
+            operation = fcntl.LOCK_SH if self.__shared else fcntl.LOCK_EX
+            try:
+                fcntl.flock(self.__file.fileno(), operation if self.__blocking else operation | fcntl.LOCK_NB)
+                if self.__is_current():
+                    return self
+            except BaseException:
+                self.__file.close()
+                raise
+
+            self.__file.close()
+
+    def __is_current(self) -> bool:
+        try:
+            return os.stat(self.__path).st_ino == os.fstat(self.__file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Closing the file releases the lock
+        self.__file.close()
+
+
+class ArtifactCache(object):
+    """A cache of extracted artifacts on the local disk. An entry is keyed by project, name, version and the ids of
+    the files of the artifact version. A version only gets new files while it is uploaded (e.g. when an interrupted
+    upload is resumed), so an entry never has to be invalidated: a version that was cached before all of its files
+    were uploaded gets a new entry. The cache can be shared by multiple processes:
+
+    * an artifact is downloaded only once, even if several processes request it at the same time,
+    * entries are extracted into a temporary directory and published with an atomic rename,
+    * entries are evicted in least recently used order as soon as the cache exceeds `max_size` bytes; entries that are
+      read by another process at the same time will not be evicted.
+    """
+
+    __directory: str
+    __max_size: int
+
+    def __init__(self, directory: str, max_size: int):
+        self.__directory = directory
+        self.__max_size = max_size
+        self.__stats = ArtifactCacheStats()
+        self.__stats_lock = threading.Lock()
+
+    @property
+    def stats(self) -> ArtifactCacheStats:
+        """Returns the hits, misses and evictions of this process"""
+        with self.__stats_lock:
+            return replace(self.__stats)
+
+    @contextmanager
+    def get(self,
+            project_key: str,
+            artifact_name: str,
+            artifact_version: int,
+            file_ids: Collection[str] = ()) -> Iterator[Optional[str]]:
+        """Returns a context manager that yields the directory containing the files of the artifact or `None`, if the
+        artifact is not cached. The entry will not be evicted while the context is active.
+        """
+        key = self.__get_key(project_key, artifact_name, artifact_version, file_ids)
+        path = self.__get_entry_path(key)
+        if not os.path.isdir(path):
+            # Do not create a lock file for an entry that does not exist
+            self.__record(misses=1)
+            yield None
+            return
+
+        with _FileLock(self.__get_lock_path(key), shared=True):
+            # Another process might have evicted the entry before the lock was acquired
+            if os.path.isdir(path):
+                self.__record(hits=1)
+                os.utime(path)
+                yield os.path.join(path, 'files')
+            else:
+                self.__record(misses=1)
+                yield None
+
+    @contextmanager
+    def get_or_add(self,
+                   project_key: str,
+                   artifact_name: str,
+                   artifact_version: int,
+                   populate: Callable[[str], None],
+                   file_ids: Collection[str] = ()) -> Iterator[str]:
+        """Returns a context manager that yields the directory containing the files of the artifact. If the artifact
+        is not cached, `populate` will be called with an empty directory into which the files of the artifact must be
+        written.
+        """
+        key = self.__get_key(project_key, artifact_name, artifact_version, file_ids)
+        while True:
+            self.__add(key, artifact_name, artifact_version, populate)
+
+            with _FileLock(self.__get_lock_path(key), shared=True):
+                path = self.__get_entry_path(key)
+                # Another process might have evicted the entry before the lock was acquired
+                if os.path.isdir(path):
+                    os.utime(path)
+                    yield os.path.join(path, 'files')
+                    return
+
+    def __add(self, key: str, artifact_name: str, artifact_version: int, populate: Callable[[str], None]):
+        path = self.__get_entry_path(key)
+        with _FileLock(self.__get_lock_path(key)):
+            if os.path.isdir(path):
+                self.__record(hits=1)
+                return
+
+            self.__record(misses=1)
+            temp_path = tempfile.mkdtemp(prefix='.tmp-', dir=self.__directory)
+            try:
+                populate(os.path.join(temp_path, 'files'))
+                with open(os.path.join(temp_path, 'meta.json'), 'w') as meta:
+                    json.dump({'name': artifact_name,
+                               'version': artifact_version,
+                               'size': _get_directory_size(temp_path)}, meta)
+                os.rename(temp_path, path)
+            except BaseException:
+                shutil.rmtree(temp_path, ignore_errors=True)
+                raise
+
+        self.__evict(keep=key)
+
+    def __evict(self, keep: str):
+        try:
+            with _FileLock(os.path.join(self.__directory, '.evict.lock'), blocking=False):
+                entries = []
+                for key in os.listdir(self.__directory):
+                    path = self.__get_entry_path(key)
+                    if key.startswith('.') or not os.path.isdir(path):
+                        continue
+                    try:
+                        with open(os.path.join(path, 'meta.json')) as meta:
+                            entries.append((os.stat(path).st_mtime, key, json.load(meta)['size']))
+                    except (OSError, ValueError, KeyError):
+                        continue
+
+                total_size = sum(size for _, _, size in entries)
+                # The entry that was just added must not be evicted, even if it exceeds the size of the cache alone
+                for _, key, size in sorted(entry for entry in entries if entry[1] != keep):
+                    if total_size <= self.__max_size:
+                        break
+
+                    # Move the entry away first, so that other processes never see a partially deleted entry
+                    deleted_path = tempfile.mkdtemp(prefix='.deleted-', dir=self.__directory)
+                    try:
+                        lock_path = self.__get_lock_path(key)
+                        with _FileLock(lock_path, blocking=False):
+                            os.rename(self.__get_entry_path(key), os.path.join(deleted_path, key))
+                            # Processes waiting for the lock notice that the file was removed, see _FileLock
+                            _remove_lock_file(lock_path)
+                    except (BlockingIOError, FileNotFoundError):
+                        # The entry is currently read by another process or was evicted by it
+                        continue
+                    finally:
+                        shutil.rmtree(deleted_path, ignore_errors=True)
+
+                    total_size -= size
+                    self.__record(evictions=1)
+        except BlockingIOError:
+            # Another process is evicting entries right now
+            pass
+
+    def __record(self, hits: int = 0, misses: int = 0, evictions: int = 0):
+        with self.__stats_lock:
+            self.__stats.hits += hits
+            self.__stats.misses += misses
+            self.__stats.evictions += evictions
+
+    def __get_entry_path(self, key: str) -> str:
+        return os.path.join(self.__directory, key)
+
+    def __get_lock_path(self, key: str) -> str:
+        locks_directory = os.path.join(self.__directory, '.locks')
+        os.makedirs(locks_directory, exist_ok=True)
+        return os.path.join(locks_directory, key + '.lock')
+
+    @staticmethod
+    def __get_key(project_key: str, artifact_name: str, artifact_version: int, file_ids: Collection[str]) -> str:
+        key = json.dumps([project_key, artifact_name, artifact_version, sorted(file_ids)])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def _remove_lock_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        # Open files cannot be removed on Windows
+        pass
+
+
+def _get_directory_size(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(directory)
+               for name in names)
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Iterable, List, Optional, Tuple
+
+from ._api_client import Client
+from ._api_client.api import artifact_api
+from ._api_client.dto import UploadDto
+from .error import ServerError
+
+
+@dataclass
+class UploadManifest:
+    """Records the progress of a chunked upload on the local disk, so that an interrupted upload can be resumed by
+    another attempt or process without sending the already transferred parts again. The manifest records the
+    artifact version the upload belongs to, so that a retried `add_artifact` can reuse the version instead of creating
+    another one."""
+
+    upload_id: str
+    artifact_version: int
+    file_hash: str
+    file_size: int
+    part_size: int
+    completed_parts: List[int] = field(default_factory=list)
+
+
+def upload_file_in_parts(*,
+                         client: Client,
+                         project_key: str,
+                         artifact_name: str,
+                         artifact_version: int,
+                         filename: str,
+                         file_hash: str,
+                         path: str,
+                         part_size: int,
+                         manifest_directory: str,
+                         max_attempts: int = 3,
+                         retry_delay: float = 1.0,
+                         source_hash: Optional[str] = None):
+    """Uploads a file as a sequence of fixed-size parts. Each part is sent with its own hash and is retried on
+    connection and server errors. The completed parts are recorded in a manifest in `manifest_directory`, which is
+    identified by the artifact name, the file name and the source hash. If the upload of the same file into the same
+    artifact version is started again, only the missing parts will be sent. Use `find_pending_artifact_version` to find
+    the version of an interrupted upload.
+
+    Arguments:
+        client: The API client.
+        project_key: The key of the project.
+        artifact_name: The name of the artifact the file belongs to.
+        artifact_version: The version of the artifact the file belongs to.
+        filename: The name of the file inside the artifact.
+        file_hash: The SHA-256 hash of the whole file.
+        path: The path of the file on the local filesystem.
+        part_size: The size of each part in bytes. Only the last part can be smaller.
+        manifest_directory: The directory in which the upload manifests are stored.
+        max_attempts: The number of attempts to upload a single part.
+        retry_delay: The delay in seconds before the first retry. The delay doubles with each retry.
+        source_hash: The SHA-256 hash of the file the uploaded file was created from (e.g. before it was compressed),
+            which is used to find an interrupted upload. Defaults to `file_hash`.
+    """
+    file_size = os.path.getsize(path)
+    manifest_path = _get_manifest_path(manifest_directory, project_key, artifact_name, filename,
+                                       source_hash if source_hash is not None else file_hash)
+    manifest = _resume_upload(client, project_key, artifact_name, artifact_version, manifest_path,
+                              file_hash, file_size, part_size)
+
+    if manifest is None:
+        upload = artifact_api.create_upload(
+            client=client,
+            project_key=project_key,
+            artifact_name=artifact_name,
+            artifact_version=artifact_version,
+            upload=UploadDto(file_name=filename, file_hash=file_hash, file_size=file_size, part_size=part_size))
+        manifest = UploadManifest(upload_id=upload.upload_id,
+                                  artifact_version=artifact_version,
+                                  file_hash=file_hash,
+                                  file_size=file_size,
+                                  part_size=part_size)
+        _save_manifest(manifest_path, manifest)
+
+    part_count = max(1, -(-file_size // part_size))
+    completed_parts = set(manifest.completed_parts)
+
+    with open(path, 'rb') as file:
+        for part_index in range(part_count):
+            if part_index in completed_parts:
+                continue
+
+            file.seek(part_index * part_size)
+            content = file.read(part_size)
+
+            _with_retries(lambda: artifact_api.upload_part(
+                client=client,
+                project_key=project_key,
+                artifact_name=artifact_name,
+                artifact_version=artifact_version,
+                upload_id=manifest.upload_id,
+                part_index=part_index,
+                part_hash=hashlib.sha256(content).hexdigest(),
+                content=content), max_attempts, retry_delay)
+
+            manifest.completed_parts.append(part_index)
+            _save_manifest(manifest_path, manifest)
+
+    _with_retries(lambda: artifact_api.complete_upload(
+        client=client,
+        project_key=project_key,
+        artifact_name=artifact_name,
+        artifact_version=artifact_version,
+        upload_id=manifest.upload_id), max_attempts, retry_delay)
+
+    os.remove(manifest_path)
+
+
+def find_pending_artifact_version(manifest_directory: str,
+                                  project_key: str,
+                                  artifact_name: str,
+                                  files: Iterable[Tuple[str, str]]) -> Optional[int]:
+    """Returns the artifact version of an interrupted chunked upload of one of the files or `None` if there is none.
+
+    Arguments:
+        manifest_directory: The directory in which the upload manifests are stored.
+        project_key: The key of the project.
+        artifact_name: The name of the artifact.
+        files: The file names and SHA-256 hashes of the files of the artifact.
+    """
+    for filename, file_hash in files:
+        manifest = _load_manifest(_get_manifest_path(manifest_directory, project_key, artifact_name, filename,
+                                                     file_hash))
+        if manifest is not None:
+            return manifest.artifact_version
+
+    return None
+
+
+def _resume_upload(client: Client,
+                   project_key: str,
+                   artifact_name: str,
+                   artifact_version: int,
+                   manifest_path: str,
+                   file_hash: str,
+                   file_size: int,
+                   part_size: int) -> Optional[UploadManifest]:
+    manifest = _load_manifest(manifest_path)
+    if manifest is None or (manifest.artifact_version, manifest.file_hash, manifest.file_size, manifest.part_size) != \
+            (artifact_version, file_hash, file_size, part_size):
+        return None
+
+    upload = artifact_api.get_upload(client=client,
+                                     project_key=project_key,
+                                     artifact_name=artifact_name,
+                                     artifact_version=artifact_version,
+                                     upload_id=manifest.upload_id)
+    if upload is None:
+        # The server discarded the upload, e.g. because it expired
+        return None
+
+    # Only trust parts that were recorded locally and received by the server
+    received_parts = {part.part_index for part in upload.parts or []}
+    manifest.completed_parts = [part for part in manifest.completed_parts if part in received_parts]
+    return manifest
+
+
+def _with_retries(request, max_attempts: int, retry_delay: float):
+    import httpx
+
+    for attempt in range(max_attempts):
+        try:
+            return request()
+        except (httpx.TransportError, ServerError):
+            if attempt == max_attempts - 1:
+                raise
+            time.sleep(retry_delay * 2 ** attempt)
+
+
+def _get_manifest_path(manifest_directory: str,
+                       project_key: str,
+                       artifact_name: str,
+                       filename: str,
+                       file_hash: str) -> str:
+    key = json.dumps([project_key, artifact_name, filename, file_hash])
+    return os.path.join(manifest_directory, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+
+def _load_manifest(manifest_path: str) -> Optional[UploadManifest]:
+    try:
+        with open(manifest_path, 'r') as file:
+            return UploadManifest(**json.load(file))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _save_manifest(manifest_path: str, manifest: UploadManifest):
+    # Write to a temporary file first, so that a crash never leaves a truncated manifest behind
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    temp_path = manifest_path + '.tmp'
+    with open(temp_path, 'w') as file:
+        json.dump(asdict(manifest), file)
+    os.replace(temp_path, manifest_path)
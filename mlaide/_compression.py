@@ -0,0 +1,167 @@
+"""Compresses the files of artifacts on the client.
+
+The files of an artifact are uploaded compressed with the same codec, which is recorded in the metadata of the
+artifact. Each file is uploaded with the hash of its compressed content, so that the stored hash describes the stored
+bytes. The hashes of the uncompressed files, which the client uses for the hash cache and to find existing artifacts,
+are recorded in the metadata as well. Since the server finds artifacts by the stored hashes, artifacts that were
+uploaded compressed are not reused by artifacts with the same (uncompressed) files. Downloaded files are decompressed
+transparently, files in the artifact cache are stored uncompressed.
+
+`zstd` requires the package `zstandard`; `gzip` is always available.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from io import BytesIO
+from typing import BinaryIO, Dict, Iterator, Optional, Union
+from zipfile import ZipFile
+
+from ._file_utils import DEFAULT_BUFFER_SIZE
+from .model import InMemoryArtifactFile, LocalArtifactFile
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+METADATA_KEY = 'mlaide.compression'
+# The hashes of the uncompressed files by file name, as JSON object
+METADATA_FILE_HASHES_KEY = 'mlaide.compression.file-hashes'
+CODECS = ('zstd', 'gzip')
+
+_ZSTD_LEVEL = 3
+# Higher levels compress typical artifacts only slightly better, but are several times slower than a 100 Mbit/s link
+_GZIP_LEVEL = 1
+
+
+def resolve_codec(compression: Optional[str]) -> Optional[str]:
+    """Returns the codec for the compression setting of an artifact.
+
+    Arguments:
+        compression: `'none'` (or `None`) to upload files uncompressed, `'auto'` to use zstd if it is installed and
+            gzip otherwise, or the name of a codec.
+    """
+    if compression is None or compression == 'none':
+        return None
+    if compression == 'auto':
+        return 'zstd' if zstandard is not None else 'gzip'
+
+    return _check_codec(compression)
+
+
+def get_codec(metadata: Optional[Dict[str, str]]) -> Optional[str]:
+    """Returns the codec that is recorded in the metadata of an artifact or `None` if its files are uncompressed"""
+    codec = (metadata or {}).get(METADATA_KEY)
+    return _check_codec(codec) if codec is not None else None
+
+
+def add_codec(metadata: Optional[Dict[str, str]],
+              codec: Optional[str],
+              file_hashes: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+    """Returns the metadata of an artifact with the codec and the hashes of the uncompressed files recorded"""
+    if codec is None:
+        return metadata
+
+    metadata = {**(metadata or {}), METADATA_KEY: codec}
+    if file_hashes is not None:
+        metadata[METADATA_FILE_HASHES_KEY] = json.dumps(file_hashes, sort_keys=True)
+    return metadata
+
+
+@dataclass
+class CompressedFile:
+    """A temporary file with the compressed content of an artifact file and the SHA-256 hash of the compressed
+    content"""
+
+    path: str
+    file_hash: str
+
+
+class _HashingWriter(object):
+    def __init__(self, target: BinaryIO):
+        self.__target = target
+        self.hash = hashlib.sha256()
+
+    def write(self, data: bytes):
+        self.hash.update(data)
+        self.__target.write(data)
+
+
+def compress(source: BinaryIO, target: BinaryIO, codec: str):
+    compressor = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compressobj() if codec == 'zstd' \
+        else zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, 31)
+    while chunk := source.read(DEFAULT_BUFFER_SIZE):
+        target.write(compressor.compress(chunk))
+    target.write(compressor.flush())
+
+
+def decompress(source: BinaryIO, target: BinaryIO, codec: str):
+    decompressor = zstandard.ZstdDecompressor().decompressobj() if codec == 'zstd' else zlib.decompressobj(31)
+    while chunk := source.read(DEFAULT_BUFFER_SIZE):
+        target.write(decompressor.decompress(chunk))
+    target.write(decompressor.flush())
+
+
+@contextmanager
+def compressed_copy(file: Union[InMemoryArtifactFile, LocalArtifactFile], codec: str) -> Iterator[CompressedFile]:
+    """Compresses an artifact file into a temporary file and yields its path and hash. The temporary file is removed
+    when the context exits."""
+    fd, path = tempfile.mkstemp(prefix='mlaide-compressed-')
+    try:
+        with os.fdopen(fd, 'wb') as target:
+            # The hash is calculated while compressing, so that the compressed file is not read again
+            hashing_target = _HashingWriter(target)
+            if isinstance(file, InMemoryArtifactFile):
+                file.file_content.seek(0)
+                compress(file.file_content, hashing_target, codec)
+                file.file_content.seek(0)
+            else:
+                with open(file.file_name, 'rb') as source:
+                    compress(source, hashing_target, codec)
+
+        yield CompressedFile(path=path, file_hash=hashing_target.hash.hexdigest())
+    finally:
+        os.remove(path)
+
+
+def decompress_bytes(content: BytesIO, codec: Optional[str]) -> BytesIO:
+    """Decompresses a downloaded file. The file is returned as it is if `codec` is `None`."""
+    if codec is None:
+        return content
+
+    result = BytesIO()
+    decompress(content, result, codec)
+    result.seek(0)
+    return result
+
+
+def extract_zip(zip_file: BinaryIO, target_directory: str, codec: Optional[str]):
+    """Extracts a downloaded artifact and decompresses its files"""
+    with ZipFile(zip_file) as z:
+        if codec is None:
+            z.extractall(target_directory)
+            return
+
+        for info in z.infolist():
+            if info.is_dir():
+                continue
+
+            # `extract` sanitizes the path of the member, the decompressed file replaces the extracted file afterwards
+            path = z.extract(info, target_directory)
+            decompressed_path = path + '.decompressed'
+            with open(path, 'rb') as source, open(decompressed_path, 'wb') as target:
+                decompress(source, target, codec)
+            os.replace(decompressed_path, path)
+
+
+def _check_codec(codec: str) -> str:
+    if codec not in CODECS:
+        raise ValueError(f"unknown compression codec '{codec}', expected one of {', '.join(CODECS)}")
+    if codec == 'zstd' and zstandard is None:
+        raise ValueError("the compression codec 'zstd' requires the package zstandard")
+
+    return codec
@@ -1,19 +1,140 @@
 import hashlib
+import io
+import tempfile
 from io import BytesIO
+from typing import BinaryIO, Iterator, Union
 
-def calculate_checksum_of_file(fileName: str) -> str:
-    with open(fileName, "rb") as f:
-        file_hash = hashlib.sha256()
-        while chunk := f.read(8192):
-            file_hash.update(chunk)
+# hashlib releases the GIL for buffers larger than 2 KiB, so large reads allow hashing on multiple threads in parallel
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def calculate_checksum_of_file(fileName: str, buffer_size: int = DEFAULT_BUFFER_SIZE) -> str:
+    file_hash = hashlib.sha256()
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(fileName, "rb", buffering=0) as f:
+        while size := f.readinto(buffer):
+            file_hash.update(view[:size])
 
     return file_hash.hexdigest()
 
-def calculate_checksum_of_bytes(bytes: BytesIO) -> str:
+
+def calculate_checksum_of_bytes(bytes: BytesIO, buffer_size: int = DEFAULT_BUFFER_SIZE) -> str:
     file_hash = hashlib.sha256()
-    while chunk := bytes.read(8192):
+    while chunk := bytes.read(buffer_size):
         file_hash.update(chunk)
-    
+
     bytes.seek(0)
 
-    return file_hash.hexdigest()
\ No newline at end of file
+    return file_hash.hexdigest()
+
+
+class ChunkedFileReader(object):
+    """Wraps a binary file, so that iterating over it yields chunks of a fixed size instead of lines. This allows to
+    stream a file in a multipart request with bounded memory, even if the file contains no line breaks."""
+
+    def __init__(self, file: BinaryIO, chunk_size: int = DEFAULT_BUFFER_SIZE):
+        self.__file = file
+        self.__chunk_size = chunk_size
+
+    @property
+    def name(self) -> str:
+        return self.__file.name
+
+    def read(self, size: int = -1) -> bytes:
+        return self.__file.read(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self.__file.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self.__file.tell()
+
+    def fileno(self) -> int:
+        return self.__file.fileno()
+
+    def close(self):
+        self.__file.close()
+
+    def __iter__(self) -> Iterator[bytes]:
+        while chunk := self.__file.read(self.__chunk_size):
+            yield chunk
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class BufferReader(io.RawIOBase):
+    """A read-only binary file over a contiguous buffer, e.g. a `memoryview` of a numpy array. The buffer is not
+    copied, only the chunks that are read. Iterating over it yields chunks of a fixed size like `ChunkedFileReader`."""
+
+    def __init__(self, buffer, chunk_size: int = DEFAULT_BUFFER_SIZE):
+        self.__view = memoryview(buffer).cast('B')
+        self.__position = 0
+        self.__chunk_size = chunk_size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), len(self.__view) - self.__position)
+        if size <= 0:
+            return 0
+
+        buffer[:size] = self.__view[self.__position:self.__position + size]
+        self.__position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.__position
+        elif whence == io.SEEK_END:
+            offset += len(self.__view)
+        if offset < 0:
+            raise ValueError(f'negative seek position {offset}')
+
+        self.__position = offset
+        return self.__position
+
+    def tell(self) -> int:
+        return self.__position
+
+    def getbuffer(self) -> memoryview:
+        return self.__view
+
+    def __iter__(self) -> Iterator[bytes]:
+        while chunk := self.read(self.__chunk_size):
+            yield chunk
+
+
+class SpooledFile(object):
+    """Collects written data in memory until it exceeds `max_memory_size` and moves it to an anonymous temporary file
+    afterwards. Unlike `tempfile.SpooledTemporaryFile` the result is a plain binary file object, which can be used by
+    `zipfile` on all supported Python versions."""
+
+    def __init__(self, max_memory_size: int):
+        self.__max_memory_size = max_memory_size
+        self.__file: Union[BytesIO, BinaryIO] = BytesIO()
+
+    @property
+    def in_memory(self) -> bool:
+        return isinstance(self.__file, BytesIO)
+
+    def write(self, data: bytes):
+        if self.in_memory and self.__file.tell() + len(data) > self.__max_memory_size:
+            file = tempfile.TemporaryFile()
+            file.write(self.__file.getbuffer())
+            self.__file = file
+
+        self.__file.write(data)
+
+    def rewind(self) -> BinaryIO:
+        """Returns the written file positioned at its beginning"""
+        self.__file.seek(0)
+        return self.__file
@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from typing import Callable, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    file_hash TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (path, size, mtime_ns, inode)
+)
+"""
+
+# Counting all rows requires a table scan; therefore the size bound is only enforced every n insertions
+_EVICTION_INTERVAL = 100
+
+
+class FileHashCache(object):
+    """A persistent cache of file hashes stored in a SQLite database. Entries are keyed by the absolute path, size,
+    modification time and inode of a file, so that a file will be hashed again as soon as any of these change. When the
+    cache exceeds `max_entries` the least recently used entries will be evicted.
+
+    The cache can be shared by multiple threads and processes. Cache hits only read from the database; the time they
+    were last used is written by `flush` (or the next insertion), so that hashing many unchanged files does not commit
+    once per file.
+
+    The cache is only an optimization: if the database cannot be created or used (e.g. a read-only home directory or a
+    locked database), a warning is issued once and all files are hashed without cache.
+    """
+
+    __database_path: str
+    __max_entries: int
+    __connection: Optional[sqlite3.Connection] = None
+
+    def __init__(self, directory: str, max_entries: int = 100_000):
+        self.__database_path = os.path.join(directory, 'file-hashes.sqlite')
+        self.__max_entries = max_entries
+        self.__lock = threading.Lock()
+        self.__insertions = 0
+        self.__used_keys = set()
+        self.__disabled = False
+
+    def get_or_compute(self, path: str, compute_hash: Callable[[str], str]) -> str:
+        """Returns the cached hash of the file. If the file is not in the cache, its hash will be computed using
+        `compute_hash` and added to the cache.
+
+        Arguments:
+            path: The absolute path of the file.
+            compute_hash: A function that calculates the hash of the file at the given path.
+        """
+        stat = os.stat(path)
+        key = (path, stat.st_size, stat.st_mtime_ns, stat.st_ino)
+
+        cached_hash = self.__get(key)
+        if cached_hash is not None:
+            return cached_hash
+
+        file_hash = compute_hash(path)
+
+        # Do not cache the hash if the file was modified while it was hashed
+        stat_after = os.stat(path)
+        if key == (path, stat_after.st_size, stat_after.st_mtime_ns, stat_after.st_ino):
+            self.__put(key, file_hash)
+
+        return file_hash
+
+    def flush(self):
+        """Writes the time the entries were last used since the last flush in a single transaction"""
+        with self.__lock:
+            if self.__used_keys:
+                try:
+                    connection = self.__connect()
+                    if connection is not None:
+                        self.__touch(connection)
+                        connection.commit()
+                except (OSError, sqlite3.Error) as e:
+                    self.__disable(e)
+
+    def close(self):
+        self.flush()
+        with self.__lock:
+            if self.__connection is not None:
+                self.__connection.close()
+                self.__connection = None
+
+    def __get(self, key) -> Optional[str]:
+        with self.__lock:
+            try:
+                connection = self.__connect()
+                if connection is None:
+                    return None
+                row = connection.execute(
+                    "SELECT file_hash FROM file_hashes WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                    key).fetchone()
+            except (OSError, sqlite3.Error) as e:
+                self.__disable(e)
+                return None
+            if row is None:
+                return None
+
+            self.__used_keys.add(key)
+            return row[0]
+
+    def __put(self, key, file_hash: str):
+        with self.__lock:
+            try:
+                connection = self.__connect()
+                if connection is None:
+                    return
+                # Older entries of the same path can never be hit again
+                connection.execute("DELETE FROM file_hashes WHERE path = ?", (key[0],))
+                connection.execute(
+                    "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, inode, file_hash, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (*key, file_hash, time.time()))
+
+                self.__touch(connection)
+                self.__insertions += 1
+                if self.__insertions % _EVICTION_INTERVAL == 0:
+                    self.__evict(connection)
+
+                connection.commit()
+            except (OSError, sqlite3.Error) as e:
+                self.__disable(e)
+
+    def __touch(self, connection: sqlite3.Connection):
+        last_used = time.time()
+        connection.executemany(
+            "UPDATE file_hashes SET last_used = ? WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+            [(last_used, *key) for key in self.__used_keys])
+        self.__used_keys.clear()
+
+    def __evict(self, connection: sqlite3.Connection):
+        count = connection.execute("SELECT COUNT(*) FROM file_hashes").fetchone()[0]
+        if count > self.__max_entries:
+            connection.execute(
+                "DELETE FROM file_hashes WHERE rowid IN "
+                "(SELECT rowid FROM file_hashes ORDER BY last_used ASC LIMIT ?)",
+                (count - self.__max_entries,))
+
+    def __disable(self, error: Exception):
+        warnings.warn(f'The file hash cache {self.__database_path} cannot be used, files will be hashed without cache: '
+                      f'{error}', RuntimeWarning)
+        self.__disabled = True
+        self.__used_keys.clear()
+        if self.__connection is not None:
+            try:
+                self.__connection.close()
+            except sqlite3.Error:
+                pass
+            self.__connection = None
+
+    def __connect(self) -> Optional[sqlite3.Connection]:
+        if self.__disabled:
+            return None
+
+        if self.__connection is None:
+            os.makedirs(os.path.dirname(self.__database_path), exist_ok=True)
+            self.__connection = sqlite3.connect(self.__database_path, timeout=30, check_same_thread=False)
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            self.__connection.execute(_SCHEMA)
+            self.__connection.commit()
+
+        return self.__connection
@@ -0,0 +1,118 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _CountingWriter(object):
+    """A file-like object that discards all written data and only counts its size"""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data) -> int:
+        self.size += len(data)
+        return len(data)
+
+
+def estimate_size(model: Any) -> int:
+    """Estimates the memory footprint of a model by the size of its serialized representation. The model is
+    serialized into a counting sink, so that the serialized bytes are never held in memory."""
+    import cloudpickle
+
+    writer = _CountingWriter()
+    try:
+        cloudpickle.dump(model, writer)
+    except Exception:
+        return sys.getsizeof(model)
+
+    return writer.size
+
+
+class ModelCache(object):
+    """A bounded in-memory cache of deserialized models.
+
+    * Models are keyed by their resolved version and evicted in least recently used order as soon as the cache holds
+      more than `max_entries` models or more than `max_bytes` bytes (estimated by `size_of`). The size of a model is
+      only estimated if `max_bytes` is set, because estimating it serializes the whole model.
+    * Lookups without a version (the latest version or the latest version of a stage) are resolved to a version, which
+      is reused for `ttl` seconds before it will be resolved again.
+    * Concurrent requests for the same model that is not cached yet are de-duplicated: only the first thread loads the
+      model, all other threads wait for its result.
+    """
+
+    def __init__(self,
+                 max_entries: int,
+                 max_bytes: Optional[int] = None,
+                 ttl: float = 60.0,
+                 size_of: Optional[Callable[[Any], int]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.__max_entries = max_entries
+        self.__max_bytes = max_bytes
+        self.__ttl = ttl
+        self.__size_of = size_of if size_of is not None else estimate_size
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__entries: 'OrderedDict[Hashable, Tuple[Any, int]]' = OrderedDict()
+        self.__size = 0
+        self.__versions: Dict[Hashable, Tuple[int, float]] = {}
+        self.__loading: Dict[Hashable, Future] = {}
+
+    def get_version(self, alias: Hashable) -> Optional[int]:
+        """Returns the version an alias (e.g. the latest version of a stage) was resolved to, if it was resolved within
+        the last `ttl` seconds."""
+        with self.__lock:
+            resolved = self.__versions.get(alias)
+            if resolved is None or self.__clock() - resolved[1] >= self.__ttl:
+                return None
+
+            return resolved[0]
+
+    def set_version(self, alias: Hashable, version: int):
+        with self.__lock:
+            self.__versions[alias] = (version, self.__clock())
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        """Returns the cached model. If the model is not cached, it will be loaded using `load` and added to the
+        cache.
+
+        Arguments:
+            key: The key of the model. The key must identify an immutable model version.
+            load: A function that loads the model.
+        """
+        with self.__lock:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                return self.__entries[key][0]
+
+            future = self.__loading.get(key)
+            is_loading_thread = future is None
+            if is_loading_thread:
+                future = self.__loading[key] = Future()
+
+        if not is_loading_thread:
+            return future.result()
+
+        try:
+            model = load()
+            self.__add(key, model, self.__size_of(model) if self.__max_bytes is not None else 0)
+            future.set_result(model)
+            return model
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.__lock:
+                del self.__loading[key]
+
+    def __add(self, key: Hashable, model: Any, size: int):
+        with self.__lock:
+            self.__entries[key] = (model, size)
+            self.__size += size
+
+            while len(self.__entries) > 1 and (len(self.__entries) > self.__max_entries or
+                                               (self.__max_bytes is not None and self.__size > self.__max_bytes)):
+                _, (_, evicted_size) = self.__entries.popitem(last=False)
+                self.__size -= evicted_size
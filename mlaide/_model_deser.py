@@ -1,48 +1,44 @@
 import io
+import json
 import os
-from typing import Any, Collection, Union
-import cloudpickle
 import tempfile
-from pathlib import Path
-
-from mlaide.model.artifact_file import ArtifactFile
+from contextlib import contextmanager
+from typing import Any, Collection, Iterator, Union
 
 from mlaide.model import InMemoryArtifactFile, LocalArtifactFile
-
-
-def serialize(model: Any) -> Collection[Union[InMemoryArtifactFile, LocalArtifactFile]]:
-    files = []
-
-    for class_obj in model.__class__.__mro__:
-        module_name = class_obj.__module__
-        if not module_name:
-            continue
-        # elif module_name.startswith("torch"):
-        #     model_type = "torch"
-        #     bytestream, method = ensure_bytestream(model)
-        #     break
-        elif module_name.startswith("sklearn"):
-            buffer = io.BytesIO()
-            cloudpickle.dump(model, buffer)
-            buffer.seek(0)
-
-            files.append(InMemoryArtifactFile(file_name='model.pkl', file_content=buffer))
-            break
-        # elif module_name.startswith("xgboost"):
-        #     model_type = "xgboost"
-        #     bytestream, method = ensure_bytestream(model)
-        #     break
-        elif module_name.startswith("keras.engine.training"):
-            with tempfile.TemporaryDirectory() as tmpdirname:
-                model.save(tmpdirname, save_format='tf')
-
-                tmpdir_path = Path(tmpdirname)
-                pathlist = tmpdir_path.rglob('*')
-                for path in pathlist:
-                    if (path.is_file()):
-                        file_name = os.path.split(path.absolute())
-                        files.append(LocalArtifactFile(file_name=file_name, file_path=path))
-
-            break
-
-    return files
+from mlaide.model_flavor import MANIFEST_FILE_NAME, PickleFlavor, find_model_flavor, get_model_flavor
+
+
+@contextmanager
+def serialize(model: Any, buffer_min_size: int = 0) \
+        -> Iterator[Collection[Union[InMemoryArtifactFile, LocalArtifactFile]]]:
+    """Serializes a model with the first model flavor that can store it and adds a manifest `flavor.json`, which
+    records the flavor for `deserialize`. The files that the flavor wrote to disk are removed when the context exits,
+    therefore the files must be uploaded within the context.
+
+    Arguments:
+        model: The model.
+        buffer_min_size: If greater than 0, flavors that support it (e.g. `sklearn` and `pickle`) store each contiguous
+            buffer (e.g. the data of a numpy array) of at least this size as a separate file instead of copying it
+            into `model.pkl`. Models that are stored like this cannot be loaded by older versions of this client.
+    """
+    flavor = find_model_flavor(model)
+    manifest = {'flavor': flavor.name, 'properties': flavor.properties(model)}
+
+    with tempfile.TemporaryDirectory(prefix='mlaide-model-') as staging_directory:
+        files = list(flavor.serialize(model, staging_directory=staging_directory, buffer_min_size=buffer_min_size))
+        files.append(InMemoryArtifactFile(file_name=MANIFEST_FILE_NAME,
+                                          file_content=io.BytesIO(json.dumps(manifest).encode('utf-8'))))
+        yield files
+
+
+def deserialize(directory: str) -> Any:
+    """Restores a model from the files of its artifact in `directory` with the flavor that is recorded in the
+    manifest. Models that were stored without manifest are unpickled from `model.pkl`."""
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE_NAME), 'rb') as file:
+            manifest = json.load(file)
+    except FileNotFoundError:
+        return PickleFlavor().deserialize(directory, {})
+
+    return get_model_flavor(manifest['flavor']).deserialize(directory, manifest.get('properties') or {})
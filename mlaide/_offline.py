@@ -0,0 +1,366 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from contextlib import ExitStack
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from . import _file_utils
+from ._api_client import Client
+from ._api_client.api import artifact_api, experiment_api, run_api
+from ._api_client.dto import ArtifactDto, ExperimentDto, ExperimentRefDto, FileHashDto, RunDto
+from ._artifact_cache import _FileLock
+from .background_writer import merge_patch
+from .model import InMemoryArtifactFile, LocalArtifactFile, NewArtifact, RunStatus
+
+_LOG_SUFFIX = '.wal'
+_STATE_SUFFIX = '.state'
+_VERSION = 1
+
+_OPEN = 'open'
+_CREATE_EXPERIMENT = 'create_experiment'
+_CREATE_RUN = 'create_run'
+_LOG_METRICS = 'log_metrics'
+_LOG_PARAMETERS = 'log_parameters'
+_SET_STATUS = 'set_status'
+_ADD_ARTIFACT = 'add_artifact'
+
+
+class OfflineLog(object):
+    """Records experiments, runs, metrics, parameters and artifacts in a local write-ahead log instead of sending them
+    to the server. Every operation is appended as a JSON line and flushed to disk before the call returns, so that
+    nothing is lost if the process crashes. Artifact files are stored once by their content hash. Use `sync` to replay
+    the log to the server later.
+
+    Experiments and runs get local keys: experiment keys start with `offline-` and run keys are negative numbers. Both
+    are replaced by the keys assigned by the server during `sync`.
+    """
+
+    __directory: str
+    __project_key: str
+
+    def __init__(self, directory: str, project_key: str):
+        self.__directory = directory
+        self.__project_key = project_key
+        self.__path = os.path.join(directory, '{}-{}-{}{}'.format(
+            datetime.utcnow().strftime('%Y%m%dT%H%M%S'), os.getpid(), uuid.uuid4().hex[:8], _LOG_SUFFIX))
+        self.__file = None
+        self.__exit_stack = ExitStack()
+        self.__lock = threading.Lock()
+        self.__experiment_count = 0
+        self.__run_count = 0
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def create_experiment(self, name: str) -> str:
+        with self.__lock:
+            self.__experiment_count += 1
+            experiment_key = 'offline-{}'.format(self.__experiment_count)
+            self.__append({'op': _CREATE_EXPERIMENT, 'experiment_key': experiment_key, 'name': name})
+            return experiment_key
+
+    def create_run(self, run: RunDto, experiment_key: Optional[str]) -> int:
+        run_dict = run.to_dict_without_none_values()
+        run_dict.pop('experimentRefs', None)
+        with self.__lock:
+            self.__run_count += 1
+            run_key = -self.__run_count
+            self.__append({'op': _CREATE_RUN, 'run_key': run_key, 'experiment_key': experiment_key, 'run': run_dict})
+            return run_key
+
+    def log_metrics(self, run_key: int, metrics: Dict[str, Any]):
+        self.__append_locked({'op': _LOG_METRICS, 'run_key': run_key, 'patch': metrics})
+
+    def log_parameters(self, run_key: int, parameters: Dict[str, Any]):
+        self.__append_locked({'op': _LOG_PARAMETERS, 'run_key': run_key, 'patch': parameters})
+
+    def set_status(self, run_key: int, status: RunStatus, end_time: datetime):
+        self.__append_locked({'op': _SET_STATUS, 'run_key': run_key, 'status': status.name,
+                              'end_time': end_time.isoformat()})
+
+    def add_artifact(self,
+                     run_key: int,
+                     artifact: NewArtifact,
+                     file_hashes: List[FileHashDto],
+                     model: bool = False):
+        objects_directory = _get_objects_directory(self.__directory)
+        os.makedirs(objects_directory, exist_ok=True)
+
+        # The shared lock prevents that the objects are collected by `sync` before the record was appended
+        with _FileLock(os.path.join(objects_directory, '.lock'), shared=True):
+            for file, file_hash in zip(artifact.files or [], file_hashes):
+                _store_object(objects_directory, file, file_hash.fileHash)
+
+            self.__append_locked({'op': _ADD_ARTIFACT,
+                                  'run_key': run_key,
+                                  'name': artifact.name,
+                                  'type': artifact.type,
+                                  'metadata': artifact.metadata,
+                                  'model': model,
+                                  'files': [{'file_name': file_hash.fileName, 'file_hash': file_hash.fileHash}
+                                            for file_hash in file_hashes]})
+
+    def close(self):
+        with self.__lock:
+            if self.__file is not None:
+                self.__file.close()
+                self.__file = None
+            self.__exit_stack.close()
+
+    def __append_locked(self, record: Dict[str, Any]):
+        with self.__lock:
+            self.__append(record)
+
+    def __append(self, record: Dict[str, Any]):
+        if self.__file is None:
+            os.makedirs(self.__directory, exist_ok=True)
+            # The log is locked as long as it is written, so that `sync` skips it
+            self.__exit_stack.enter_context(_FileLock(self.__path))
+            self.__file = open(self.__path, 'a', encoding='utf-8')
+            self.__write({'op': _OPEN, 'version': _VERSION, 'project_key': self.__project_key})
+
+        self.__write(record)
+
+    def __write(self, record: Dict[str, Any]):
+        self.__file.write(json.dumps(record) + '\n')
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+
+def sync(client: Client, directory: str, project_key: str) -> int:
+    """Replays all offline logs of a project in `directory` to the server. Logs that are still written by another
+    process are skipped. The progress is recorded after each request, so that an interrupted sync continues where it
+    stopped without creating runs or artifacts twice. Synced logs and artifact files that are no longer referenced
+    are deleted.
+
+    Returns:
+        The number of logs that were synced.
+    """
+    if not os.path.isdir(directory):
+        return 0
+
+    synced = 0
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(_LOG_SUFFIX) and _sync_log(client, os.path.join(directory, name), project_key):
+            synced += 1
+
+    _collect_garbage(directory)
+    return synced
+
+
+def _sync_log(client: Client, path: str, project_key: str) -> bool:
+    state_path = path + _STATE_SUFFIX
+    try:
+        with _FileLock(path, blocking=False):
+            records = _read_records(path)
+            if not records or records[0].get('project_key') != project_key:
+                return False
+
+            state = _load_state(state_path)
+            _Replay(client, project_key, _get_objects_directory(os.path.dirname(path)), state,
+                    lambda: _save_state(state_path, state)).apply(records)
+    except BlockingIOError:
+        return False
+
+    # Files that are open cannot be removed on Windows, so the log is removed after the lock was released. The state
+    # is removed last: a concurrent sync that locks the log in between finds all records applied and sends nothing.
+    for synced_path in (path, state_path):
+        try:
+            os.remove(synced_path)
+        except FileNotFoundError:
+            pass
+    return True
+
+
+class _Replay(object):
+    """Applies the records of a log to the server. `state` contains the index of the next record and the keys assigned
+    by the server and is saved after each request."""
+
+    def __init__(self, client: Client, project_key: str, objects_directory: str, state: Dict[str, Any], save_state):
+        self.__client = client
+        self.__project_key = project_key
+        self.__objects_directory = objects_directory
+        self.__state = state
+        self.__save_state = save_state
+
+    def apply(self, records: List[Dict[str, Any]]):
+        index = max(self.__state['applied'], 1)
+        while index < len(records):
+            if records[index]['op'] in (_LOG_METRICS, _LOG_PARAMETERS):
+                index = self.__apply_patches(records, index)
+            else:
+                self.__apply(index, records[index])
+                index += 1
+
+            self.__state['applied'] = index
+            self.__save_state()
+
+    def __apply_patches(self, records: List[Dict[str, Any]], index: int) -> int:
+        # Consecutive metrics and parameters are merged into one merge patch per run and resource
+        patches: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        while index < len(records) and records[index]['op'] in (_LOG_METRICS, _LOG_PARAMETERS):
+            record = records[index]
+            merge_patch(patches.setdefault((record['op'], record['run_key']), {}), record['patch'])
+            index += 1
+
+        for (op, local_run_key), patch in patches.items():
+            update = run_api.update_run_metrics if op == _LOG_METRICS else run_api.update_run_parameters
+            arguments = {'metrics' if op == _LOG_METRICS else 'parameters': patch}
+            update(client=self.__client, project_key=self.__project_key,
+                   run_key=self.__get_run_key(local_run_key), **arguments)
+
+        return index
+
+    def __apply(self, index: int, record: Dict[str, Any]):
+        op = record['op']
+        if op == _CREATE_EXPERIMENT:
+            experiment = experiment_api.create_experiment(client=self.__client,
+                                                          project_key=self.__project_key,
+                                                          experiment=ExperimentDto(name=record['name']))
+            self.__state['experiment_keys'][record['experiment_key']] = experiment.key
+
+        elif op == _CREATE_RUN:
+            run = RunDto.from_dict(record['run'])
+            experiment_key = record['experiment_key']
+            if experiment_key is not None:
+                run.experiment_refs = [
+                    ExperimentRefDto(self.__state['experiment_keys'].get(experiment_key, experiment_key))]
+            created_run = run_api.create_run(client=self.__client, project_key=self.__project_key, run=run)
+            self.__state['run_keys'][str(record['run_key'])] = created_run.key
+
+        elif op == _SET_STATUS:
+            run_api.partial_update_run(client=self.__client,
+                                       project_key=self.__project_key,
+                                       run_key=self.__get_run_key(record['run_key']),
+                                       run=RunDto.from_dict({'status': record['status'],
+                                                             'endTime': record['end_time']}))
+
+        elif op == _ADD_ARTIFACT:
+            self.__add_artifact(index, record)
+
+    def __add_artifact(self, index: int, record: Dict[str, Any]):
+        run_key = self.__get_run_key(record['run_key'])
+        file_hashes = [FileHashDto(file['file_name'], file['file_hash']) for file in record['files']]
+
+        # A previous sync might have created the artifact and failed while uploading its files
+        artifact_version = self.__state['artifacts'].get(str(index))
+        if artifact_version is None:
+            existing_artifact = artifact_api.find_artifact_by_file_hashes(client=self.__client,
+                                                                          project_key=self.__project_key,
+                                                                          artifact_name=record['name'],
+                                                                          files=file_hashes)
+            if existing_artifact is not None:
+                run_api.attach_artifact_to_run(client=self.__client,
+                                               project_key=self.__project_key,
+                                               run_key=run_key,
+                                               artifact_name=existing_artifact.name,
+                                               artifact_version=existing_artifact.version)
+                artifact_version = existing_artifact.version
+                file_hashes = []
+            else:
+                artifact = artifact_api.create_artifact(client=self.__client,
+                                                        project_key=self.__project_key,
+                                                        artifact=ArtifactDto(name=record['name'],
+                                                                             type=record['type'],
+                                                                             metadata=record['metadata']),
+                                                        run_key=run_key)
+                artifact_version = artifact.version
+
+            self.__state['artifacts'][str(index)] = artifact_version
+            self.__save_state()
+
+        for file_hash in file_hashes:
+            with open(os.path.join(self.__objects_directory, file_hash.fileHash), 'rb') as file:
+                artifact_api.upload_file(client=self.__client,
+                                         project_key=self.__project_key,
+                                         artifact_name=record['name'],
+                                         artifact_version=artifact_version,
+                                         filename=file_hash.fileName,
+                                         file_hash=file_hash.fileHash,
+                                         file=_file_utils.ChunkedFileReader(file))
+
+        if record['model']:
+            artifact_api.create_model(client=self.__client,
+                                      project_key=self.__project_key,
+                                      artifact_name=record['name'],
+                                      artifact_version=artifact_version)
+
+    def __get_run_key(self, local_run_key: int) -> int:
+        return self.__state['run_keys'][str(local_run_key)]
+
+
+def _get_objects_directory(directory: str) -> str:
+    return os.path.join(directory, 'objects')
+
+
+def _store_object(objects_directory: str, file: Union[InMemoryArtifactFile, LocalArtifactFile], file_hash: str):
+    object_path = os.path.join(objects_directory, file_hash)
+    if os.path.exists(object_path):
+        return
+
+    # Write to a temporary file first, so that a crash never leaves a truncated object behind
+    fd, temp_path = tempfile.mkstemp(prefix='.tmp-', dir=objects_directory)
+    try:
+        with os.fdopen(fd, 'wb') as target:
+            if isinstance(file, InMemoryArtifactFile):
+                target.write(file.file_content.getbuffer())
+            else:
+                with open(file.file_name, 'rb') as source:
+                    shutil.copyfileobj(source, target, _file_utils.DEFAULT_BUFFER_SIZE)
+            target.flush()
+            os.fsync(target.fileno())
+        os.replace(temp_path, object_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _read_records(path: str) -> List[Dict[str, Any]]:
+    records = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # The process crashed while appending the last record
+                break
+
+    return records
+
+
+def _load_state(state_path: str) -> Dict[str, Any]:
+    try:
+        with open(state_path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {'applied': 0, 'experiment_keys': {}, 'run_keys': {}, 'artifacts': {}}
+
+
+def _save_state(state_path: str, state: Dict[str, Any]):
+    temp_path = state_path + '.tmp'
+    with open(temp_path, 'w') as file:
+        json.dump(state, file)
+    os.replace(temp_path, state_path)
+
+
+def _collect_garbage(directory: str):
+    objects_directory = _get_objects_directory(directory)
+    if not os.path.isdir(objects_directory):
+        return
+
+    with _FileLock(os.path.join(objects_directory, '.lock')):
+        referenced = set()
+        for name in os.listdir(directory):
+            if name.endswith(_LOG_SUFFIX):
+                for record in _read_records(os.path.join(directory, name)):
+                    if record['op'] == _ADD_ARTIFACT:
+                        referenced.update(file['file_hash'] for file in record['files'])
+
+        for name in os.listdir(objects_directory):
+            if not name.startswith('.') and name not in referenced:
+                os.remove(os.path.join(objects_directory, name))
@@ -0,0 +1,140 @@
+import dataclasses
+import itertools
+import random
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from multiprocessing.context import BaseContext
+from multiprocessing.util import Finalize
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from ._api_client import Client
+from ._hash_cache import FileHashCache
+from .active_run import ActiveRun
+from .connection_options import ConnectionOptions, _resolve_options
+from .model import Experiment, Git, RunStatus, SweepTrialResult
+
+ParameterSpace = Dict[str, Union[Sequence[Any], Callable[[random.Random], Any]]]
+TrainFunction = Callable[[ActiveRun, Dict[str, Any]], Any]
+
+
+def grid_search(space: ParameterSpace) -> List[Dict[str, Any]]:
+    """Returns all combinations of the parameter values"""
+    for key, values in space.items():
+        if callable(values):
+            raise ValueError(f"parameter '{key}' must be a sequence of values for a grid search")
+
+    keys = list(space.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*space.values())]
+
+
+def random_search(space: ParameterSpace, trials: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Returns `trials` random combinations. A parameter value is either chosen from a sequence of values or sampled
+    by calling a function with a `random.Random` instance, e.g. `lambda rng: rng.uniform(0.001, 0.1)`."""
+    rng = random.Random(seed)
+    return [{key: values(rng) if callable(values) else rng.choice(values) for key, values in space.items()}
+            for _ in range(trials)]
+
+
+@dataclass
+class _WorkerContext:
+    client_type: type
+    client_arguments: Dict[str, Any]
+    project_key: str
+    experiment: Experiment
+    git: Optional[Git]
+    options: Optional[ConnectionOptions]
+
+
+_worker_context: Optional[_WorkerContext] = None
+_worker_client: Optional[Client] = None
+_worker_hash_cache: Optional[FileHashCache] = None
+
+
+def _init_worker(context: _WorkerContext):
+    global _worker_context, _worker_client, _worker_hash_cache
+
+    # Every worker process creates its own client. A client that was inherited by fork must never be used, because
+    # the parent and its children would read from and write to the same pooled connections.
+    _worker_context = context
+    _worker_client = context.client_type(**context.client_arguments)
+    # Worker processes do not run atexit handlers, but the finalizers of multiprocessing
+    Finalize(None, _worker_client.close, exitpriority=10)
+
+    options = _resolve_options(context.options)
+    if options.hash_cache_enabled:
+        _worker_hash_cache = FileHashCache(options.cache_directory, options.hash_cache_max_entries)
+        Finalize(None, _worker_hash_cache.close, exitpriority=10)
+
+
+def _run_trial(index: int, parameters: Dict[str, Any], run_name: Optional[str], train: TrainFunction) \
+        -> SweepTrialResult:
+    run = ActiveRun(api_client=_worker_client,
+                    project_key=_worker_context.project_key,
+                    experiment=_worker_context.experiment,
+                    run_name=run_name,
+                    git=_worker_context.git,
+                    options=_worker_context.options,
+                    hash_cache=_worker_hash_cache)
+    run_key = run.run.key
+
+    try:
+        run.log_parameters(parameters)
+        result = train(run, parameters)
+    except Exception:
+        error = traceback.format_exc()
+        run.set_failed_status()
+        return SweepTrialResult(index=index, parameters=parameters, status=RunStatus.FAILED, run_key=run_key,
+                                error=error)
+
+    run.set_completed_status()
+    return SweepTrialResult(index=index, parameters=parameters, status=RunStatus.COMPLETED, run_key=run_key,
+                            result=result)
+
+
+def run_sweep(*,
+              api_client: Client,
+              project_key: str,
+              experiment: Experiment,
+              git: Optional[Git],
+              options: Optional[ConnectionOptions],
+              train: TrainFunction,
+              trials: List[Dict[str, Any]],
+              run_name_prefix: Optional[str] = None,
+              max_workers: Optional[int] = None,
+              mp_context: Optional[BaseContext] = None) -> List[SweepTrialResult]:
+    """Runs each parameter combination of `trials` as a run in a process pool and returns the results in the order
+    of `trials`. A trial whose worker failed before the run was finished (e.g. because the process crashed or the
+    result could not be pickled) is reported as failed."""
+    context = _WorkerContext(
+        client_type=type(api_client),
+        # Only the settings of the client are passed to the workers, its pooled connections and locks are not
+        client_arguments={f.name: getattr(api_client, f.name) for f in dataclasses.fields(api_client) if f.init},
+        project_key=project_key,
+        experiment=experiment,
+        git=git,
+        options=options)
+
+    results: List[Optional[SweepTrialResult]] = [None] * len(trials)
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=mp_context,
+                             initializer=_init_worker,
+                             initargs=(context,)) as executor:
+        futures = {
+            executor.submit(_run_trial,
+                            index,
+                            parameters,
+                            f'{run_name_prefix}-{index}' if run_name_prefix is not None else None,
+                            train): index
+            for index, parameters in enumerate(trials)
+        }
+
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception:
+                results[index] = SweepTrialResult(index=index, parameters=trials[index], status=RunStatus.FAILED,
+                                                  error=traceback.format_exc())
+
+    return results
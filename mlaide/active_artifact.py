@@ -1,11 +1,15 @@
-from . import mapper, _model_deser
+from . import mapper, _compression, _model_deser
 from ._api_client import Client
+from ._artifact_cache import ArtifactCache
 from ._api_client.api import artifact_api
 from .model import Artifact, ModelStage
 
+import os
+import shutil
+import tempfile
 from dataclasses import replace
 from io import BytesIO
-from typing import Optional, Tuple
+from typing import Any, BinaryIO, List, Optional, Tuple
 from zipfile import ZipFile
 
 
@@ -15,25 +19,42 @@ class ActiveArtifact(object):
     __api_client: Client
     __project_key: str
     __artifact: Artifact
-    __cached_zip: Tuple[BytesIO, Optional[str]] = None
+    __cached_zip: Tuple[BinaryIO, Optional[str]] = None
+    __artifact_cache: Optional[ArtifactCache] = None
+    __requested_version: Optional[int]
+    __model_stage: Optional[ModelStage]
+    __etag: Optional[str] = None
 
     def __init__(self,
                  api_client: Client,
                  project_key: str,
                  artifact_name: str,
                  artifact_version: Optional[int],
-                 model_stage: Optional[ModelStage] = None):
+                 model_stage: Optional[ModelStage] = None,
+                 artifact_cache: Optional[ArtifactCache] = None):
         self.__api_client = api_client
         self.__project_key = project_key
+        self.__artifact_cache = artifact_cache
+        self.__requested_version = artifact_version
+        self.__model_stage = model_stage
         self.__artifact = self.__load_artifact(artifact_name, artifact_version, model_stage)
 
     def __load_artifact(self, artifact_name: str, artifact_version: Optional[int],
                         model_stage: Optional[ModelStage]) -> Artifact:
-        artifact_dto = artifact_api.get_artifact(client=self.__api_client,
-                                                 project_key=self.__project_key,
-                                                 artifact_name=artifact_name,
-                                                 artifact_version=artifact_version,
-                                                 model_stage=model_stage.value if model_stage is not None else None)
+        if artifact_version is None:
+            # Keep the ETag of the latest version, so that the first `refresh` is already a conditional request
+            artifact_dto, self.__etag = artifact_api.get_artifact_if_modified(
+                client=self.__api_client,
+                project_key=self.__project_key,
+                artifact_name=artifact_name,
+                artifact_version=None,
+                model_stage=model_stage.value if model_stage is not None else None)
+        else:
+            artifact_dto = artifact_api.get_artifact(client=self.__api_client,
+                                                     project_key=self.__project_key,
+                                                     artifact_name=artifact_name,
+                                                     artifact_version=artifact_version,
+                                                     model_stage=model_stage.value if model_stage is not None else None)
         return mapper.dto_to_artifact(artifact_dto)
 
     @property
@@ -41,36 +62,132 @@ class ActiveArtifact(object):
         # Return a deep copy to avoid changing anything by the client
         return replace(self.__artifact)
 
+    def refresh(self) -> bool:
+        """Checks whether the latest version of the artifact (or the latest version of the requested model stage)
+        changed and switches to the new version. The check uses a conditional request, so that the server only
+        returns the artifact if it was modified. Artifacts that were requested with an explicit version never change.
+
+        Returns:
+            `True` if this object refers to a new artifact version now, otherwise `False`.
+        """
+        if self.__requested_version is not None:
+            return False
+
+        artifact_dto, self.__etag = artifact_api.get_artifact_if_modified(
+            client=self.__api_client,
+            project_key=self.__project_key,
+            artifact_name=self.__artifact.name,
+            artifact_version=None,
+            model_stage=self.__model_stage.value if self.__model_stage is not None else None,
+            etag=self.__etag)
+        if artifact_dto is None or artifact_dto.version == self.__artifact.version:
+            return False
+
+        self.__artifact = mapper.dto_to_artifact(artifact_dto)
+        self.__cached_zip = None
+        return True
+
     def load(self, filename: str) -> BytesIO:
         """Load a specific file of this artifact into memory
 
         Arguments:
             filename: The name of the file that should be loaded
         """
-
-        # TODO: Do not download whole zip; instead download just the single file
+        if self.__artifact_cache is not None:
+            with self.__artifact_cache.get(self.__project_key,
+                                           self.__artifact.name,
+                                           self.__artifact.version,
+                                           self.__get_file_ids()) as directory:
+                if directory is not None:
+                    with open(os.path.join(directory, filename), 'rb') as file:
+                        return BytesIO(file.read())
+
+        file_id = _find_file_id(self.__artifact, filename)
+        if file_id is not None:
+            file = artifact_api.download_file(client=self.__api_client,
+                                              project_key=self.__project_key,
+                                              artifact_name=self.__artifact.name,
+                                              artifact_version=self.__artifact.version,
+                                              file_id=file_id)
+            if file is not None:
+                return _compression.decompress_bytes(file, self.__get_codec())
+
+        # Fall back to the whole zip if the file is unknown or the server does not provide single files
         zip_bytes, zip_filename = self.__download_zip()
         with ZipFile(zip_bytes) as z:
             zip_info = z.infolist()
             desired_file = next(info for info in zip_info if info.filename == filename)
             with z.open(desired_file, 'r') as zip_file:
-                return BytesIO(zip_file.read())
+                return _compression.decompress_bytes(BytesIO(zip_file.read()), self.__get_codec())
 
     def download(self, target_directory: str):
         """Downloads all files of this artifact and stores them into the specified directory.
 
+        With artifact cache the files are hard links to the cached files where the filesystem supports it, so that they
+        do not take up disk space twice. Such files must not be modified in place; replace them instead.
+
         Arguments:
             target_directory: The path to the directory where all files should be stored.
         """
+        if self.__artifact_cache is not None:
+            with self.__artifact_cache.get_or_add(self.__project_key,
+                                                  self.__artifact.name,
+                                                  self.__artifact.version,
+                                                  populate=self.__download_uncached,
+                                                  file_ids=self.__get_file_ids()) as directory:
+                shutil.copytree(directory, target_directory, copy_function=_link_or_copy, dirs_exist_ok=True)
+            return
 
         # download
         artifact_bytes, artifact_filename = self.__download_zip()
 
-        # unzip and write to disk
-        with ZipFile(artifact_bytes) as z:
-            z.extractall(target_directory)
+        # unzip, decompress and write to disk
+        _compression.extract_zip(artifact_bytes, target_directory, self.__get_codec())
+
+    def load_model(self) -> Any:
+        """Loads and restores the model of this artifact with the model flavor that stored it (see `ModelFlavor`).
 
-    def __download_zip(self) -> Tuple[BytesIO, str]:
+        The model is restored from the files in the artifact cache, so that flavors can memory-map large files (e.g.
+        buffers that were stored separately, see `ConnectionOptions.model_buffer_min_size`) and processes that load
+        the same model share their memory. Without artifact cache the files are downloaded into a temporary
+        directory.
+
+        Returns:
+            The deserialized model.
+        """
+        if self.__artifact_cache is not None:
+            with self.__artifact_cache.get_or_add(self.__project_key,
+                                                  self.__artifact.name,
+                                                  self.__artifact.version,
+                                                  populate=self.__download_uncached,
+                                                  file_ids=self.__get_file_ids()) as directory:
+                return _model_deser.deserialize(directory)
+
+        directory = tempfile.mkdtemp(prefix='mlaide-model-')
+        try:
+            self.download(directory)
+            return _model_deser.deserialize(directory)
+        finally:
+            # Memory-mapped files stay readable after they were removed. Where removing them fails (Windows), they are
+            # left to the cleanup of the temporary directory.
+            shutil.rmtree(directory, ignore_errors=True)
+
+    def __download_uncached(self, target_directory: str):
+        # The files are kept (decompressed) by the artifact cache, so the zip is not cached in memory
+        artifact_bytes, artifact_filename = artifact_api.download_artifact(client=self.__api_client,
+                                                                           project_key=self.__project_key,
+                                                                           artifact_name=self.__artifact.name,
+                                                                           artifact_version=self.__artifact.version)
+        with artifact_bytes:
+            _compression.extract_zip(artifact_bytes, target_directory, self.__get_codec())
+
+    def __get_file_ids(self) -> List[str]:
+        return [file.file_id for file in self.__artifact.files or []]
+
+    def __get_codec(self) -> Optional[str]:
+        return _compression.get_codec(self.__artifact.metadata)
+
+    def __download_zip(self) -> Tuple[BinaryIO, str]:
         if self.__cached_zip is None:
             self.__cached_zip = artifact_api.download_artifact(client=self.__api_client,
                                                                project_key=self.__project_key,
@@ -78,3 +195,17 @@ class ActiveArtifact(object):
                                                                artifact_version=self.__artifact.version)
 
         return self.__cached_zip
+
+
+def _find_file_id(artifact: Artifact, filename: str) -> Optional[str]:
+    return next((file.file_id for file in artifact.files or [] if file.file_name == filename), None)
+
+
+def _link_or_copy(source: str, target: str):
+    try:
+        if os.path.lexists(target):
+            os.remove(target)
+        os.link(source, target)
+    except OSError:
+        # e.g. the target is on another filesystem or the filesystem has no hard links
+        shutil.copy2(source, target)
@@ -1,13 +1,18 @@
 from mlaide._api_client.dto.experiment_dto import ExperimentDto
 from mlaide.active_run import ActiveRun
-from . import mapper
+from . import mapper, _sweep
 from ._api_client import Client
 from ._api_client.api import experiment_api
-from .model import Experiment, ArtifactRef
+from .model import Experiment, ArtifactRef, Git, SweepTrialResult
 from .git_resolver import get_git_metadata
+from ._hash_cache import FileHashCache
+from ._offline import OfflineLog
+from .background_writer import BackgroundWriterOptions
+from .connection_options import ConnectionOptions, _resolve_options
 
 from dataclasses import replace
-from typing import List
+from multiprocessing.context import BaseContext
+from typing import List, Optional
 
 
 class ActiveExperiment(object):
@@ -16,16 +21,28 @@ class ActiveExperiment(object):
     __api_client: Client
     __project_key: str
     __experiment: Experiment
+    __options: Optional[ConnectionOptions]
+    __offline_log: Optional[OfflineLog] = None
+    __hash_cache: Optional[FileHashCache] = None
 
     def __init__(self,
                  api_client: Client,
                  project_key: str,
-                 experiment_name: str):
+                 experiment_name: str,
+                 options: Optional[ConnectionOptions] = None,
+                 offline_log: Optional[OfflineLog] = None,
+                 hash_cache: Optional[FileHashCache] = None):
         self.__api_client = api_client
         self.__project_key = project_key
+        self.__options = options
+        self.__offline_log = offline_log
+        self.__hash_cache = hash_cache
         self.__experiment = self.__create_experiment(experiment_name)
 
     def __create_experiment(self, experiment_name: str) -> Experiment:
+        if self.__offline_log is not None:
+            return Experiment(key=self.__offline_log.create_experiment(experiment_name), name=experiment_name)
+
         experiment_dto = ExperimentDto(name=experiment_name)
         experiment_dto = experiment_api.create_experiment(client=self.__api_client, project_key=self.__project_key, experiment=experiment_dto)
         return mapper.dto_to_experiment(experiment_dto)
@@ -37,7 +54,8 @@ class ActiveExperiment(object):
 
     def start_new_run(self,
                       run_name: str = None,
-                      used_artifacts: List[ArtifactRef] = None) -> ActiveRun:
+                      used_artifacts: List[ArtifactRef] = None,
+                      background_writer_options: Optional[BackgroundWriterOptions] = None) -> ActiveRun:
         """Creates and starts a new run, that will be assigned to the specified experiment. The run object can be used
         to log all necessary information.
 
@@ -51,6 +69,9 @@ class ActiveExperiment(object):
             auto_create_experiment: Specifies whether the experiment (see `experiment_key`) should be created if it
                 does not exist or not. If `auto_create_experiment` is `False` and the experiment does not exist an error
                 will be raised.
+            background_writer_options: If specified, metrics and parameters will be queued and sent to the server by a
+                background thread instead of blocking the caller. Queued values are flushed when the run status is set
+                or the interpreter exits. Use `ActiveRun.flush()` to wait until all values were sent.
 
         Returns:
             This object encapsulates the newly created run and provides functions to log all information \
@@ -60,5 +81,66 @@ class ActiveExperiment(object):
                          project_key=self.__project_key,
                          experiment=self.__experiment,
                          run_name=run_name,
-                         git=get_git_metadata(),
-                         used_artifacts=used_artifacts)
\ No newline at end of file
+                         git=self.__get_git_metadata(),
+                         used_artifacts=used_artifacts,
+                         background_writer_options=background_writer_options,
+                         options=self.__options,
+                         offline_log=self.__offline_log,
+                         hash_cache=self.__hash_cache)
+
+    def run_sweep(self,
+                  train: _sweep.TrainFunction,
+                  parameters: _sweep.ParameterSpace,
+                  trials: Optional[int] = None,
+                  seed: Optional[int] = None,
+                  max_workers: Optional[int] = None,
+                  run_name_prefix: Optional[str] = None,
+                  mp_context: Optional[BaseContext] = None) -> List[SweepTrialResult]:
+        """Runs a hyperparameter sweep. Every trial is executed in a process pool as a separate run of this
+        experiment: the run is created, the parameters of the trial are logged in a single request and
+        `train(run, parameters)` is called. If `train` returns, the run will be marked as completed, if it raises an
+        exception, as failed.
+
+        Each worker process creates its own connection to the server, so the sweep can be used with the `fork` and
+        the `spawn` start method. `train`, the parameter values and the return values of `train` must be picklable,
+        e.g. `train` must be a function defined at module level.
+
+        Arguments:
+            train: The training function. It is called with the `ActiveRun` of the trial and the parameters of the
+                trial. Its return value is available in the result of the trial.
+            parameters: The search space as a dict of parameter names and either a sequence of values or a function,
+                that samples a value from a `random.Random` instance (e.g. `lambda rng: rng.uniform(0.001, 0.1)`).
+            trials: If `None`, a grid search over all combinations of values will be executed. Otherwise the number of
+                random combinations of a random search.
+            seed: The seed of a random search.
+            max_workers: The number of worker processes. Defaults to the number of CPUs.
+            run_name_prefix: If specified, the runs will be named `<prefix>-<index of trial>`.
+            mp_context: The multiprocessing context of the process pool, e.g. `multiprocessing.get_context('spawn')`.
+
+        Returns:
+            The results of all trials in the order in which the trials were generated.
+        """
+        if self.__offline_log is not None:
+            raise ValueError("sweeps are not supported in offline mode")
+
+        if trials is None:
+            parameter_combinations = _sweep.grid_search(parameters)
+        else:
+            parameter_combinations = _sweep.random_search(parameters, trials, seed)
+
+        return _sweep.run_sweep(api_client=self.__api_client,
+                                project_key=self.__project_key,
+                                experiment=self.__experiment,
+                                git=self.__get_git_metadata(),
+                                options=self.__options,
+                                train=train,
+                                trials=parameter_combinations,
+                                run_name_prefix=run_name_prefix,
+                                max_workers=max_workers,
+                                mp_context=mp_context)
+
+    def __get_git_metadata(self) -> Optional[Git]:
+        options = _resolve_options(self.__options)
+        return get_git_metadata(dirty_check=options.git_dirty_check,
+                                dirty_check_timeout=options.git_dirty_check_timeout,
+                                untracked_files=options.git_untracked_files)
@@ -1,26 +1,57 @@
 from mlaide._api_client.dto.file_hash_dto import FileHashDto
-from . import _model_deser, _file_utils
+from . import _compression, _model_deser, _file_utils
+from ._chunked_upload import find_pending_artifact_version, upload_file_in_parts
+from ._hash_cache import FileHashCache
+from ._offline import OfflineLog
 from ._api_client import Client
 from ._api_client.api import run_api, artifact_api
 from ._api_client.dto import ArtifactDto, ExperimentDto, RunDto, StatusDto
 from .model import Artifact, ArtifactRef, Git, Run, RunStatus, NewArtifact, InMemoryArtifactFile, LocalArtifactFile, Experiment
 from .mapper import dto_to_run, run_to_dto, dto_to_artifact
+from .background_writer import BackgroundWriter, BackgroundWriterOptions
+from .connection_options import ConnectionOptions, _resolve_options
+from .error import ArtifactUploadError, NotFoundError
+
+from concurrent.futures import ThreadPoolExecutor
 
 from datetime import datetime
-from typing import Dict, List, Optional, Union
+from typing import Any, Collection, Dict, List, Optional, Tuple, Union
 from io import BytesIO
 from pathlib import Path
 from os import getcwd, path
 
 
-def get_file_hash(file: Union[InMemoryArtifactFile, LocalArtifactFile]) -> FileHashDto:
+def get_file_hash(file: Union[InMemoryArtifactFile, LocalArtifactFile],
+                  hash_cache: Optional[FileHashCache] = None) -> FileHashDto:
     if isinstance(file, InMemoryArtifactFile):
         return FileHashDto(file.file_name, _file_utils.calculate_checksum_of_bytes(file.file_content))
     elif isinstance(file, LocalArtifactFile):
         file_name = Path.joinpath(Path(getcwd()), file.file_name)
         absolute_file_path = str(file_name.absolute())
-        file_hash = _file_utils.calculate_checksum_of_file(absolute_file_path)
-        return FileHashDto(extract_filename(file.file_name), file_hash)
+        if hash_cache is not None:
+            file_hash = hash_cache.get_or_compute(absolute_file_path, _file_utils.calculate_checksum_of_file)
+        else:
+            file_hash = _file_utils.calculate_checksum_of_file(absolute_file_path)
+        return FileHashDto(file.artifact_file_name or extract_filename(file.file_name), file_hash)
+
+
+def get_file_hashes(files: Collection[Union[InMemoryArtifactFile, LocalArtifactFile]],
+                    max_workers: int,
+                    hash_cache: Optional[FileHashCache] = None) -> List[FileHashDto]:
+    try:
+        if max_workers <= 1 or len(files) <= 1:
+            return [get_file_hash(file, hash_cache) for file in files]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(files)), thread_name_prefix='mlaide-hash') as executor:
+            return list(executor.map(lambda file: get_file_hash(file, hash_cache), files))
+    finally:
+        # Write the usage of all cache hits of this artifact at once
+        if hash_cache is not None:
+            hash_cache.flush()
+
+
+def _get_file_hashes_by_name(file_hashes: List[FileHashDto]) -> Dict[str, str]:
+    return {file_hash.fileName: file_hash.fileHash for file_hash in file_hashes}
 
 
 def extract_filename(file: Union[str, BytesIO]) -> str:
@@ -30,7 +61,9 @@ def extract_filename(file: Union[str, BytesIO]) -> str:
     raise Exception('filename must be provided if provided file is of type io.BytesIO')
 
 
-def get_file_content(file: Union[str, BytesIO]) -> BytesIO:
+def get_file_content(file: Union[str, BytesIO]) -> Union[BytesIO, _file_utils.ChunkedFileReader]:
+    """Returns the content of the file. Files from the filesystem will be opened for streaming and must be closed by
+    the caller; they are never read into memory at once."""
     if isinstance(file, str):  # Read the file behind the string/path
         if file.startswith('http://') or file.startswith('https://'):  # The file must be downloaded
             pass
@@ -40,8 +73,7 @@ def get_file_content(file: Union[str, BytesIO]) -> BytesIO:
             path = Path(file)
 
             if path.is_file():  # check if it is only a single file
-                file_bytes = path.read_bytes()
-                return BytesIO(file_bytes)
+                return _file_utils.ChunkedFileReader(path.open('rb'))
 
             elif path.is_dir():  # ... or is it a directory?
                 pass
@@ -57,6 +89,10 @@ class ActiveRun(object):
     __api_client: Client
     __run: Run
     __project_key: str
+    __background_writer: Optional[BackgroundWriter] = None
+    __options: ConnectionOptions
+    __hash_cache: Optional[FileHashCache] = None
+    __offline_log: Optional[OfflineLog] = None
 
     def __init__(self,
                  api_client: Client,
@@ -64,12 +100,25 @@ class ActiveRun(object):
                  experiment: Experiment,
                  run_name: str,
                  git: Optional[Git] = None,
-                 used_artifacts: Optional[List[ArtifactRef]] = None):
+                 used_artifacts: Optional[List[ArtifactRef]] = None,
+                 background_writer_options: Optional[BackgroundWriterOptions] = None,
+                 options: Optional[ConnectionOptions] = None,
+                 offline_log: Optional[OfflineLog] = None,
+                 hash_cache: Optional[FileHashCache] = None):
         self.__api_client = api_client
         self.__project_key = project_key
+        self.__offline_log = offline_log
+        self.__options = _resolve_options(options)
+        # The hash cache is shared by all runs of a client, which closes it
+        self.__hash_cache = hash_cache if self.__options.hash_cache_enabled else None
 
         self.__run = self.__create_new_run(experiment.key, run_name, git, used_artifacts)
 
+        if background_writer_options is not None:
+            self.__background_writer = BackgroundWriter(send_metrics=self.__update_metrics,
+                                                        send_parameters=self.__update_parameters,
+                                                        options=background_writer_options)
+
     def __create_new_run(self,
                          experiment_key: str,
                          run_name: str,
@@ -78,6 +127,11 @@ class ActiveRun(object):
         run = Run(name=run_name, status=RunStatus.RUNNING, git=git)
         run_to_create = run_to_dto(run, experiment_key, used_artifacts)
 
+        if self.__offline_log is not None:
+            run.start_time = run_to_create.start_time = datetime.now()
+            run.key = self.__offline_log.create_run(run_to_create, experiment_key)
+            return run
+
         created_run: RunDto = run_api.create_run(
             client=self.__api_client,
             project_key=self.__project_key,
@@ -106,33 +160,45 @@ class ActiveRun(object):
             key: The key of the metric.
             value: The value of the metric. The value can be any type that is JSON serializable.
         """
-        self.__run.metrics[key] = value
-        run_api.update_run_metrics(
-            client=self.__api_client,
-            project_key=self.__project_key,
-            run_key=self.__run.key,
-            metrics={key: value})
+        return self.log_metrics({key: value})
+
+    def log_metrics(self, metrics: Dict[str, Any]) -> Run:
+        """Logs multiple metrics with a single request
+
+        Arguments:
+            metrics: The metrics as a dict of metric keys and values. The values can be any type that is JSON
+                serializable.
+        """
+        self.__run.metrics.update(metrics)
+        self.__log_metrics(dict(metrics))
         return self.__run
 
     def log_metric_epoch(self, key: str, epoch: str, value) -> Run:
-        """Logs a metric for an epoch
+        """Logs a metric for an epoch. Only the value of the new epoch will be sent to the server; the server merges
+        it into the already logged epochs of the metric.
 
         Arguments:
             key: The key of the metric.
             epoch: The corresponding epoch.
             value: The value of the metric. The value can be any type that is JSON serializable.
         """
-        if self.__run.metrics.get(key):
-            new_dict = dict(self.__run.metrics.get(key))
-            new_dict.update({epoch: value})
-            self.__run.metrics[key] = new_dict
-        else:
-            self.__run.metrics[key] = {epoch: value}
-        run_api.update_run_metrics(
-            client=self.__api_client,
-            project_key=self.__project_key,
-            run_key=self.__run.key,
-            metrics={key: self.__run.metrics[key]})
+        return self.log_metrics_epoch(epoch, {key: value})
+
+    def log_metrics_epoch(self, epoch: str, metrics: Dict[str, Any]) -> Run:
+        """Logs multiple metrics for an epoch with a single request
+
+        Arguments:
+            epoch: The corresponding epoch.
+            metrics: The metrics as a dict of metric keys and values. The values can be any type that is JSON
+                serializable.
+        """
+        for key, value in metrics.items():
+            epochs = self.__run.metrics.get(key)
+            if not isinstance(epochs, dict):
+                epochs = self.__run.metrics[key] = {}
+            epochs[epoch] = value
+
+        self.__log_metrics({key: {epoch: value} for key, value in metrics.items()})
         return self.__run
 
     def log_parameter(self, key: str, value) -> Run:
@@ -142,13 +208,58 @@ class ActiveRun(object):
             key: The key of the parameter.
             value: The value of the parameter. The value must be a scalar value (e.g. string, int, float, ...).
         """
-        self.__run.parameters[key] = value
+        return self.log_parameters({key: value})
+
+    def log_parameters(self, parameters: Dict[str, Any]) -> Run:
+        """Logs multiple parameters with a single request
+
+        Arguments:
+            parameters: The parameters as a dict of parameter keys and values. The values must be scalar values
+                (e.g. string, int, float, ...).
+        """
+        self.__run.parameters.update(parameters)
+        self.__log_parameters(dict(parameters))
+        return self.__run
+
+    def flush(self):
+        """Blocks until all metrics and parameters that were logged in background writer mode were sent to the
+        server. Does nothing if the run does not use a background writer."""
+        if self.__background_writer is not None:
+            self.__background_writer.flush()
+
+    def __log_metrics(self, metrics: Dict[str, Any]):
+        if self.__background_writer is not None:
+            self.__background_writer.log_metrics(metrics)
+        else:
+            self.__update_metrics(metrics)
+
+    def __log_parameters(self, parameters: Dict[str, Any]):
+        if self.__background_writer is not None:
+            self.__background_writer.log_parameters(parameters)
+        else:
+            self.__update_parameters(parameters)
+
+    def __update_metrics(self, metrics: Dict[str, Any]):
+        if self.__offline_log is not None:
+            self.__offline_log.log_metrics(self.__run.key, metrics)
+            return
+
+        run_api.update_run_metrics(
+            client=self.__api_client,
+            project_key=self.__project_key,
+            run_key=self.__run.key,
+            metrics=metrics)
+
+    def __update_parameters(self, parameters: Dict[str, Any]):
+        if self.__offline_log is not None:
+            self.__offline_log.log_parameters(self.__run.key, parameters)
+            return
+
         run_api.update_run_parameters(
             client=self.__api_client,
             project_key=self.__project_key,
             run_key=self.__run.key,
-            parameters={key: value})
-        return self.__run
+            parameters=parameters)
 
     def log_model(self, model, model_name: str, metadata: Optional[Dict[str, str]] = None):
         """Creates a new artifact with type 'model'. The artifact will be registered as model.
@@ -158,15 +269,19 @@ class ActiveRun(object):
             model_name: The name of the model. The name will be used as artifact filename.
             metadata: Some optional metadata that will be attached to the artifact.
         """
-        files = _model_deser.serialize(model)
+        # The files that were staged on disk are removed as soon as they were uploaded
+        with _model_deser.serialize(model, buffer_min_size=self.__options.model_buffer_min_size) as files:
+            new_artifact = NewArtifact(
+                name=model_name,
+                type='model',
+                metadata=metadata,
+                files=files
+            )
+            if self.__offline_log is not None:
+                self.__record_artifact(new_artifact, model=True)
+                return
 
-        new_artifact = NewArtifact(
-            name=model_name,
-            type='model',
-            metadata=metadata,
-            files=files
-        )
-        artifact = self.add_artifact(new_artifact)
+            artifact = self.add_artifact(new_artifact)
 
         artifact_api.create_model(
             client=self.__api_client,
@@ -183,9 +298,14 @@ class ActiveRun(object):
         Arguments:
             artifact: The artifact should be created or referenced.
         """
-        files_with_file_hashes = [(file, get_file_hash(file)) for file in artifact.files]
-        file_hashes = [file_with_hash[1] for file_with_hash in files_with_file_hashes]
-        
+        if self.__offline_log is not None:
+            return self.__record_artifact(artifact)
+
+        codec = _compression.resolve_codec(
+            artifact.compression if artifact.compression is not None else self.__options.artifact_compression)
+        file_hashes = get_file_hashes(artifact.files, self.__options.hash_workers, self.__hash_cache)
+        files_with_file_hashes = list(zip(artifact.files, file_hashes))
+
         # check if an artifact with these files already exists (in any other experiment)
         artifact_dto: ArtifactDto = artifact_api.find_artifact_by_file_hashes(
             client=self.__api_client,
@@ -194,15 +314,19 @@ class ActiveRun(object):
             files=file_hashes)
 
         if artifact_dto is None:
-            # artifact does not exist, yet - create artifact and upload all files of the artifact
-            new_artifact = self.__create_artifact(artifact.name, artifact.type, artifact.metadata)
-            for file_with_hash in files_with_file_hashes:
-                file = file_with_hash[0]
-                file_hash = file_with_hash[1]
-                if isinstance(file, InMemoryArtifactFile):
-                    self.__add_artifact_file(new_artifact, file_hash.fileHash, file.file_content, file.file_name)
-                elif isinstance(file, LocalArtifactFile):
-                    self.__add_artifact_file(new_artifact, file_hash.fileHash, file.file_name)
+            # artifact does not exist, yet - create artifact (or reuse the version of an interrupted upload of its
+            # files) and upload all files of the artifact
+            new_artifact = self.__get_pending_artifact(artifact.name, file_hashes)
+            if new_artifact is None:
+                new_artifact = self.__create_artifact(artifact.name, artifact.type,
+                                                      _compression.add_codec(artifact.metadata, codec,
+                                                                             _get_file_hashes_by_name(file_hashes)))
+            else:
+                # files that were completely uploaded by the previous attempt are already part of the version
+                uploaded_files = {file.file_name for file in new_artifact.files or []}
+                files_with_file_hashes = [(file, file_hash) for file, file_hash in files_with_file_hashes
+                                          if file_hash.fileName not in uploaded_files]
+            self.__upload_files(new_artifact, files_with_file_hashes, codec)
 
             return new_artifact
 
@@ -220,6 +344,36 @@ class ActiveRun(object):
 
             return dto_to_artifact(artifact_dto)
 
+    def __record_artifact(self, artifact: NewArtifact, model: bool = False) -> Artifact:
+        """Stores the files of an artifact locally and records it in the offline log. The artifact gets a version
+        when the log is synced."""
+        file_hashes = get_file_hashes(artifact.files, self.__options.hash_workers, self.__hash_cache)
+        self.__offline_log.add_artifact(self.__run.key, artifact, file_hashes, model=model)
+
+        return Artifact(name=artifact.name, type=artifact.type, metadata=artifact.metadata)
+
+    def __get_pending_artifact(self, name: str, file_hashes: List[FileHashDto]) -> Optional[Artifact]:
+        """Returns the artifact version into which a previous attempt to add the same files started a chunked upload,
+        so that the upload can be resumed, or `None` if there is no such version. The files of the returned artifact
+        are the files that the previous attempt uploaded completely."""
+        version = find_pending_artifact_version(self.__get_upload_manifest_directory(), self.__project_key, name,
+                                                [(file_hash.fileName, file_hash.fileHash) for file_hash in file_hashes])
+        if version is None:
+            return None
+
+        try:
+            artifact_dto = artifact_api.get_artifact(client=self.__api_client,
+                                                     project_key=self.__project_key,
+                                                     artifact_name=name,
+                                                     artifact_version=version)
+        except NotFoundError:
+            return None
+
+        return dto_to_artifact(artifact_dto)
+
+    def __get_upload_manifest_directory(self) -> str:
+        return path.join(self.__options.cache_directory, 'uploads')
+
     def __create_artifact(self, name: str, artifact_type: str, metadata: Optional[Dict[str, str]]) -> Artifact:
         """Creates a new artifact. If an artifact with the same name already exists, a new artifact with the
         next available version number will be registered.
@@ -239,7 +393,50 @@ class ActiveRun(object):
 
         return dto_to_artifact(artifact_dto)
 
-    def __add_artifact_file(self, artifact: Artifact, file_hash: str, file: Union[str, BytesIO], filename: str = None):
+    def __upload_files(self,
+                       artifact: Artifact,
+                       files_with_file_hashes: List[Tuple[Union[InMemoryArtifactFile, LocalArtifactFile], FileHashDto]],
+                       codec: Optional[str] = None):
+        """Uploads all files of an artifact using up to `upload_workers` concurrent requests. All files will be
+        uploaded even if some uploads fail; the failures are raised afterwards as a single ArtifactUploadError.
+        If `codec` is set, each file is compressed into a temporary file, which is uploaded instead with the hash of
+        the compressed content."""
+        def upload(file_with_hash):
+            file, file_hash = file_with_hash
+            if codec is not None:
+                with _compression.compressed_copy(file, codec) as compressed:
+                    self.__add_artifact_file(artifact, compressed.file_hash, compressed.path, file_hash.fileName,
+                                             source_hash=file_hash.fileHash)
+            elif isinstance(file, InMemoryArtifactFile):
+                self.__add_artifact_file(artifact, file_hash.fileHash, file.file_content, file.file_name)
+            elif isinstance(file, LocalArtifactFile):
+                self.__add_artifact_file(artifact, file_hash.fileHash, file.file_name, file_hash.fileName)
+
+        errors: Dict[str, Exception] = {}
+        max_workers = min(self.__options.upload_workers, len(files_with_file_hashes))
+        if max_workers <= 1:
+            for file_with_hash in files_with_file_hashes:
+                try:
+                    upload(file_with_hash)
+                except Exception as e:
+                    errors[file_with_hash[1].fileName] = e
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='mlaide-upload') as executor:
+                futures = {file_with_hash[1].fileName: executor.submit(upload, file_with_hash)
+                           for file_with_hash in files_with_file_hashes}
+            for file_name, future in futures.items():
+                if future.exception() is not None:
+                    errors[file_name] = future.exception()
+
+        if errors:
+            raise ArtifactUploadError(artifact.name, artifact.version, errors)
+
+    def __add_artifact_file(self,
+                            artifact: Artifact,
+                            file_hash: str,
+                            file: Union[str, BytesIO],
+                            filename: str = None,
+                            source_hash: Optional[str] = None):
         """Add a file to an existing artifact. To add multiple file, specify a directory or invoke this function
         multiple times.
 
@@ -248,15 +445,37 @@ class ActiveRun(object):
             file: The file that should be added. This can be a io.BytesIO object or a string to a file or directory.
             filename: The filename. If the file is of type BytesIO the filename must be specified. If the file is a
                 string, the original filename will be the default.
+            source_hash: The hash of the file the uploaded file was created from, e.g. before it was compressed.
         """
-        artifact_api.upload_file(
-            client=self.__api_client,
-            project_key=self.__project_key,
-            artifact_name=artifact.name,
-            artifact_version=artifact.version,
-            filename=filename if filename is not None else extract_filename(file),
-            file_hash=file_hash,
-            file=get_file_content(file))
+        threshold = self.__options.chunked_upload_threshold
+        if threshold is not None and isinstance(file, str) and path.isfile(file) and path.getsize(file) >= threshold:
+            upload_file_in_parts(
+                client=self.__api_client,
+                project_key=self.__project_key,
+                artifact_name=artifact.name,
+                artifact_version=artifact.version,
+                filename=filename if filename is not None else extract_filename(file),
+                file_hash=file_hash,
+                path=file,
+                part_size=self.__options.chunked_upload_part_size,
+                manifest_directory=self.__get_upload_manifest_directory(),
+                source_hash=source_hash)
+            return
+
+        content = get_file_content(file)
+        try:
+            artifact_api.upload_file(
+                client=self.__api_client,
+                project_key=self.__project_key,
+                artifact_name=artifact.name,
+                artifact_version=artifact.version,
+                filename=filename if filename is not None else extract_filename(file),
+                file_hash=file_hash,
+                file=content)
+        finally:
+            # Only close files that were opened by get_file_content
+            if content is not file:
+                content.close()
 
     def set_completed_status(self) -> Run:
         """Sets the status of the current run as completed."""
@@ -267,14 +486,21 @@ class ActiveRun(object):
         return self._set_status(RunStatus.FAILED)
 
     def _set_status(self, status: RunStatus) -> Run:
-        self.__run.end_time = datetime.now()
-        self.__run.status = status
-        run_api.partial_update_run(
-            client=self.__api_client,
-            project_key=self.__project_key,
-            run_key=self.__run.key,
-            run=RunDto(
-                status=StatusDto(status.name)
-            )
-        )
+        try:
+            if self.__background_writer is not None:
+                self.__background_writer.close()
+        finally:
+            self.__run.end_time = datetime.now()
+            self.__run.status = status
+            if self.__offline_log is not None:
+                self.__offline_log.set_status(self.__run.key, status, self.__run.end_time)
+            else:
+                run_api.partial_update_run(
+                    client=self.__api_client,
+                    project_key=self.__project_key,
+                    run_key=self.__run.key,
+                    run=RunDto(
+                        status=StatusDto(status.name)
+                    )
+                )
         return self.__run
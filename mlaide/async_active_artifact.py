@@ -0,0 +1,97 @@
+import asyncio
+import shutil
+import tempfile
+from dataclasses import replace
+from io import BytesIO
+from typing import Any, BinaryIO, Optional, Tuple
+from zipfile import ZipFile
+
+from . import _compression, _model_deser
+from ._api_client import Client
+from ._api_client.async_api import artifact_api
+from .active_artifact import _find_file_id
+from .model import Artifact
+
+
+class AsyncActiveArtifact(object):
+    """This class provides asynchronous access to artifacts that are stored in ML Aide"""
+
+    __api_client: Client
+    __project_key: str
+    __artifact: Artifact
+    __cached_zip: Optional[Tuple[BinaryIO, Optional[str]]] = None
+
+    def __init__(self, api_client: Client, project_key: str, artifact: Artifact):
+        self.__api_client = api_client
+        self.__project_key = project_key
+        self.__artifact = artifact
+
+    @property
+    def artifact(self) -> Artifact:
+        # Return a deep copy to avoid changing anything by the client
+        return replace(self.__artifact)
+
+    async def load(self, filename: str) -> BytesIO:
+        """Load a specific file of this artifact into memory
+
+        Arguments:
+            filename: The name of the file that should be loaded
+        """
+        file_id = _find_file_id(self.__artifact, filename)
+        if file_id is not None:
+            file = await artifact_api.download_file(client=self.__api_client,
+                                                    project_key=self.__project_key,
+                                                    artifact_name=self.__artifact.name,
+                                                    artifact_version=self.__artifact.version,
+                                                    file_id=file_id)
+            if file is not None:
+                return await self.__decompress(file)
+
+        # Fall back to the whole zip if the file is unknown or the server does not provide single files
+        zip_bytes, zip_filename = await self.__download_zip()
+        file = await asyncio.get_running_loop().run_in_executor(None, _read_file_from_zip, zip_bytes, filename)
+        return await self.__decompress(file)
+
+    async def download(self, target_directory: str):
+        """Downloads all files of this artifact and stores them into the specified directory.
+
+        Arguments:
+            target_directory: The path to the directory where all files should be stored.
+        """
+        artifact_bytes, artifact_filename = await self.__download_zip()
+        await asyncio.get_running_loop().run_in_executor(None, _compression.extract_zip, artifact_bytes,
+                                                         target_directory,
+                                                         _compression.get_codec(self.__artifact.metadata))
+
+    async def load_model(self) -> Any:
+        """Loads and restores the model of this artifact with the model flavor that stored it (see `ModelFlavor`).
+
+        Returns:
+            The deserialized model.
+        """
+        directory = tempfile.mkdtemp(prefix='mlaide-model-')
+        try:
+            await self.download(directory)
+            return await asyncio.get_running_loop().run_in_executor(None, _model_deser.deserialize, directory)
+        finally:
+            # Memory-mapped files stay readable after they were removed
+            shutil.rmtree(directory, ignore_errors=True)
+
+    async def __decompress(self, file: BytesIO) -> BytesIO:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, _compression.decompress_bytes, file, _compression.get_codec(self.__artifact.metadata))
+
+    async def __download_zip(self) -> Tuple[BinaryIO, str]:
+        if self.__cached_zip is None:
+            self.__cached_zip = await artifact_api.download_artifact(client=self.__api_client,
+                                                                     project_key=self.__project_key,
+                                                                     artifact_name=self.__artifact.name,
+                                                                     artifact_version=self.__artifact.version)
+
+        return self.__cached_zip
+
+
+def _read_file_from_zip(zip_bytes: BinaryIO, filename: str) -> BytesIO:
+    with ZipFile(zip_bytes) as z:
+        with z.open(filename, 'r') as zip_file:
+            return BytesIO(zip_file.read())
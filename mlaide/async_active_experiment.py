@@ -0,0 +1,76 @@
+import asyncio
+import functools
+from dataclasses import replace
+from typing import List, Optional
+
+from ._api_client import Client
+from ._api_client.async_api import run_api
+from ._hash_cache import FileHashCache
+from .async_active_run import AsyncActiveRun
+from .connection_options import ConnectionOptions, _resolve_options
+from .git_resolver import get_git_metadata
+from .mapper import dto_to_run, run_to_dto
+from .model import Experiment, ArtifactRef, Run, RunStatus
+
+
+class AsyncActiveExperiment(object):
+    """This class provides asynchronous access to a experiment of ML Aide"""
+
+    __api_client: Client
+    __project_key: str
+    __experiment: Experiment
+    __options: Optional[ConnectionOptions]
+    __hash_cache: Optional[FileHashCache] = None
+
+    def __init__(self,
+                 api_client: Client,
+                 project_key: str,
+                 experiment: Experiment,
+                 options: Optional[ConnectionOptions] = None,
+                 hash_cache: Optional[FileHashCache] = None):
+        self.__api_client = api_client
+        self.__project_key = project_key
+        self.__experiment = experiment
+        self.__options = options
+        self.__hash_cache = hash_cache
+
+    @property
+    def experiment(self) -> Experiment:
+        # Return a deep copy to avoid changing anything by the client
+        return replace(self.__experiment)
+
+    async def start_new_run(self,
+                            run_name: str = None,
+                            used_artifacts: List[ArtifactRef] = None) -> AsyncActiveRun:
+        """Creates and starts a new run, that will be assigned to this experiment. The run object can be used
+        to log all necessary information.
+
+        Arguments:
+            run_name: The name of the run. The name helps to identify the run for humans. If `None` a random name will
+                be used.
+            used_artifacts: An optional list of `ArtifactRef` that references artifacts, that are used as input for
+                this run. This information will help to create and visualize the experiment lineage.
+
+        Returns:
+            This object encapsulates the newly created run and provides functions to log all information \
+            that belongs to the run.
+        """
+        options = _resolve_options(self.__options)
+        git = await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(get_git_metadata,
+                                    dirty_check=options.git_dirty_check,
+                                    dirty_check_timeout=options.git_dirty_check_timeout,
+                                    untracked_files=options.git_untracked_files))
+        run = Run(name=run_name, status=RunStatus.RUNNING, git=git)
+
+        created_run = await run_api.create_run(
+            client=self.__api_client,
+            project_key=self.__project_key,
+            run=run_to_dto(run, self.__experiment.key, used_artifacts)
+        )
+
+        return AsyncActiveRun(api_client=self.__api_client,
+                              project_key=self.__project_key,
+                              run=dto_to_run(created_run),
+                              options=self.__options,
+                              hash_cache=self.__hash_cache)
@@ -0,0 +1,291 @@
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from . import _compression, _model_deser
+from ._api_client import Client
+from ._api_client.async_api import run_api, artifact_api
+from ._api_client.dto import ArtifactDto, FileHashDto, RunDto, StatusDto
+from ._hash_cache import FileHashCache
+from .active_run import get_file_hashes, get_file_content, _get_file_hashes_by_name
+from .connection_options import ConnectionOptions, _resolve_options
+from .error import ArtifactUploadError
+from .mapper import dto_to_artifact
+from .model import Artifact, Run, RunStatus, NewArtifact, InMemoryArtifactFile, LocalArtifactFile
+
+
+class AsyncActiveRun(object):
+    """This class provides asynchronous access to runs that are stored in ML Aide"""
+
+    __api_client: Client
+    __run: Run
+    __project_key: str
+    __options: ConnectionOptions
+    __hash_cache: Optional[FileHashCache] = None
+
+    def __init__(self,
+                 api_client: Client,
+                 project_key: str,
+                 run: Run,
+                 options: Optional[ConnectionOptions] = None,
+                 hash_cache: Optional[FileHashCache] = None):
+        self.__api_client = api_client
+        self.__project_key = project_key
+        self.__run = run
+        self.__options = _resolve_options(options)
+        # The hash cache is shared by all runs of a client, which closes it
+        self.__hash_cache = hash_cache if self.__options.hash_cache_enabled else None
+
+    @property
+    def run(self) -> Run:
+        # Return a deep copy to avoid changing anything by the client
+        return Run(
+            start_time=self.__run.start_time,
+            end_time=self.__run.end_time,
+            status=self.__run.status,
+            metrics=self.__run.metrics,
+            parameters=self.__run.parameters,
+            key=self.__run.key,
+            name=self.__run.name
+        )
+
+    async def log_metric(self, key: str, value) -> Run:
+        """Logs a metric
+
+        Arguments:
+            key: The key of the metric.
+            value: The value of the metric. The value can be any type that is JSON serializable.
+        """
+        return await self.log_metrics({key: value})
+
+    async def log_metrics(self, metrics: Dict[str, Any]) -> Run:
+        """Logs multiple metrics with a single request
+
+        Arguments:
+            metrics: The metrics as a dict of metric keys and values. The values can be any type that is JSON
+                serializable.
+        """
+        self.__run.metrics.update(metrics)
+        await run_api.update_run_metrics(
+            client=self.__api_client,
+            project_key=self.__project_key,
+            run_key=self.__run.key,
+            metrics=dict(metrics))
+        return self.__run
+
+    async def log_metric_epoch(self, key: str, epoch: str, value) -> Run:
+        """Logs a metric for an epoch
+
+        Arguments:
+            key: The key of the metric.
+            epoch: The corresponding epoch.
+            value: The value of the metric. The value can be any type that is JSON serializable.
+        """
+        return await self.log_metrics_epoch(epoch, {key: value})
+
+    async def log_metrics_epoch(self, epoch: str, metrics: Dict[str, Any]) -> Run:
+        """Logs multiple metrics for an epoch with a single request
+
+        Arguments:
+            epoch: The corresponding epoch.
+            metrics: The metrics as a dict of metric keys and values. The values can be any type that is JSON
+                serializable.
+        """
+        for key, value in metrics.items():
+            epochs = self.__run.metrics.get(key)
+            if not isinstance(epochs, dict):
+                epochs = self.__run.metrics[key] = {}
+            epochs[epoch] = value
+
+        await run_api.update_run_metrics(
+            client=self.__api_client,
+            project_key=self.__project_key,
+            run_key=self.__run.key,
+            metrics={key: {epoch: value} for key, value in metrics.items()})
+        return self.__run
+
+    async def log_parameter(self, key: str, value) -> Run:
+        """Logs a parameter
+
+        Arguments:
+            key: The key of the parameter.
+            value: The value of the parameter. The value must be a scalar value (e.g. string, int, float, ...).
+        """
+        return await self.log_parameters({key: value})
+
+    async def log_parameters(self, parameters: Dict[str, Any]) -> Run:
+        """Logs multiple parameters with a single request
+
+        Arguments:
+            parameters: The parameters as a dict of parameter keys and values. The values must be scalar values
+                (e.g. string, int, float, ...).
+        """
+        self.__run.parameters.update(parameters)
+        await run_api.update_run_parameters(
+            client=self.__api_client,
+            project_key=self.__project_key,
+            run_key=self.__run.key,
+            parameters=dict(parameters))
+        return self.__run
+
+    async def log_model(self, model, model_name: str, metadata: Optional[Dict[str, str]] = None):
+        """Creates a new artifact with type 'model'. The artifact will be registered as model.
+
+        Arguments:
+            model: The model. The model must be serializable.
+            model_name: The name of the model. The name will be used as artifact filename.
+            metadata: Some optional metadata that will be attached to the artifact.
+        """
+        # Serializing the model and removing the staged files block, therefore both run in the executor
+        loop = asyncio.get_running_loop()
+        serialization = _model_deser.serialize(model, buffer_min_size=self.__options.model_buffer_min_size)
+        files = await loop.run_in_executor(None, serialization.__enter__)
+        try:
+            new_artifact = NewArtifact(
+                name=model_name,
+                type='model',
+                metadata=metadata,
+                files=files
+            )
+            artifact = await self.add_artifact(new_artifact)
+        finally:
+            await loop.run_in_executor(None, serialization.__exit__, None, None, None)
+
+        await artifact_api.create_model(
+            client=self.__api_client,
+            project_key=self.__project_key,
+            artifact_name=artifact.name,
+            artifact_version=artifact.version)
+
+    async def add_artifact(self, artifact: NewArtifact) -> Artifact:
+        """Adds an artifact to the current run. If an artifact with the same name and the same files
+        is already existing in another experiment the existing artifact will be referenced. Thus, uploading
+        the files of this artifact won't be necessary. If the artifact does not exist, it will be created
+        and all files of the artifact will be uploaded.
+
+        Files are read in the executor while they are uploaded. Unlike `ActiveRun.add_artifact`, each file is uploaded
+        in a single request; `ConnectionOptions.chunked_upload_threshold` is not supported.
+
+        Arguments:
+            artifact: The artifact should be created or referenced.
+        """
+        codec = _compression.resolve_codec(
+            artifact.compression if artifact.compression is not None else self.__options.artifact_compression)
+        # The same hashing as in ActiveRun (hash workers and hash cache) runs in the executor, off the event loop
+        file_hashes = await asyncio.get_running_loop().run_in_executor(
+            None, get_file_hashes, artifact.files, self.__options.hash_workers, self.__hash_cache)
+
+        # check if an artifact with these files already exists (in any other experiment)
+        artifact_dto: ArtifactDto = await artifact_api.find_artifact_by_file_hashes(
+            client=self.__api_client,
+            project_key=self.__project_key,
+            artifact_name=artifact.name,
+            files=file_hashes)
+
+        if artifact_dto is None:
+            # artifact does not exist, yet - create artifact and upload all files of the artifact
+            new_artifact = await self.__create_artifact(
+                artifact.name, artifact.type,
+                _compression.add_codec(artifact.metadata, codec, _get_file_hashes_by_name(file_hashes)))
+            await self.__upload_files(new_artifact, list(zip(artifact.files, file_hashes)), codec)
+
+            return new_artifact
+
+        else:
+            # an artifact with the same content already exists - just link artifact to this run
+            await run_api.attach_artifact_to_run(
+                client=self.__api_client,
+                artifact_name=artifact_dto.name,
+                artifact_version=artifact_dto.version,
+                project_key=self.__project_key,
+                run_key=self.__run.key
+            )
+
+            return dto_to_artifact(artifact_dto)
+
+    async def __upload_files(self,
+                             artifact: Artifact,
+                             files_with_file_hashes: List[Tuple[Union[InMemoryArtifactFile, LocalArtifactFile],
+                                                                FileHashDto]],
+                             codec: Optional[str] = None):
+        """Uploads all files of an artifact with up to `upload_workers` concurrent requests. All files will be
+        uploaded even if some uploads fail; the failures are raised afterwards as a single ArtifactUploadError.
+        If `codec` is set, each file is compressed into a temporary file, which is uploaded instead with the hash of
+        the compressed content."""
+        semaphore = asyncio.Semaphore(max(1, self.__options.upload_workers))
+        loop = asyncio.get_running_loop()
+
+        async def upload(file: Union[InMemoryArtifactFile, LocalArtifactFile], file_hash: FileHashDto):
+            async with semaphore:
+                if codec is None:
+                    await upload_content(file, file_hash)
+                    return
+
+                # Compressing and removing the temporary file block, therefore both run in the executor
+                compression = _compression.compressed_copy(file, codec)
+                compressed = await loop.run_in_executor(None, compression.__enter__)
+                try:
+                    await upload_content(LocalArtifactFile(compressed.path),
+                                         FileHashDto(fileName=file_hash.fileName, fileHash=compressed.file_hash))
+                finally:
+                    await loop.run_in_executor(None, compression.__exit__, None, None, None)
+
+        async def upload_content(file: Union[InMemoryArtifactFile, LocalArtifactFile], file_hash: FileHashDto):
+            if isinstance(file, InMemoryArtifactFile):
+                content = file.file_content
+            else:
+                content = await loop.run_in_executor(None, get_file_content, file.file_name)
+
+            try:
+                await artifact_api.upload_file(
+                    client=self.__api_client,
+                    project_key=self.__project_key,
+                    artifact_name=artifact.name,
+                    artifact_version=artifact.version,
+                    filename=file_hash.fileName,
+                    file_hash=file_hash.fileHash,
+                    file=content)
+            finally:
+                if isinstance(file, LocalArtifactFile):
+                    content.close()
+
+        results = await asyncio.gather(*(upload(file, file_hash) for file, file_hash in files_with_file_hashes),
+                                       return_exceptions=True)
+
+        errors: Dict[str, Exception] = {file_hash.fileName: result
+                                        for (file, file_hash), result in zip(files_with_file_hashes, results)
+                                        if isinstance(result, Exception)}
+        if errors:
+            raise ArtifactUploadError(artifact.name, artifact.version, errors)
+
+    async def __create_artifact(self, name: str, artifact_type: str, metadata: Optional[Dict[str, str]]) -> Artifact:
+        artifact_dto = ArtifactDto(name=name, type=artifact_type, metadata=metadata)
+
+        artifact_dto = await artifact_api.create_artifact(
+            client=self.__api_client,
+            project_key=self.__project_key,
+            artifact=artifact_dto,
+            run_key=self.__run.key)
+
+        return dto_to_artifact(artifact_dto)
+
+    async def set_completed_status(self) -> Run:
+        """Sets the status of the current run as completed."""
+        return await self._set_status(RunStatus.COMPLETED)
+
+    async def set_failed_status(self) -> Run:
+        """Sets the status of the current run as failed."""
+        return await self._set_status(RunStatus.FAILED)
+
+    async def _set_status(self, status: RunStatus) -> Run:
+        self.__run.end_time = datetime.now()
+        self.__run.status = status
+        await run_api.partial_update_run(
+            client=self.__api_client,
+            project_key=self.__project_key,
+            run_key=self.__run.key,
+            run=RunDto(
+                status=StatusDto(status.name)
+            )
+        )
+        return self.__run
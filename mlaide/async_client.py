@@ -0,0 +1,136 @@
+from typing import Any, Callable, Dict, Optional
+
+from . import mapper
+from ._api_client import Client
+from ._api_client.async_api import artifact_api, experiment_api
+from ._api_client.dto import ExperimentDto
+from ._hash_cache import FileHashCache
+from .async_active_artifact import AsyncActiveArtifact
+from .async_active_experiment import AsyncActiveExperiment
+from .client import _create_api_client
+from .connection_options import ConnectionOptions, _resolve_options
+from .model import EndpointStats, ModelStage, RequestEvent
+
+
+class AsyncMLAideClient:
+    """The asyncio counterpart of `MLAideClient`. All operations that communicate with the ML Aide server are
+    coroutines and share one pooled `httpx.AsyncClient`, so that many concurrent operations can be multiplexed on a
+    single event loop.
+    """
+
+    __options: ConnectionOptions
+    __api_client: Client
+    __project_key: str
+    __hash_cache: Optional[FileHashCache] = None
+
+    def __init__(self, project_key: str, options: ConnectionOptions = None):
+        """Creates a new instance of this class.
+
+        Arguments:
+            project_key: The key of the project, that should be accessed. All operations will be made on this project.
+            options: Optional options that will be used to establish a connection.
+        """
+        if project_key is None:
+            raise ValueError("project key must be not None")
+        self.__project_key = project_key
+
+        self.__options = _resolve_options(options)
+        self.__api_client = _create_api_client(self.__options)
+        if self.__options.hash_cache_enabled:
+            self.__hash_cache = FileHashCache(self.__options.cache_directory, self.__options.hash_cache_max_entries)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes all open connections to the ML Aide server. The client should not be used after it was closed."""
+        await self.__api_client.aclose()
+        if self.__hash_cache is not None:
+            self.__hash_cache.close()
+
+    async def create_experiment(self, experiment_name: str) -> AsyncActiveExperiment:
+        experiment_dto = await experiment_api.create_experiment(client=self.__api_client,
+                                                                project_key=self.__project_key,
+                                                                experiment=ExperimentDto(name=experiment_name))
+
+        return AsyncActiveExperiment(api_client=self.__api_client,
+                                     project_key=self.__project_key,
+                                     experiment=mapper.dto_to_experiment(experiment_dto),
+                                     options=self.__options,
+                                     hash_cache=self.__hash_cache)
+
+    async def get_artifact(self,
+                           name: str,
+                           version: Optional[int] = None,
+                           stage: Optional[ModelStage] = None) -> AsyncActiveArtifact:
+        """Gets an existing artifact. The artifact is specified by its name and version. If no version
+        is specified, the latest available version of the artifact will be used.
+
+        Arguments:
+            name: The name of the artifact.
+            version: The (optional) version of the artifact. If no version is specified, the latest available version
+                will be loaded.
+            stage: This argument can only be used when version is None. In this case the latest model can be filtered by
+                its stage.
+
+        Returns:
+             This object encapsulates an artifact and provides functions to interact with the artifact.
+        """
+        artifact_dto = await artifact_api.get_artifact(client=self.__api_client,
+                                                       project_key=self.__project_key,
+                                                       artifact_name=name,
+                                                       artifact_version=version,
+                                                       model_stage=stage.value if stage is not None else None)
+
+        return AsyncActiveArtifact(self.__api_client, self.__project_key, mapper.dto_to_artifact(artifact_dto))
+
+    async def load_model(self,
+                         name: str,
+                         version: Optional[int] = None,
+                         stage: Optional[ModelStage] = None) -> Any:
+        """Loads and restores a model. The model is specified by its name and version. If no version
+        is specified, the latest available version of the model will be used.
+
+        Arguments:
+            name: The name of the model.
+            version: The (optional) version of the model. If no version is specified, the latest available version will
+                be loaded.
+            stage: This argument can only be used when version is None. In this case the latest model can be filtered by
+                its stage. In reverse this means that all model versions will be ignored when they have not the
+                specified stage.
+
+        Returns:
+             The model. E.g. in the case of a scikit-learn model the return value will be a deserialized model that
+             can be used for predictions using `.predict(...)`.
+         """
+
+        if version is not None and stage is not None:
+            raise ValueError("Only one argument of version and stage can be not None")
+
+        artifact = await self.get_artifact(name, version, stage)
+        return await artifact.load_model()
+
+    def stats(self, reset: bool = False) -> Dict[str, EndpointStats]:
+        """Returns the stats of all requests that this client sent to the ML Aide server, per endpoint. See
+        `MLAideClient.stats`."""
+        return self.__api_client.get_request_stats(reset=reset)
+
+    def add_request_listener(self, listener: Callable[[RequestEvent], None]):
+        """Adds a callback that is invoked with every request to the ML Aide server after its response was read. The
+        callback is invoked on the event loop and must not block; exceptions raised by the callback are ignored."""
+        self.__api_client.add_request_listener(listener)
+
+    def remove_request_listener(self, listener: Callable[[RequestEvent], None]):
+        """Removes a callback that was added with `add_request_listener`."""
+        self.__api_client.remove_request_listener(listener)
+
+    @property
+    def options(self) -> ConnectionOptions:
+        return self.__options
+
+    @property
+    def api_client(self) -> Client:
+        return self.__api_client
@@ -0,0 +1,253 @@
+import atexit
+import json
+import queue
+import tempfile
+import threading
+import weakref
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+_METRICS = 'metrics'
+_PARAMETERS = 'parameters'
+
+# All open writers are closed at exit. Writers are only referenced strongly while they have pending values, so that
+# runs that are no longer used can be garbage collected.
+_writers: 'weakref.WeakSet[BackgroundWriter]' = weakref.WeakSet()
+_busy_writers: Set['BackgroundWriter'] = set()
+
+
+class BackpressureStrategy(Enum):
+    """Specifies what happens when new values are logged while the queue of the background writer is full."""
+
+    BLOCK = 'BLOCK'
+    """The logging call blocks until the background writer has free capacity again."""
+
+    DROP_OLDEST = 'DROP_OLDEST'
+    """The oldest value in the queue is discarded to make room for the new one."""
+
+    SPILL_TO_DISK = 'SPILL_TO_DISK'
+    """Values are appended to a temporary file on disk until the background writer caught up."""
+
+
+@dataclass
+class BackgroundWriterOptions:
+    """Options of the background writer that sends metrics and parameters of a run asynchronously.
+
+    Attributes:
+        max_queue_size: The number of pending log calls that will be buffered in memory.
+        backpressure: Specifies what happens when the in-memory queue is full.
+        spill_directory: The directory for the spill file when using `BackpressureStrategy.SPILL_TO_DISK`. If `None`
+            the default temporary directory will be used.
+    """
+
+    max_queue_size: int = 1000
+    backpressure: BackpressureStrategy = BackpressureStrategy.BLOCK
+    spill_directory: Optional[str] = None
+
+
+def merge_patch(target: Dict[str, Any], patch: Dict[str, Any]) -> Dict[str, Any]:
+    """Merges `patch` into `target` with the semantic of a JSON merge patch (RFC 7386), except that `None` values are
+    kept. Nested dicts are merged recursively. The target will be modified in place and returned."""
+    for key, value in patch.items():
+        existing = target.get(key)
+        if isinstance(existing, dict) and isinstance(value, dict):
+            merge_patch(existing, value)
+        elif isinstance(value, dict):
+            target[key] = merge_patch({}, value)
+        else:
+            target[key] = value
+
+    return target
+
+
+class BackgroundWriter(object):
+    """Sends metrics and parameters of a run on a worker thread. All updates that were queued while a request was in
+    flight are coalesced into a single merge-patch request per resource. Writers that were not closed are closed at
+    exit."""
+
+    __options: BackgroundWriterOptions
+    __send_metrics: Callable[[Dict[str, Any]], None]
+    __send_parameters: Callable[[Dict[str, Any]], None]
+
+    def __init__(self,
+                 send_metrics: Callable[[Dict[str, Any]], None],
+                 send_parameters: Callable[[Dict[str, Any]], None],
+                 options: Optional[BackgroundWriterOptions] = None):
+        self.__options = options if options is not None else BackgroundWriterOptions()
+        self.__send_metrics = send_metrics
+        self.__send_parameters = send_parameters
+
+        self.__queue = queue.Queue(maxsize=self.__options.max_queue_size)
+        self.__lock = threading.Lock()
+        self.__pending = 0
+        self.__pending_changed = threading.Condition(self.__lock)
+        self.__error: Optional[BaseException] = None
+        self.__closed = False
+        self.__spill_file = None
+        self.__spilling = False
+
+        # The worker only references the writer while it sends values, the finalizer stops it when the writer was
+        # garbage collected
+        self.__worker = threading.Thread(target=BackgroundWriter.__run, args=(weakref.ref(self), self.__queue),
+                                         name='mlaide-background-writer', daemon=True)
+        self.__worker.start()
+        self.__finalizer = weakref.finalize(self, self.__queue.put, None)
+        # At exit the writer is closed instead, see _close_writers
+        self.__finalizer.atexit = False
+        _writers.add(self)
+
+    def log_metrics(self, metrics: Dict[str, Any]):
+        """Queues metrics that will be sent to the server."""
+        self.__submit((_METRICS, metrics))
+
+    def log_parameters(self, parameters: Dict[str, Any]):
+        """Queues parameters that will be sent to the server."""
+        self.__submit((_PARAMETERS, parameters))
+
+    def flush(self):
+        """Blocks until all queued values were sent to the server. If the worker failed to send values, the first error
+        will be raised."""
+        with self.__pending_changed:
+            while self.__pending > 0:
+                self.__pending_changed.wait()
+
+            error, self.__error = self.__error, None
+
+        if error is not None:
+            raise error
+
+    def close(self):
+        """Flushes all queued values and stops the worker thread. Values cannot be logged anymore once `close` was
+        called."""
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+
+        _writers.discard(self)
+        try:
+            self.flush()
+        finally:
+            with self.__lock:
+                # No values can be queued anymore, so the worker receives the sentinel after all values
+                self.__finalizer.detach()
+                self.__queue.put(None)
+            self.__worker.join()
+            if self.__spill_file is not None:
+                self.__spill_file.close()
+
+    def __submit(self, item: Tuple[str, Dict[str, Any]]):
+        with self.__lock:
+            if self.__closed:
+                raise RuntimeError('background writer is already closed')
+
+            self.__pending += 1
+            _busy_writers.add(self)
+
+            if self.__spilling:
+                self.__spill(item)
+                return
+
+            try:
+                self.__queue.put_nowait(item)
+                return
+            except queue.Full:
+                if self.__options.backpressure == BackpressureStrategy.SPILL_TO_DISK:
+                    self.__spilling = True
+                    self.__spill(item)
+                    return
+                elif self.__options.backpressure == BackpressureStrategy.DROP_OLDEST:
+                    self.__drop_oldest_and_put(item)
+                    return
+
+        # BackpressureStrategy.BLOCK - wait outside of the lock to let the worker make progress
+        self.__queue.put(item)
+
+    def __drop_oldest_and_put(self, item: Tuple[str, Dict[str, Any]]):
+        while True:
+            try:
+                self.__queue.get_nowait()
+                self.__pending -= 1
+                self.__pending_changed.notify_all()
+            except queue.Empty:
+                pass
+
+            try:
+                self.__queue.put_nowait(item)
+                return
+            except queue.Full:
+                continue
+
+    def __spill(self, item: Tuple[str, Dict[str, Any]]):
+        if self.__spill_file is None:
+            self.__spill_file = tempfile.TemporaryFile(mode='w+', dir=self.__options.spill_directory)
+
+        self.__spill_file.write(json.dumps(item))
+        self.__spill_file.write('\n')
+
+    def __read_spilled_items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self.__lock:
+            if not self.__spilling:
+                return []
+
+            self.__spill_file.seek(0)
+            items = [tuple(json.loads(line)) for line in self.__spill_file]
+            self.__spill_file.seek(0)
+            self.__spill_file.truncate()
+            self.__spilling = False
+
+            return items
+
+    @staticmethod
+    def __run(writer_ref: 'weakref.ref[BackgroundWriter]', work_queue: queue.Queue):
+        while True:
+            item = work_queue.get()
+            writer = writer_ref() if item is not None else None
+            if writer is None:
+                return
+
+            items = [item]
+            while True:
+                try:
+                    next_item = work_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if next_item is None:
+                    work_queue.put(None)
+                    break
+                items.append(next_item)
+
+            if work_queue.empty():
+                items.extend(writer.__read_spilled_items())
+
+            writer.__send(items)
+            del writer
+
+    def __send(self, items: List[Tuple[str, Dict[str, Any]]]):
+        metrics: Dict[str, Any] = {}
+        parameters: Dict[str, Any] = {}
+        for resource, values in items:
+            merge_patch(metrics if resource == _METRICS else parameters, values)
+
+        try:
+            if metrics:
+                self.__send_metrics(metrics)
+            if parameters:
+                self.__send_parameters(parameters)
+        except Exception as e:
+            with self.__lock:
+                if self.__error is None:
+                    self.__error = e
+        finally:
+            with self.__pending_changed:
+                self.__pending -= len(items)
+                if self.__pending == 0:
+                    _busy_writers.discard(self)
+                self.__pending_changed.notify_all()
+
+
+@atexit.register
+def _close_writers():
+    for writer in list(_writers):
+        writer.close()
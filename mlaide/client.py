@@ -1,47 +1,28 @@
 from __future__ import annotations
 
 import os
-from typing import Optional, Dict, Any
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
 
 from mlaide.active_experiment import ActiveExperiment
 
 from ._api_client import Client, AuthenticatedClient
+from ._artifact_cache import ArtifactCache
+from ._hash_cache import FileHashCache
+from ._model_cache import ModelCache
+from ._offline import OfflineLog, sync as sync_offline_logs
 from .active_artifact import ActiveArtifact
-from .model import ModelStage
+from .connection_options import ConnectionOptions, _resolve_options
+from .model import ArtifactCacheStats, EndpointStats, ModelStage, RequestEvent
+from .model_watcher import ModelWatcher
 
 
-@dataclass
-class ConnectionOptions:
-    """Specify options for a MLAideClient"""
-
-    server_url: Optional[str]
-    api_key: Optional[str]
-
-    def __init__(self, server_url: str = None, api_key: str = None):
-        self.server_url = server_url
-        self.api_key = api_key
-
-    def to_dict(self) -> Dict[str, Any]:
-        d = {
-            "server_url": self.server_url,
-            "api_key": self.api_key
-        }
-
-        # Remove values from dict that are None
-        return {k: v for k, v in d.items() if v is not None}
-
-    @staticmethod
-    def from_dict(d: Dict[str, Any]) -> ConnectionOptions:
-        if d is None:
-            d = dict()
-
-        options = ConnectionOptions(
-            server_url=d.get("server_url", None),
-            api_key=d.get("api_key", None)
-        )
-
-        return options
+def _create_api_client(options: ConnectionOptions) -> AuthenticatedClient:
+    return AuthenticatedClient(base_url=options.server_url,
+                               api_key=options.api_key,
+                               timeout=options.timeout,
+                               max_connections=options.max_connections,
+                               max_keepalive_connections=options.max_keepalive_connections,
+                               max_payload_size=options.max_payload_size)
 
 
 class MLAideClient:
@@ -52,6 +33,10 @@ class MLAideClient:
     __options: ConnectionOptions
     __api_client: Client
     __project_key: str
+    __artifact_cache: Optional[ArtifactCache] = None
+    __hash_cache: Optional[FileHashCache] = None
+    __model_cache: Optional[ModelCache] = None
+    __offline_log: Optional[OfflineLog] = None
 
     def __init__(self, project_key: str, options: ConnectionOptions = None):
         """Creates a new instance of this class.
@@ -64,16 +49,41 @@ class MLAideClient:
             raise ValueError("project key must be not None")
         self.__project_key = project_key
 
-        if options is None:
-            self.__options = MLAideClient.__get_default_options()
-        else:
-            self.__options = MLAideClient.__merge_options(MLAideClient.__get_default_options(), options)
-
-        self.__api_client = AuthenticatedClient(base_url=self.__options.server_url,
-                                                api_key=self.__options.api_key)
+        self.__options = _resolve_options(options)
+        self.__api_client = _create_api_client(self.__options)
+        if self.__options.artifact_cache_enabled:
+            self.__artifact_cache = ArtifactCache(os.path.join(self.__options.cache_directory, 'artifacts'),
+                                                  self.__options.artifact_cache_max_size)
+        if self.__options.hash_cache_enabled:
+            self.__hash_cache = FileHashCache(self.__options.cache_directory, self.__options.hash_cache_max_entries)
+        if self.__options.model_cache_max_entries > 0:
+            self.__model_cache = ModelCache(max_entries=self.__options.model_cache_max_entries,
+                                            max_bytes=self.__options.model_cache_max_bytes,
+                                            ttl=self.__options.model_cache_ttl)
+        if self.__options.offline:
+            self.__offline_log = OfflineLog(self.__get_offline_directory(), project_key)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Closes all open connections to the ML Aide server. The client should not be used after it was closed."""
+        self.__api_client.close()
+        if self.__hash_cache is not None:
+            self.__hash_cache.close()
+        if self.__offline_log is not None:
+            self.__offline_log.close()
 
     def create_experiment(self, experiment_name: str):
-        return ActiveExperiment(api_client=self.__api_client, project_key=self.__project_key, experiment_name=experiment_name)
+        return ActiveExperiment(api_client=self.__api_client,
+                                project_key=self.__project_key,
+                                experiment_name=experiment_name,
+                                options=self.__options,
+                                offline_log=self.__offline_log,
+                                hash_cache=self.__hash_cache)
 
     def get_artifact(self, name: str, version: Optional[int] = None) -> ActiveArtifact:
         """Gets an existing artifact. The artifact is specified by its name and version. If no version
@@ -88,7 +98,8 @@ class MLAideClient:
              This object encapsulates an artifact and provides functions to interact with the artifact.
         """
 
-        return ActiveArtifact(self.__api_client, self.__project_key, name, version)
+        return ActiveArtifact(self.__api_client, self.__project_key, name, version,
+                              artifact_cache=self.__artifact_cache)
 
     def load_model(self,
                    name: str,
@@ -97,6 +108,10 @@ class MLAideClient:
         """Loads and restores a model. The model is specified by its name and version. If no version
         is specified, the latest available version of the model will be used.
 
+        If the model cache is enabled (see `ConnectionOptions.model_cache_max_entries`), loaded models are kept in
+        memory and the same model object is returned to all callers. The latest version of a model or stage is looked
+        up again after `ConnectionOptions.model_cache_ttl` seconds.
+
         Arguments:
             name: The name of the model.
             version: The (optional) version of the model. If no version is specified, the latest available version will
@@ -113,7 +128,88 @@ class MLAideClient:
         if version is not None and stage is not None:
             raise ValueError("Only one argument of version and stage can be not None")
 
-        return ActiveArtifact(self.__api_client, self.__project_key, name, version, stage).load_model()
+        if self.__model_cache is None:
+            return ActiveArtifact(self.__api_client, self.__project_key, name, version, stage,
+                                  artifact_cache=self.__artifact_cache).load_model()
+
+        if version is None:
+            version = self.__model_cache.get_version((name, stage))
+
+        if version is None:
+            # Resolve the latest version; the metadata of the artifact is reused to load the model
+            active_artifact = ActiveArtifact(self.__api_client, self.__project_key, name, None, stage,
+                                             artifact_cache=self.__artifact_cache)
+            version = active_artifact.artifact.version
+            self.__model_cache.set_version((name, stage), version)
+            return self.__model_cache.get_or_load((name, version), active_artifact.load_model)
+
+        return self.__model_cache.get_or_load(
+            (name, version),
+            lambda: ActiveArtifact(self.__api_client, self.__project_key, name, version, None,
+                                   artifact_cache=self.__artifact_cache).load_model())
+
+    def watch_model(self,
+                    name: str,
+                    stage: Optional[ModelStage] = ModelStage.PRODUCTION,
+                    interval: float = 60.0,
+                    on_change: Optional[Callable[[Any, int], None]] = None) -> ModelWatcher:
+        """Loads the latest model of a stage and replaces it in the background whenever another model version is
+        moved into the stage. The checks use conditional requests, so polling is cheap for the server.
+
+        Arguments:
+            name: The name of the model.
+            stage: The stage of the model. If `None`, the latest version of the model will be watched.
+            interval: The interval in seconds in which the stage is checked for a new model version.
+            on_change: An optional callback that will be invoked with the new model and its version after the model
+                was replaced.
+
+        Returns:
+            The watcher. Use `watcher.model` to get the current model and `watcher.stop()` to stop watching.
+        """
+        artifact = ActiveArtifact(self.__api_client, self.__project_key, name, None, stage,
+                                  artifact_cache=self.__artifact_cache)
+        return ModelWatcher(artifact, interval=interval, on_change=on_change)
+
+    def sync(self) -> int:
+        """Sends all experiments, runs and artifacts that were recorded in offline mode (see
+        `ConnectionOptions.offline`) to the server. Sync can be called by any client of the same project, e.g. after
+        a training in a network without access to the server finished. Logs of clients that are still open will be
+        skipped. If the sync fails, it can be restarted; it continues where it stopped.
+
+        Returns:
+            The number of offline logs that were sent to the server.
+        """
+        return sync_offline_logs(self.__api_client, self.__get_offline_directory(), self.__project_key)
+
+    def stats(self, reset: bool = False) -> Dict[str, EndpointStats]:
+        """Returns the stats of all requests that this client sent to the ML Aide server, per endpoint (e.g.
+        `artifact_api.upload_file`): the number of requests and errors, the bytes sent and received and histograms of
+        the time to the first byte and the total time. Requests sent through proxies from the environment
+        (`HTTP_PROXY`, `HTTPS_PROXY`) are included. The requests are measured by wrapping the transports of the
+        httpx client; with an httpx version whose internals differ from the supported version no requests are
+        recorded.
+
+        Arguments:
+            reset: If `True`, the stats start over afterwards. This is useful to export the stats periodically.
+        """
+        return self.__api_client.get_request_stats(reset=reset)
+
+    def add_request_listener(self, listener: Callable[[RequestEvent], None]):
+        """Adds a callback that is invoked with every request to the ML Aide server after its response was read, e.g. to
+        forward the timings to another metrics system. The callback is invoked in the thread that sent the request and
+        should not block; exceptions raised by the callback are ignored.
+
+        Arguments:
+            listener: The callback.
+        """
+        self.__api_client.add_request_listener(listener)
+
+    def remove_request_listener(self, listener: Callable[[RequestEvent], None]):
+        """Removes a callback that was added with `add_request_listener`."""
+        self.__api_client.remove_request_listener(listener)
+
+    def __get_offline_directory(self) -> str:
+        return os.path.join(self.__options.cache_directory, 'offline')
 
     @property
     def options(self) -> ConnectionOptions:
@@ -123,17 +219,8 @@ class MLAideClient:
     def api_client(self) -> Client:
         return self.__api_client
 
-    @staticmethod
-    def __get_default_options() -> ConnectionOptions:
-        options = ConnectionOptions()
-        options.server_url = 'http://localhost:9000/api/v1'
-        options.api_key = os.environ.get('MLAIDE_API_KEY')
-        return options
-
-    @staticmethod
-    def __merge_options(target: ConnectionOptions, source: ConnectionOptions) -> ConnectionOptions:
-        merged = dict()
-        merged.update(target.to_dict())
-        merged.update(source.to_dict())
-
-        return ConnectionOptions.from_dict(merged)
+    @property
+    def artifact_cache_stats(self) -> Optional[ArtifactCacheStats]:
+        """The hits, misses and evictions of the local artifact cache in this process or `None` if the cache is
+        disabled."""
+        return self.__artifact_cache.stats if self.__artifact_cache is not None else None
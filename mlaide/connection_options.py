@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+
+@dataclass
+class ConnectionOptions:
+    """Specify options for a MLAideClient"""
+
+    server_url: Optional[str]
+    api_key: Optional[str]
+    timeout: Optional[float]
+    max_connections: Optional[int]
+    max_keepalive_connections: Optional[int]
+    max_payload_size: Optional[int]
+    hash_workers: Optional[int]
+    upload_workers: Optional[int]
+    chunked_upload_threshold: Optional[int]
+    chunked_upload_part_size: Optional[int]
+    cache_directory: Optional[str]
+    hash_cache_enabled: Optional[bool]
+    hash_cache_max_entries: Optional[int]
+    artifact_cache_enabled: Optional[bool]
+    artifact_cache_max_size: Optional[int]
+    artifact_compression: Optional[str]
+    model_cache_max_entries: Optional[int]
+    model_cache_max_bytes: Optional[int]
+    model_cache_ttl: Optional[float]
+    model_buffer_min_size: Optional[int]
+    git_dirty_check: Optional[bool]
+    git_dirty_check_timeout: Optional[float]
+    git_untracked_files: Optional[bool]
+    offline: Optional[bool]
+
+    def __init__(self,
+                 server_url: str = None,
+                 api_key: str = None,
+                 timeout: float = None,
+                 max_connections: int = None,
+                 max_keepalive_connections: int = None,
+                 max_payload_size: int = None,
+                 hash_workers: int = None,
+                 upload_workers: int = None,
+                 chunked_upload_threshold: int = None,
+                 chunked_upload_part_size: int = None,
+                 cache_directory: str = None,
+                 hash_cache_enabled: bool = None,
+                 hash_cache_max_entries: int = None,
+                 artifact_cache_enabled: bool = None,
+                 artifact_cache_max_size: int = None,
+                 artifact_compression: str = None,
+                 model_cache_max_entries: int = None,
+                 model_cache_max_bytes: int = None,
+                 model_cache_ttl: float = None,
+                 model_buffer_min_size: int = None,
+                 git_dirty_check: bool = None,
+                 git_dirty_check_timeout: float = None,
+                 git_untracked_files: bool = None,
+                 offline: bool = None):
+        self.server_url = server_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_payload_size = max_payload_size
+        self.hash_workers = hash_workers
+        self.upload_workers = upload_workers
+        self.chunked_upload_threshold = chunked_upload_threshold
+        self.chunked_upload_part_size = chunked_upload_part_size
+        self.cache_directory = cache_directory
+        self.hash_cache_enabled = hash_cache_enabled
+        self.hash_cache_max_entries = hash_cache_max_entries
+        self.artifact_cache_enabled = artifact_cache_enabled
+        self.artifact_cache_max_size = artifact_cache_max_size
+        self.artifact_compression = artifact_compression
+        self.model_cache_max_entries = model_cache_max_entries
+        self.model_cache_max_bytes = model_cache_max_bytes
+        self.model_cache_ttl = model_cache_ttl
+        self.model_buffer_min_size = model_buffer_min_size
+        self.git_dirty_check = git_dirty_check
+        self.git_dirty_check_timeout = git_dirty_check_timeout
+        self.git_untracked_files = git_untracked_files
+        self.offline = offline
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {
+            "server_url": self.server_url,
+            "api_key": self.api_key,
+            "timeout": self.timeout,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "max_payload_size": self.max_payload_size,
+            "hash_workers": self.hash_workers,
+            "upload_workers": self.upload_workers,
+            "chunked_upload_threshold": self.chunked_upload_threshold,
+            "chunked_upload_part_size": self.chunked_upload_part_size,
+            "cache_directory": self.cache_directory,
+            "hash_cache_enabled": self.hash_cache_enabled,
+            "hash_cache_max_entries": self.hash_cache_max_entries,
+            "artifact_cache_enabled": self.artifact_cache_enabled,
+            "artifact_cache_max_size": self.artifact_cache_max_size,
+            "artifact_compression": self.artifact_compression,
+            "model_cache_max_entries": self.model_cache_max_entries,
+            "model_cache_max_bytes": self.model_cache_max_bytes,
+            "model_cache_ttl": self.model_cache_ttl,
+            "model_buffer_min_size": self.model_buffer_min_size,
+            "git_dirty_check": self.git_dirty_check,
+            "git_dirty_check_timeout": self.git_dirty_check_timeout,
+            "git_untracked_files": self.git_untracked_files,
+            "offline": self.offline
+        }
+
+        # Remove values from dict that are None
+        return {k: v for k, v in d.items() if v is not None}
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> ConnectionOptions:
+        if d is None:
+            d = dict()
+
+        options = ConnectionOptions(
+            server_url=d.get("server_url", None),
+            api_key=d.get("api_key", None),
+            timeout=d.get("timeout", None),
+            max_connections=d.get("max_connections", None),
+            max_keepalive_connections=d.get("max_keepalive_connections", None),
+            max_payload_size=d.get("max_payload_size", None),
+            hash_workers=d.get("hash_workers", None),
+            upload_workers=d.get("upload_workers", None),
+            chunked_upload_threshold=d.get("chunked_upload_threshold", None),
+            chunked_upload_part_size=d.get("chunked_upload_part_size", None),
+            cache_directory=d.get("cache_directory", None),
+            hash_cache_enabled=d.get("hash_cache_enabled", None),
+            hash_cache_max_entries=d.get("hash_cache_max_entries", None),
+            artifact_cache_enabled=d.get("artifact_cache_enabled", None),
+            artifact_cache_max_size=d.get("artifact_cache_max_size", None),
+            artifact_compression=d.get("artifact_compression", None),
+            model_cache_max_entries=d.get("model_cache_max_entries", None),
+            model_cache_max_bytes=d.get("model_cache_max_bytes", None),
+            model_cache_ttl=d.get("model_cache_ttl", None),
+            model_buffer_min_size=d.get("model_buffer_min_size", None),
+            git_dirty_check=d.get("git_dirty_check", None),
+            git_dirty_check_timeout=d.get("git_dirty_check_timeout", None),
+            git_untracked_files=d.get("git_untracked_files", None),
+            offline=d.get("offline", None)
+        )
+
+        return options
+
+
+def _resolve_options(options: Optional[ConnectionOptions]) -> ConnectionOptions:
+    if options is None:
+        return _get_default_options()
+    else:
+        return _merge_options(_get_default_options(), options)
+
+
+def _get_default_options() -> ConnectionOptions:
+    options = ConnectionOptions()
+    options.server_url = 'http://localhost:9000/api/v1'
+    options.api_key = os.environ.get('MLAIDE_API_KEY')
+    options.timeout = 30.0
+    options.max_connections = 10
+    options.max_keepalive_connections = 5
+    options.max_payload_size = 1024 * 1024
+    options.hash_workers = os.cpu_count() or 1
+    options.upload_workers = 4
+    # Chunked uploads require the upload endpoints of newer servers, therefore they must be enabled explicitly, e.g.
+    # with 100 MiB
+    options.chunked_upload_threshold = None
+    options.chunked_upload_part_size = 16 * 1024 * 1024
+    options.cache_directory = os.path.join(
+        os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'mlaide')
+    options.hash_cache_enabled = True
+    options.hash_cache_max_entries = 100_000
+    # Cached artifacts take up to artifact_cache_max_size bytes of disk space, therefore the cache must be enabled
+    # explicitly
+    options.artifact_cache_enabled = False
+    options.artifact_cache_max_size = 10 * 1024 * 1024 * 1024
+    # Compressed artifacts cannot be loaded by older clients, therefore compression must be enabled explicitly, e.g.
+    # with 'auto'
+    options.artifact_compression = 'none'
+    # Cached models are shared by all callers of load_model, therefore the cache must be enabled explicitly
+    options.model_cache_max_entries = 0
+    options.model_cache_ttl = 60.0
+    # Models with separate buffer files cannot be loaded by older clients, therefore the format must be enabled
+    # explicitly, e.g. with 1 MiB
+    options.model_buffer_min_size = 0
+    # Checking the working tree for changes can take very long in large repositories
+    options.git_dirty_check = True
+    options.git_dirty_check_timeout = 10.0
+    options.git_untracked_files = False
+    options.offline = False
+    return options
+
+
+def _merge_options(target: ConnectionOptions, source: ConnectionOptions) -> ConnectionOptions:
+    merged = dict()
+    merged.update(target.to_dict())
+    merged.update(source.to_dict())
+
+    return ConnectionOptions.from_dict(merged)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, cast, Optional
-from httpx import Response
+from typing import Any, Dict, cast, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from httpx import Response
 
 
 @dataclass
@@ -73,3 +75,23 @@ class NotAuthorizedError(MLAideError):
 class ServerError(MLAideError):
     """Exception raised for ML Aide server errors."""
     pass
+
+
+class ArtifactUploadError(MLAideError):
+    """Exception raised when one or more files of an artifact could not be uploaded.
+
+    Attributes:
+        artifact_name: The name of the artifact.
+        artifact_version: The version of the artifact.
+        errors: The errors that occurred, indexed by the name of the file that could not be uploaded.
+    """
+
+    def __init__(self, artifact_name: str, artifact_version: int, errors: Dict[str, Exception]):
+        super().__init__()
+        self.artifact_name = artifact_name
+        self.artifact_version = artifact_version
+        self.errors = errors
+
+    def __str__(self):
+        return "failed to upload {} file(s) of artifact {}:{}: {}".format(
+            len(self.errors), self.artifact_name, self.artifact_version, ", ".join(self.errors.keys()))
@@ -1,19 +1,176 @@
-from git import Repo, InvalidGitRepositoryError, NoSuchPathError
-from typing import Optional
+import configparser
+import os
+import subprocess
+import threading
+import zlib
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
 from .model.git import Git
 
+# The metadata of each repository is resolved once per process and reused until HEAD points to another commit
+_cache: Dict[Tuple, Tuple[str, Git]] = {}
+_cache_lock = threading.Lock()
 
-def get_git_metadata(remote_name: str = 'origin') -> Optional[Git]:
-    try:
-        repo = Repo(search_parent_directories=True)
-    except (InvalidGitRepositoryError, NoSuchPathError):
+
+def get_git_metadata(remote_name: str = 'origin',
+                     dirty_check: bool = True,
+                     dirty_check_timeout: Optional[float] = None,
+                     untracked_files: bool = False) -> Optional[Git]:
+    """Resolves the git metadata of the repository that contains the current working directory.
+
+    HEAD, refs, the commit and the remote url are read directly from the `.git` directory. Only the dirty check runs
+    `git status`. The result is cached per repository and resolved again as soon as HEAD points to another commit,
+    therefore changes of the working tree are not detected while HEAD does not change.
+
+    Arguments:
+        remote_name: The name of the remote whose url is used as repository uri.
+        dirty_check: If `False`, the working tree will not be checked for changes and `is_dirty` will be `None`.
+        dirty_check_timeout: The maximum time in seconds the dirty check may take. If the check takes longer,
+            `is_dirty` will be `None`.
+        untracked_files: If `True`, untracked files make the working tree dirty. Checking for untracked files can be
+            slow in repositories with large untracked directories.
+
+    Returns:
+        The git metadata or `None` if the current working directory is not inside a git repository.
+    """
+    git_dir = _find_git_dir(os.getcwd())
+    if git_dir is None:
+        return None
+
+    common_dir = _get_common_dir(git_dir)
+    commit_hash = _resolve_head(git_dir, common_dir)
+    if commit_hash is None:
+        # The repository has no commits yet
         return None
 
+    key = (git_dir, remote_name, dirty_check, dirty_check_timeout, untracked_files)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached[0] == commit_hash:
+        return cached[1]
+
     git_metadata = Git(
-        commit_time=repo.head.object.committed_datetime,
-        commit_hash=repo.head.object.hexsha,
-        is_dirty=repo.is_dirty(),
-        repository_uri=next(repo.remote(remote_name).urls)
+        commit_time=_read_commit_time(git_dir, common_dir, commit_hash),
+        commit_hash=commit_hash,
+        is_dirty=_is_dirty(dirty_check_timeout, untracked_files) if dirty_check else None,
+        repository_uri=_read_remote_url(common_dir, remote_name)
     )
 
+    with _cache_lock:
+        _cache[key] = (commit_hash, git_metadata)
+
     return git_metadata
+
+
+def _find_git_dir(directory: str) -> Optional[str]:
+    directory = os.path.abspath(directory)
+    while True:
+        dot_git = os.path.join(directory, '.git')
+        if os.path.isdir(dot_git):
+            return dot_git
+        if os.path.isfile(dot_git):
+            # Worktrees and submodules contain a file that points to the actual git directory
+            with open(dot_git, 'r') as file:
+                content = file.read().strip()
+            if content.startswith('gitdir:'):
+                return os.path.normpath(os.path.join(directory, content[len('gitdir:'):].strip()))
+
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def _get_common_dir(git_dir: str) -> str:
+    # Worktrees share refs, objects and config with the main repository
+    try:
+        with open(os.path.join(git_dir, 'commondir'), 'r') as file:
+            return os.path.normpath(os.path.join(git_dir, file.read().strip()))
+    except FileNotFoundError:
+        return git_dir
+
+
+def _resolve_head(git_dir: str, common_dir: str) -> Optional[str]:
+    with open(os.path.join(git_dir, 'HEAD'), 'r') as file:
+        head = file.read().strip()
+
+    # Follow symbolic refs, e.g. "ref: refs/heads/main"
+    for _ in range(10):
+        if not head.startswith('ref:'):
+            return head
+
+        head = _read_ref(git_dir, common_dir, head[len('ref:'):].strip())
+        if head is None:
+            return None
+
+    return None
+
+
+def _read_ref(git_dir: str, common_dir: str, ref: str) -> Optional[str]:
+    for directory in (git_dir, common_dir):
+        try:
+            with open(os.path.join(directory, ref), 'r') as file:
+                return file.read().strip()
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+    try:
+        with open(os.path.join(common_dir, 'packed-refs'), 'r') as file:
+            for line in file:
+                if line.startswith(('#', '^')):
+                    continue
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except FileNotFoundError:
+        pass
+
+    return None
+
+
+def _read_commit_time(git_dir: str, common_dir: str, commit_hash: str) -> datetime:
+    path = os.path.join(common_dir, 'objects', commit_hash[:2], commit_hash[2:])
+    try:
+        with open(path, 'rb') as file:
+            content = zlib.decompress(file.read())
+    except FileNotFoundError:
+        # The commit is stored in a pack file, which is read by GitPython
+        from git import Repo
+        return Repo(git_dir).commit(commit_hash).committed_datetime
+
+    # A commit object consists of a header, e.g. "commit 234\0", and lines like
+    # "committer Name <mail@example.com> 1614850000 +0100"
+    for line in content.split(b'\0', 1)[1].split(b'\n'):
+        if not line:
+            break
+        if line.startswith(b'committer '):
+            timestamp, offset = line.rsplit(b' ', 2)[1:]
+            offset_minutes = int(offset[1:3]) * 60 + int(offset[3:5])
+            tz = timezone(timedelta(minutes=-offset_minutes if offset.startswith(b'-') else offset_minutes))
+            return datetime.fromtimestamp(int(timestamp), tz)
+
+    raise ValueError(f'commit {commit_hash} has no committer')
+
+
+def _read_remote_url(common_dir: str, remote_name: str) -> Optional[str]:
+    config = configparser.ConfigParser(strict=False, interpolation=None)
+    try:
+        config.read(os.path.join(common_dir, 'config'))
+        return config.get(f'remote "{remote_name}"', 'url', fallback=None)
+    except configparser.Error:
+        return None
+
+
+def _is_dirty(timeout: Optional[float], untracked_files: bool) -> Optional[bool]:
+    # --no-optional-locks prevents `git status` from updating the index, which could conflict with other git commands
+    command = ['git', '--no-optional-locks', 'status', '--porcelain',
+               f'--untracked-files={"normal" if untracked_files else "no"}']
+    try:
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                timeout=timeout, check=True)
+    except (OSError, subprocess.SubprocessError):
+        # git is not installed, the check failed or took too long
+        return None
+
+    return len(result.stdout.strip()) > 0
@@ -1,11 +1,15 @@
 from .user_ref import UserRef
 from .artifact_file import ArtifactFile
+from .artifact_cache_stats import ArtifactCacheStats
 from .artifact_ref import ArtifactRef
+from .endpoint_stats import EndpointStats, LatencyHistogram
 from .git import Git
 from .in_memory_artifact_file import InMemoryArtifactFile
 from .local_artifact_file import LocalArtifactFile
 from .new_artifact import NewArtifact
+from .request_event import RequestEvent
 from .model import Model, ModelRevision, ModelStage
 from .artifact import Artifact
 from .run import Run, RunStatus
 from .experiment import Experiment
+from .sweep_trial_result import SweepTrialResult
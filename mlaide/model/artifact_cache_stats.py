@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class ArtifactCacheStats(object):
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
@@ -0,0 +1,66 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# Upper bounds of the histogram buckets in seconds: 1 ms to about 65 s, doubling from bucket to bucket
+LATENCY_BUCKETS = tuple(0.001 * 2 ** i for i in range(17))
+
+
+@dataclass
+class LatencyHistogram(object):
+    """A histogram of latencies in seconds
+
+    `counts[i]` is the number of latencies up to `bounds[i]`, but above the previous bound; the last count holds the
+    latencies above the last bound.
+    """
+
+    bounds: List[float] = field(default_factory=lambda: list(LATENCY_BUCKETS))
+    counts: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    count: int = 0
+    sum: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+    def add(self, latency: float):
+        self.counts[bisect_left(self.bounds, latency)] += 1
+        self.count += 1
+        self.sum += latency
+        self.min = latency if self.min is None else min(self.min, latency)
+        self.max = latency if self.max is None else max(self.max, latency)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count > 0 else None
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Estimates a percentile (0 to 100) of the latencies by interpolating within its bucket"""
+        if self.count == 0:
+            return None
+
+        rank = percent / 100 * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count > 0 and cumulative + count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * max(rank - cumulative, 0) / count
+                return min(max(estimate, self.min), self.max)
+            cumulative += count
+
+        return self.max
+
+
+@dataclass
+class EndpointStats(object):
+    """The requests to one endpoint of the ML Aide server in this process
+
+    `errors` counts the requests that failed without a response or with a status code of 400 or above.
+    """
+
+    endpoint: str
+    requests: int = 0
+    errors: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    time_to_first_byte: LatencyHistogram = field(default_factory=LatencyHistogram)
+    duration: LatencyHistogram = field(default_factory=LatencyHistogram)
@@ -1,10 +1,11 @@
 import datetime
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
 class Git(object):
     commit_time: datetime
     commit_hash: str
-    is_dirty: bool
-    repository_uri: str
+    is_dirty: Optional[bool]
+    repository_uri: Optional[str]
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
+from typing import Optional
 
 
 @dataclass
 class LocalArtifactFile(object):
     file_name: str
+    # The name of the file in the artifact. Defaults to the path of the file relative to the working directory.
+    artifact_file_name: Optional[str] = None
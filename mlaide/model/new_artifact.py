@@ -9,3 +9,5 @@ class NewArtifact(object):
     type: str
     files: Optional[Collection[Union[InMemoryArtifactFile, LocalArtifactFile]]] = None
     metadata: Optional[Dict[str, str]] = None
+    # 'none', 'auto', 'zstd' or 'gzip'. Defaults to `ConnectionOptions.artifact_compression`.
+    compression: Optional[str] = None
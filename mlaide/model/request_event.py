@@ -0,0 +1,26 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RequestEvent(object):
+    """A single request to the ML Aide server, as passed to request listeners
+
+    Times are in seconds. `time_to_first_byte` is the time until the response headers were received and `duration` the
+    time until the response body was read completely. If the request failed without a response, `status_code` and
+    `time_to_first_byte` are `None` and `error` contains the name of the exception.
+    """
+
+    endpoint: str
+    method: str
+    url: str
+    status_code: Optional[int] = None
+    request_bytes: int = 0
+    response_bytes: int = 0
+    time_to_first_byte: Optional[float] = None
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or self.status_code is None or self.status_code >= 400
@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from .run import RunStatus
+
+
+@dataclass
+class SweepTrialResult(object):
+    """The outcome of a single trial of a hyperparameter sweep"""
+
+    index: int
+    parameters: Dict[str, Any] = field(default_factory=dict)
+    status: Optional[RunStatus] = None
+    run_key: Optional[int] = None
+    result: Any = None
+    error: Optional[str] = None
@@ -0,0 +1,362 @@
+import importlib
+import inspect
+import io
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import threading
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple, Union
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from ._file_utils import BufferReader
+from .model import InMemoryArtifactFile, LocalArtifactFile
+
+ModelFiles = Collection[Union[InMemoryArtifactFile, LocalArtifactFile]]
+
+# The manifest records the flavor of a model artifact
+MANIFEST_FILE_NAME = 'flavor.json'
+_buffer_file_name_pattern = re.compile(r'model-buffer-(\d+)\.bin')
+
+
+class ModelFlavor(object):
+    """A model flavor stores models of a framework in the framework's own format.
+
+    `log_model` uses the first registered flavor whose `can_serialize` accepts the model and records its name (and
+    its `properties`) in the manifest of the artifact. `load_model` reads the manifest and restores the model with the
+    flavor of the same name, therefore a flavor must be registered under the same name in the process that loads the
+    model. Flavors should import their framework inside their methods, so that registering a flavor stays cheap.
+    """
+
+    name: str
+
+    def can_serialize(self, model: Any) -> bool:
+        """Returns `True` if this flavor can store the model"""
+        raise NotImplementedError()
+
+    def serialize(self, model: Any, staging_directory: str, buffer_min_size: int = 0) -> ModelFiles:
+        """Stores the model as artifact files.
+
+        Arguments:
+            model: The model.
+            staging_directory: An empty directory for files that the framework writes to disk. Files in this directory
+                can be returned as `LocalArtifactFile`, because the directory is removed only after the artifact was
+                uploaded.
+            buffer_min_size: If greater than 0, flavors that support it store contiguous buffers of at least this size
+                as separate files. Other flavors ignore it.
+        """
+        raise NotImplementedError()
+
+    def properties(self, model: Any) -> Dict[str, Any]:
+        """Returns JSON serializable properties that are stored in the manifest and passed to `deserialize`"""
+        return {}
+
+    def deserialize(self, directory: str, properties: Dict[str, Any]) -> Any:
+        """Restores the model from the files in `directory`.
+
+        Arguments:
+            directory: The local directory that contains all files of the artifact.
+            properties: The properties that were returned by `properties` when the model was stored.
+        """
+        raise NotImplementedError()
+
+
+class PickleFlavor(ModelFlavor):
+    """Stores any model with cloudpickle. With protocol 5 large buffers are stored as separate files
+    `model-buffer-<index>.bin`, which are memory-mapped when the model is loaded."""
+
+    name = 'pickle'
+
+    def can_serialize(self, model: Any) -> bool:
+        return True
+
+    def serialize(self, model: Any, staging_directory: str, buffer_min_size: int = 0) -> ModelFiles:
+        import cloudpickle
+
+        buffer = io.BytesIO()
+        out_of_band_buffers = []
+        if buffer_min_size > 0:
+            cloudpickle.dump(model, buffer, protocol=5,
+                             buffer_callback=_collect_buffers(out_of_band_buffers, buffer_min_size))
+        else:
+            cloudpickle.dump(model, buffer)
+        buffer.seek(0)
+
+        files = [InMemoryArtifactFile(file_name='model.pkl', file_content=buffer)]
+        files.extend(InMemoryArtifactFile(file_name=_buffer_file_name(index), file_content=BufferReader(view))
+                     for index, view in enumerate(out_of_band_buffers))
+        return files
+
+    def deserialize(self, directory: str, properties: Dict[str, Any]) -> Any:
+        import cloudpickle
+
+        # The mappings stay valid even if the files are removed afterwards, e.g. by the artifact cache
+        buffers = [map_buffer_file(os.path.join(directory, file_name))
+                   for file_name in get_buffer_file_names(os.listdir(directory))]
+        with open(os.path.join(directory, 'model.pkl'), 'rb') as file:
+            return cloudpickle.load(file, buffers=buffers)
+
+
+class SklearnFlavor(PickleFlavor):
+    """Stores scikit-learn estimators with cloudpickle"""
+
+    name = 'sklearn'
+
+    def can_serialize(self, model: Any) -> bool:
+        return _has_base_class(model, 'sklearn')
+
+
+class NumpyFlavor(ModelFlavor):
+    """Stores a numpy array in the `.npy` format. The array is memory-mapped (copy-on-write) when it is loaded."""
+
+    name = 'numpy'
+
+    def can_serialize(self, model: Any) -> bool:
+        return _has_base_class(model, 'numpy', 'ndarray') and not model.dtype.hasobject
+
+    def serialize(self, model: Any, staging_directory: str, buffer_min_size: int = 0) -> ModelFiles:
+        import numpy
+
+        buffer = io.BytesIO()
+        numpy.save(buffer, model, allow_pickle=False)
+        buffer.seek(0)
+        return [InMemoryArtifactFile(file_name='model.npy', file_content=buffer)]
+
+    def deserialize(self, directory: str, properties: Dict[str, Any]) -> Any:
+        import numpy
+
+        return numpy.load(os.path.join(directory, 'model.npy'), mmap_mode='c', allow_pickle=False)
+
+
+class XGBoostFlavor(ModelFlavor):
+    """Stores xgboost boosters and scikit-learn estimators of xgboost in xgboost's binary JSON format (UBJ)"""
+
+    name = 'xgboost'
+
+    def can_serialize(self, model: Any) -> bool:
+        return _has_base_class(model, 'xgboost', 'Booster') or _has_base_class(model, 'xgboost', 'XGBModel')
+
+    def serialize(self, model: Any, staging_directory: str, buffer_min_size: int = 0) -> ModelFiles:
+        # xgboost selects the format by the file extension
+        path = os.path.join(staging_directory, 'model.ubj')
+        model.save_model(path)
+        return [LocalArtifactFile(file_name=path, artifact_file_name='model.ubj')]
+
+    def properties(self, model: Any) -> Dict[str, Any]:
+        return {'class': _get_class_name(model)}
+
+    def deserialize(self, directory: str, properties: Dict[str, Any]) -> Any:
+        model = _create_instance(properties['class'])
+        model.load_model(os.path.join(directory, 'model.ubj'))
+        return model
+
+
+class TorchFlavor(ModelFlavor):
+    """Stores the state dict of torch modules and tensors with `torch.save`, which keeps the tensors in their binary
+    format. Both are loaded with `weights_only=True` where torch supports it, so that no classes are unpickled.
+
+    The class of a module is recorded in the manifest. When the model is loaded, the module is created by calling the
+    class without arguments and the state dict is loaded into it. Modules whose constructor requires arguments can be
+    created by registering a `TorchFlavor` with `create_module`.
+    """
+
+    name = 'torch'
+    __create_module: Optional[Callable[[str], Any]]
+
+    def __init__(self, create_module: Optional[Callable[[str], Any]] = None):
+        """
+        Arguments:
+            create_module: Creates an empty module for the recorded class name (`<module>:<qualified name>`) when a
+                model is loaded. If `None`, the class is imported and called without arguments.
+        """
+        self.__create_module = create_module
+
+    def can_serialize(self, model: Any) -> bool:
+        return _has_base_class(model, 'torch', 'Module') or _has_base_class(model, 'torch', 'Tensor')
+
+    def serialize(self, model: Any, staging_directory: str, buffer_min_size: int = 0) -> ModelFiles:
+        import torch
+
+        buffer = io.BytesIO()
+        torch.save(model.state_dict() if _has_base_class(model, 'torch', 'Module') else model, buffer)
+        buffer.seek(0)
+        return [InMemoryArtifactFile(file_name='model.pt', file_content=buffer)]
+
+    def properties(self, model: Any) -> Dict[str, Any]:
+        if _has_base_class(model, 'torch', 'Module'):
+            return {'class': _get_class_name(model)}
+        return {}
+
+    def deserialize(self, directory: str, properties: Dict[str, Any]) -> Any:
+        import torch
+
+        path = os.path.join(directory, 'model.pt')
+        if 'weights_only' in inspect.signature(torch.load).parameters:
+            state = torch.load(path, weights_only=True)
+        else:
+            state = torch.load(path)
+
+        if 'class' not in properties:
+            return state
+
+        create_module = self.__create_module if self.__create_module is not None else _create_instance
+        module = create_module(properties['class'])
+        module.load_state_dict(state)
+        return module
+
+
+class KerasFlavor(ModelFlavor):
+    """Stores keras models in the SavedModel format of tensorflow. Large files (e.g. the variable shards) are uploaded
+    directly from the staging directory, all other files are packed into `saved_model.zip` to save requests."""
+
+    name = 'keras'
+    pack_file_name = 'saved_model.zip'
+    # Files of at least this size are uploaded separately
+    pack_max_file_size = 1024 * 1024
+
+    def can_serialize(self, model: Any) -> bool:
+        # keras is also bundled with tensorflow
+        return _has_base_class(model, ('keras', 'tensorflow'), 'Model')
+
+    def serialize(self, model: Any, staging_directory: str, buffer_min_size: int = 0) -> ModelFiles:
+        saved_model_directory = os.path.join(staging_directory, 'saved_model')
+        model.save(saved_model_directory, save_format='tf')
+
+        files = []
+        small_files = []
+        for root, _, file_names in os.walk(saved_model_directory):
+            for file_name in file_names:
+                path = os.path.join(root, file_name)
+                # The files keep their path relative to the SavedModel directory, e.g. "variables/variables.index"
+                relative_path = os.path.relpath(path, saved_model_directory).replace(os.sep, '/')
+                if os.path.getsize(path) < self.pack_max_file_size:
+                    small_files.append((path, relative_path))
+                else:
+                    files.append(LocalArtifactFile(file_name=path, artifact_file_name=relative_path))
+
+        if small_files:
+            pack_path = os.path.join(staging_directory, self.pack_file_name)
+            with ZipFile(pack_path, 'w', ZIP_DEFLATED) as pack:
+                for path, relative_path in sorted(small_files, key=lambda small_file: small_file[1]):
+                    pack.write(path, relative_path)
+            files.append(LocalArtifactFile(file_name=pack_path, artifact_file_name=self.pack_file_name))
+
+        return files
+
+    def deserialize(self, directory: str, properties: Dict[str, Any]) -> Any:
+        from tensorflow import keras
+
+        # The SavedModel is restored in a separate directory, because the artifact's directory may belong to the
+        # artifact cache. Large files are linked instead of copied; keras reads all files while loading the model.
+        with tempfile.TemporaryDirectory(prefix='mlaide-saved-model-') as saved_model_directory:
+            for root, _, file_names in os.walk(directory):
+                for file_name in file_names:
+                    path = os.path.join(root, file_name)
+                    relative_path = os.path.relpath(path, directory)
+                    if relative_path in (self.pack_file_name, MANIFEST_FILE_NAME):
+                        continue
+                    _link_or_copy(path, os.path.join(saved_model_directory, relative_path))
+
+            pack_path = os.path.join(directory, self.pack_file_name)
+            if os.path.exists(pack_path):
+                with ZipFile(pack_path) as pack:
+                    pack.extractall(saved_model_directory)
+
+            return keras.models.load_model(saved_model_directory)
+
+
+# The flavors are tried in this order. The pickle flavor accepts every model and must be the last one.
+_flavors: List[ModelFlavor] = [KerasFlavor(), XGBoostFlavor(), TorchFlavor(), NumpyFlavor(), SklearnFlavor(),
+                               PickleFlavor()]
+_flavors_lock = threading.Lock()
+
+
+def register_model_flavor(flavor: ModelFlavor):
+    """Registers a model flavor. It takes precedence over all flavors that were registered before and replaces the
+    flavor with the same name, if any.
+
+    Arguments:
+        flavor: The model flavor.
+    """
+    global _flavors
+
+    with _flavors_lock:
+        _flavors = [flavor] + [f for f in _flavors if f.name != flavor.name]
+
+
+def find_model_flavor(model: Any) -> ModelFlavor:
+    """Returns the first flavor that can store the model"""
+    return next(flavor for flavor in _flavors if flavor.can_serialize(model))
+
+
+def get_model_flavor(name: str) -> ModelFlavor:
+    """Returns the flavor with the given name"""
+    flavor = next((flavor for flavor in _flavors if flavor.name == name), None)
+    if flavor is None:
+        raise ValueError(f"model flavor '{name}' is not registered")
+
+    return flavor
+
+
+def get_buffer_file_names(file_names: Collection[str]) -> List[str]:
+    """Returns the names of the buffer files among the files of a model artifact, ordered by their index"""
+    indices = sorted(int(match.group(1)) for match in map(_buffer_file_name_pattern.fullmatch, file_names) if match)
+    return [_buffer_file_name(index) for index in indices]
+
+
+def map_buffer_file(path: str) -> mmap.mmap:
+    """Memory-maps a buffer file. The pages are shared with all processes that map the same file, e.g. from the
+    artifact cache. Copy-on-write allows the model to modify its arrays without changing the file."""
+    with open(path, 'rb') as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+
+def _buffer_file_name(index: int) -> str:
+    return f'model-buffer-{index}.bin'
+
+
+def _collect_buffers(buffers: list, min_size: int):
+    def buffer_callback(pickle_buffer) -> bool:
+        try:
+            view = pickle_buffer.raw()
+        except BufferError:
+            # Non-contiguous buffers are pickled in-band
+            return True
+
+        if view.nbytes < min_size:
+            return True
+
+        buffers.append(view)
+        return False
+
+    return buffer_callback
+
+
+def _link_or_copy(source: str, target: str):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    try:
+        os.symlink(source, target)
+    except OSError:
+        # Creating symbolic links requires additional privileges on Windows
+        shutil.copyfile(source, target)
+
+
+def _get_class_name(model: Any) -> str:
+    return f'{type(model).__module__}:{type(model).__qualname__}'
+
+
+def _create_instance(class_name: str) -> Any:
+    module_name, qualified_name = class_name.split(':')
+    class_obj = importlib.import_module(module_name)
+    for name in qualified_name.split('.'):
+        class_obj = getattr(class_obj, name)
+    return class_obj()
+
+
+def _has_base_class(model: Any, packages: Union[str, Tuple[str, ...]], class_name: Optional[str] = None) -> bool:
+    # The classes are compared by name, so that checking a model never imports a framework
+    packages = (packages,) if isinstance(packages, str) else packages
+    return any((class_obj.__module__ or '').split('.')[0] in packages
+               and (class_name is None or class_obj.__name__ == class_name)
+               for class_obj in type(model).__mro__)
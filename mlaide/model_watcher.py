@@ -0,0 +1,94 @@
+import threading
+from typing import Any, Callable, Optional
+
+from .active_artifact import ActiveArtifact
+
+
+class ModelWatcher(object):
+    """Keeps the latest version of a model loaded. A background thread checks the artifact periodically for a new
+    version (e.g. because another model version was promoted to the PRODUCTION stage). When the version changes, the
+    new model is loaded in the background and replaces the current model, so that `model` always returns a
+    ready-to-use model. If checking or loading fails, the current model will be kept and the error is available via
+    `last_error`.
+    """
+
+    __artifact: ActiveArtifact
+    __model: Any
+    __interval: float
+    __on_change: Optional[Callable[[Any, int], None]]
+    __last_error: Optional[Exception] = None
+
+    def __init__(self,
+                 artifact: ActiveArtifact,
+                 interval: float = 60.0,
+                 on_change: Optional[Callable[[Any, int], None]] = None):
+        """Creates a new instance of this class and loads the current model.
+
+        Arguments:
+            artifact: The artifact of the model. The artifact must be requested without an explicit version.
+            interval: The interval in seconds in which the artifact is checked for a new version.
+            on_change: An optional callback that will be invoked with the new model and its version after the model
+                was swapped.
+        """
+        self.__artifact = artifact
+        self.__interval = interval
+        self.__on_change = on_change
+        self.__model = artifact.load_model()
+        self.__version = artifact.artifact.version
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(target=self.__watch, name='mlaide-model-watcher', daemon=True)
+        self.__thread.start()
+
+    @property
+    def model(self) -> Any:
+        """The latest loaded model"""
+        return self.__model
+
+    @property
+    def version(self) -> int:
+        """The version of the latest loaded model"""
+        return self.__version
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        """The error of the last check or `None` if it succeeded"""
+        return self.__last_error
+
+    def check(self) -> bool:
+        """Checks for a new version immediately and swaps the model if the version changed.
+
+        Returns:
+            `True` if a new model was loaded, otherwise `False`.
+        """
+        # A version whose model failed to load is loaded again, even though `refresh` does not report it again
+        if not self.__artifact.refresh() and self.__artifact.artifact.version == self.__version:
+            return False
+
+        model = self.__artifact.load_model()
+        version = self.__artifact.artifact.version
+        # Assigning a reference is atomic, readers either get the old or the new model
+        self.__model, self.__version = model, version
+        if self.__on_change is not None:
+            self.__on_change(model, version)
+
+        return True
+
+    def stop(self):
+        """Stops watching the model. The current model stays available."""
+        self.__stopped.set()
+        if self.__thread is not threading.current_thread():
+            self.__thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def __watch(self):
+        while not self.__stopped.wait(self.__interval):
+            try:
+                self.check()
+                self.__last_error = None
+            except Exception as e:
+                self.__last_error = e
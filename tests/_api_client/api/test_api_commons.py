@@ -1,8 +1,10 @@
+import json
+
 from pytest import raises
 from pytest_mock import MockerFixture
 
 from mlaide.error import *
-from mlaide._api_client.api._api_commons import assert_response_status
+from mlaide._api_client.api._api_commons import assert_response_status, split_merge_patch
 
 
 def test_assert_response_status_with_404_response_and_404_is_allowed_should_not_raise(mocker: MockerFixture):
@@ -82,3 +84,32 @@ def test_assert_response_status_with_502_response_should_raise_server_error(mock
     # act
     with raises(ServerError):
         assert_response_status(response)
+
+
+def test_split_merge_patch_should_return_single_chunk_if_payload_is_small_enough():
+    # act
+    chunks = split_merge_patch({'a': 1, 'b': {'1': 2}}, 1024)
+
+    # assert
+    assert chunks == [{'a': 1, 'b': {'1': 2}}]
+
+
+def test_split_merge_patch_should_return_empty_patch_for_empty_dict():
+    # act
+    chunks = split_merge_patch({}, 1024)
+
+    # assert
+    assert chunks == [{}]
+
+
+def test_split_merge_patch_should_split_nested_dicts_that_are_too_large():
+    # arrange
+    epochs = {str(epoch): epoch for epoch in range(100)}
+
+    # act
+    chunks = split_merge_patch({'loss': epochs}, 100)
+
+    # assert
+    assert len(chunks) > 1
+    assert all(len(json.dumps(chunk)) <= 100 for chunk in chunks)
+    assert {k: v for chunk in chunks for k, v in chunk['loss'].items()} == epochs
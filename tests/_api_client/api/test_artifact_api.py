@@ -1,8 +1,11 @@
 from pytest_mock.plugin import MockerFixture
 from io import BytesIO
+import httpx
 import pytest
 
 import mlaide._api_client.api.artifact_api as artifact_api
+from mlaide._api_client.dto import UploadDto
+from mlaide._file_utils import ChunkedFileReader
 
 
 @pytest.fixture
@@ -10,7 +13,9 @@ def client(mocker: MockerFixture):
     client = mocker.patch('mlaide._api_client.api.artifact_api.Client')()
     client.base_url = 'https://mlaide.com'
     client.get_headers.return_value = {'x-api-key': 'xyz'}
-    return client
+    client.get_httpx_client.return_value = httpx.Client()
+    yield client
+    client.get_httpx_client.return_value.close()
 
 
 @pytest.fixture
@@ -107,6 +112,30 @@ def test_upload_file_should_upload_the_file(client, httpx_mock):
     assert body.find('foobar') != -1
 
 
+def test_upload_file_should_stream_file_from_chunked_file_reader(client, httpx_mock, tmp_path):
+    # arrange
+    httpx_mock.add_response(method='POST',
+                            url='https://mlaide.com/projects/pk/artifacts/artifact name/28/files?file-hash=111',
+                            status_code=204)
+    path = tmp_path / 'model.bin'
+    path.write_bytes(b'\0' * 3000)
+
+    # act
+    with ChunkedFileReader(path.open('rb'), chunk_size=1024) as file:
+        artifact_api.upload_file(client=client,
+                                 project_key='pk',
+                                 artifact_name='artifact name',
+                                 artifact_version=28,
+                                 filename='model.bin',
+                                 file_hash='111',
+                                 file=file)
+
+        # assert
+        request = httpx_mock.get_request()
+        assert int(request.headers['Content-Length']) > 3000
+        assert request.read().count(b'\0') == 3000
+
+
 def test_upload_file_should_assert_status_code500(client, httpx_mock, assert_response_status_mock):
     # arrange
     httpx_mock.add_response(method='POST',
@@ -129,6 +158,65 @@ def test_upload_file_should_assert_status_code500(client, httpx_mock, assert_res
     assert_response_status_mock.assert_called_once()
 
 
+def test_create_upload_should_return_created_upload(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='POST',
+                            url='https://mlaide.com/projects/pk/artifacts/artifact name/28/uploads',
+                            match_headers=client.get_headers(),
+                            match_content=b'{"fileName": "model.bin", "fileHash": "abc", "fileSize": 10, "partSize": 4}',
+                            json={'uploadId': 'u1'})
+
+    # act
+    upload = artifact_api.create_upload(client=client,
+                                        project_key='pk',
+                                        artifact_name='artifact name',
+                                        artifact_version=28,
+                                        upload=UploadDto(file_name='model.bin', file_hash='abc', file_size=10,
+                                                         part_size=4))
+
+    # assert
+    assert upload == UploadDto(upload_id='u1')
+
+
+def test_get_upload_should_return_none_if_upload_does_not_exist(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='GET',
+                            url='https://mlaide.com/projects/pk/artifacts/artifact name/28/uploads/u1',
+                            status_code=404)
+
+    # act
+    upload = artifact_api.get_upload(client=client,
+                                     project_key='pk',
+                                     artifact_name='artifact name',
+                                     artifact_version=28,
+                                     upload_id='u1')
+
+    # assert
+    assert upload is None
+
+
+def test_upload_part_should_send_part_with_its_hash(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='PUT',
+                            url='https://mlaide.com/projects/pk/artifacts/artifact name/28/uploads/u1/parts/3'
+                                '?part-hash=111',
+                            match_content=b'foobar',
+                            status_code=204)
+
+    # act
+    artifact_api.upload_part(client=client,
+                             project_key='pk',
+                             artifact_name='artifact name',
+                             artifact_version=28,
+                             upload_id='u1',
+                             part_index=3,
+                             part_hash='111',
+                             content=b'foobar')
+
+    # assert
+    assert httpx_mock.get_request().headers['Content-Type'] == 'application/octet-stream'
+
+
 def test_get_artifact_should_return_artifact(client, httpx_mock):
     # arrange
     httpx_mock.add_response(method='GET',
@@ -145,6 +233,39 @@ def test_get_artifact_should_return_artifact(client, httpx_mock):
     assert artifact.name == 'artifact name'
 
 
+def test_get_artifact_if_modified_should_return_artifact_and_etag(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='GET',
+                            url='https://mlaide.com/projects/pk/artifacts/a/latest?model-stage=PRODUCTION',
+                            headers={'ETag': '"v2"'},
+                            json={'name': 'a', 'version': 2})
+
+    # act
+    artifact, etag = artifact_api.get_artifact_if_modified(client=client, project_key='pk', artifact_name='a',
+                                                           artifact_version=None, model_stage='PRODUCTION')
+
+    # assert
+    assert artifact.version == 2
+    assert etag == '"v2"'
+    assert 'If-None-Match' not in httpx_mock.get_request().headers
+
+
+def test_get_artifact_if_modified_should_return_none_if_artifact_was_not_modified(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='GET',
+                            url='https://mlaide.com/projects/pk/artifacts/a/latest',
+                            match_headers={'If-None-Match': '"v2"'},
+                            status_code=304)
+
+    # act
+    artifact, etag = artifact_api.get_artifact_if_modified(client=client, project_key='pk', artifact_name='a',
+                                                           artifact_version=None, etag='"v2"')
+
+    # assert
+    assert artifact is None
+    assert etag == '"v2"'
+
+
 def test_get_artifact_should_assert_status_code(client, httpx_mock, assert_response_status_mock):
     # arrange
     httpx_mock.add_response(method='GET',
@@ -179,6 +300,51 @@ def test_download_artifact_should_return_artifact_bytes(client, httpx_mock):
     assert file.read().decode('utf-8') == 'file content'
 
 
+def test_download_file_should_return_file_bytes(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='GET',
+                            url='https://mlaide.com/projects/pk/artifacts/a/12/files/file-id',
+                            match_headers={'x-api-key': 'xyz'},
+                            data=b'file content')
+
+    # act
+    file = artifact_api.download_file(client=client, project_key='pk', artifact_name='a', artifact_version=12,
+                                      file_id='file-id')
+
+    # assert
+    assert file.read() == b'file content'
+
+
+def test_download_file_should_return_none_if_file_does_not_exist(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='GET',
+                            url='https://mlaide.com/projects/pk/artifacts/a/12/files/file-id',
+                            status_code=404)
+
+    # act
+    file = artifact_api.download_file(client=client, project_key='pk', artifact_name='a', artifact_version=12,
+                                      file_id='file-id')
+
+    # assert
+    assert file is None
+
+
+def test_download_artifact_should_spool_large_artifact_to_temporary_file(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='GET',
+                            url='https://mlaide.com/projects/pk/artifacts/a/12/files',
+                            headers={'Content-Disposition': 'attachment; filename="artifact-12.zip"'},
+                            data=b'x' * 100)
+
+    # act
+    file, filename = artifact_api.download_artifact(client=client, project_key='pk', artifact_name='a',
+                                                    artifact_version=12, max_memory_size=10)
+
+    # assert
+    assert not isinstance(file, BytesIO)
+    assert file.read() == b'x' * 100
+
+
 def test_download_artifact_assert_status_code(client, httpx_mock, assert_response_status_mock):
     # arrange
     httpx_mock.add_response(method='GET',
@@ -1,4 +1,5 @@
 from pytest_mock.plugin import MockerFixture
+import httpx
 import pytest
 
 import mlaide._api_client.api.experiment_api as experiment_api
@@ -10,7 +11,9 @@ def client(mocker: MockerFixture):
     client = mocker.patch('mlaide._api_client.api.experiment_api.Client')()
     client.base_url = 'https://mlaide.com'
     client.get_headers.return_value = {'x-api-key': 'xyz'}
-    return client
+    client.get_httpx_client.return_value = httpx.Client()
+    yield client
+    client.get_httpx_client.return_value.close()
 
 
 @pytest.fixture
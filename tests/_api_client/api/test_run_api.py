@@ -1,4 +1,5 @@
 from pytest_mock.plugin import MockerFixture
+import httpx
 import pytest
 
 import mlaide._api_client.api.run_api as run_api
@@ -9,7 +10,10 @@ def client(mocker: MockerFixture):
     client = mocker.patch('mlaide._api_client.api.run_api.Client')()
     client.base_url = 'https://mlaide.com'
     client.get_headers.return_value = {'x-api-key': 'xyz'}
-    return client
+    client.get_httpx_client.return_value = httpx.Client()
+    client.max_payload_size = 1024
+    yield client
+    client.get_httpx_client.return_value.close()
 
 
 @pytest.fixture
@@ -156,3 +160,36 @@ def test_update_run_metrics_should_assert_status_code(client, httpx_mock, assert
 
     # assert
     assert_response_status_mock.assert_called_once()
+
+
+def test_update_run_metrics_should_send_one_request_per_chunk_if_payload_is_too_large(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='PATCH',
+                            url='https://mlaide.com/projects/project key/runs/38/metrics',
+                            status_code=204)
+    client.max_payload_size = 40
+
+    metrics = {'a': 'x' * 20, 'b': 'y' * 20, 'c': 1}
+
+    # act
+    run_api.update_run_metrics(client=client, project_key='project key', run_key=38, metrics=metrics)
+
+    # assert
+    contents = [request.read() for request in httpx_mock.get_requests()]
+    assert contents == [b'{"a": "xxxxxxxxxxxxxxxxxxxx"}', b'{"b": "yyyyyyyyyyyyyyyyyyyy", "c": 1}']
+
+
+def test_update_run_parameters_should_send_one_request_per_chunk_if_payload_is_too_large(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='PATCH',
+                            url='https://mlaide.com/projects/project key/runs/38/parameters',
+                            status_code=204)
+    client.max_payload_size = 20
+
+    parameters = {'a': 1, 'b': 2, 'c': 3, 'd': 4}
+
+    # act
+    run_api.update_run_parameters(client=client, project_key='project key', run_key=38, parameters=parameters)
+
+    # assert
+    assert len(httpx_mock.get_requests()) == 2
@@ -0,0 +1,143 @@
+from pytest_mock.plugin import MockerFixture
+from io import BytesIO
+import asyncio
+import httpx
+import pytest
+
+import mlaide._api_client.async_api.artifact_api as artifact_api
+
+
+@pytest.fixture
+def client(mocker: MockerFixture):
+    client = mocker.patch('mlaide._api_client.async_api.artifact_api.Client')()
+    client.base_url = 'https://mlaide.com'
+    client.get_headers.return_value = {'x-api-key': 'xyz'}
+    httpx_clients = []
+
+    def get_async_httpx_client():
+        httpx_clients.append(httpx.AsyncClient())
+        return httpx_clients[-1]
+
+    client.get_async_httpx_client.side_effect = get_async_httpx_client
+    yield client
+
+    async def close_httpx_clients():
+        for httpx_client in httpx_clients:
+            await httpx_client.aclose()
+
+    asyncio.run(close_httpx_clients())
+
+
+def test_create_artifact_should_create_new_artifact(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='POST',
+                            url='https://mlaide.com/projects/pk/artifacts?run-key=2',
+                            match_headers=client.get_headers(),
+                            match_content=b'{"name": "artifact name"}',
+                            json={'name': 'saved'})
+    artifact = artifact_api.ArtifactDto(name='artifact name')
+
+    # act
+    created_artifact = asyncio.run(
+        artifact_api.create_artifact(client=client, project_key='pk', artifact=artifact, run_key=2))
+
+    # assert
+    assert created_artifact.name == 'saved'
+
+
+def test_upload_file_should_upload_the_file(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='POST',
+                            url='https://mlaide.com/projects/pk/artifacts/artifact name/28/files?file-hash=111',
+                            match_headers=client.get_headers(),
+                            status_code=204)
+    file = BytesIO(bytes('foobar', 'utf-8'))
+
+    # act
+    asyncio.run(artifact_api.upload_file(client=client,
+                                         project_key='pk',
+                                         artifact_name='artifact name',
+                                         artifact_version=28,
+                                         filename='my-file.txt',
+                                         file_hash='111',
+                                         file=file))
+
+    # assert
+    body = httpx_mock.get_request().read().decode('utf-8')
+    assert body.find('Content-Disposition: form-data; name="file"; filename="my-file.txt"') != -1
+    assert body.find('foobar') != -1
+
+
+def test_upload_file_should_stream_local_file_in_multipart_body(client, httpx_mock, tmp_path):
+    # arrange
+    httpx_mock.add_response(method='POST',
+                            url='https://mlaide.com/projects/pk/artifacts/artifact name/28/files?file-hash=111',
+                            status_code=204)
+    (tmp_path / 'my-file.txt').write_bytes(b'foobar')
+
+    # act
+    with open(tmp_path / 'my-file.txt', 'rb') as file:
+        asyncio.run(artifact_api.upload_file(client=client,
+                                             project_key='pk',
+                                             artifact_name='artifact name',
+                                             artifact_version=28,
+                                             filename='my-file.txt',
+                                             file_hash='111',
+                                             file=file))
+
+        # assert
+        request = httpx_mock.get_request()
+        body = asyncio.run(request.aread())
+    boundary = request.headers['Content-Type'].split('boundary=')[1]
+    assert body == (f'--{boundary}\r\n'
+                    'Content-Disposition: form-data; name="file"; filename="my-file.txt"\r\n'
+                    'Content-Type: text/plain\r\n\r\n'
+                    'foobar'
+                    f'\r\n--{boundary}--\r\n').encode('ascii')
+    assert request.headers['Content-Length'] == str(len(body))
+
+
+def test_get_artifact_should_return_artifact(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='GET',
+                            url='https://mlaide.com/projects/pk/artifacts/a/latest?model-stage=PRODUCTION',
+                            match_headers=client.get_headers(),
+                            json={'name': 'artifact name'})
+
+    # act
+    artifact = asyncio.run(artifact_api.get_artifact(client=client, project_key='pk', artifact_name='a',
+                                                     artifact_version=None, model_stage='PRODUCTION'))
+
+    # assert
+    assert artifact.name == 'artifact name'
+
+
+def test_download_artifact_should_return_artifact_bytes(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='GET',
+                            url='https://mlaide.com/projects/pk/artifacts/a/12/files',
+                            match_headers={'x-api-key': 'xyz', 'Accepts': 'application/zip'},
+                            headers={'Content-Disposition': 'attachment; filename="artifact-12.zip"'},
+                            data=b'file content')
+
+    # act
+    file, filename = asyncio.run(
+        artifact_api.download_artifact(client=client, project_key='pk', artifact_name='a', artifact_version=12))
+
+    # assert
+    assert filename == 'artifact-12.zip'
+    assert file.read() == b'file content'
+
+
+def test_find_artifact_by_file_hashes_should_return_none_if_not_found(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='POST',
+                            url='https://mlaide.com/projects/pk/artifacts/a/find-by-file-hashes',
+                            status_code=404)
+
+    # act
+    artifact = asyncio.run(artifact_api.find_artifact_by_file_hashes(
+        client=client, project_key='pk', artifact_name='a', files=[artifact_api.FileHashDto('f.txt', '123')]))
+
+    # assert
+    assert artifact is None
@@ -0,0 +1,57 @@
+from pytest_mock.plugin import MockerFixture
+import asyncio
+import httpx
+import pytest
+
+import mlaide._api_client.async_api.experiment_api as experiment_api
+from mlaide._api_client.dto import ExperimentDto
+
+
+@pytest.fixture
+def client(mocker: MockerFixture):
+    client = mocker.patch('mlaide._api_client.async_api.experiment_api.Client')()
+    client.base_url = 'https://mlaide.com'
+    client.get_headers.return_value = {'x-api-key': 'xyz'}
+    httpx_clients = []
+
+    def get_async_httpx_client():
+        httpx_clients.append(httpx.AsyncClient())
+        return httpx_clients[-1]
+
+    client.get_async_httpx_client.side_effect = get_async_httpx_client
+    yield client
+
+    async def close_httpx_clients():
+        for httpx_client in httpx_clients:
+            await httpx_client.aclose()
+
+    asyncio.run(close_httpx_clients())
+
+
+def test_create_experiment_should_create_and_return_new_experiment(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='POST',
+                            url='https://mlaide.com/projects/pk/experiments',
+                            match_headers=client.get_headers(),
+                            match_content=b'{"name": "exp"}',
+                            json={'key': 'exp-key', 'name': 'exp'})
+
+    # act
+    experiment = asyncio.run(experiment_api.create_experiment(client=client, project_key='pk',
+                                                              experiment=ExperimentDto(name='exp')))
+
+    # assert
+    assert experiment.key == 'exp-key'
+
+
+def test_get_experiment_should_return_none_if_experiment_does_not_exist(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='GET',
+                            url='https://mlaide.com/projects/pk/experiments/exp-key',
+                            status_code=404)
+
+    # act
+    experiment = asyncio.run(experiment_api.get_experiment(client=client, project_key='pk', experiment_key='exp-key'))
+
+    # assert
+    assert experiment is None
@@ -0,0 +1,147 @@
+from pytest_mock.plugin import MockerFixture
+import asyncio
+import httpx
+import pytest
+
+import mlaide._api_client.async_api.run_api as run_api
+
+
+@pytest.fixture
+def client(mocker: MockerFixture):
+    client = mocker.patch('mlaide._api_client.async_api.run_api.Client')()
+    client.base_url = 'https://mlaide.com'
+    client.get_headers.return_value = {'x-api-key': 'xyz'}
+    httpx_clients = []
+
+    def get_async_httpx_client():
+        httpx_clients.append(httpx.AsyncClient())
+        return httpx_clients[-1]
+
+    client.get_async_httpx_client.side_effect = get_async_httpx_client
+    client.max_payload_size = 1024
+    yield client
+
+    async def close_httpx_clients():
+        for httpx_client in httpx_clients:
+            await httpx_client.aclose()
+
+    asyncio.run(close_httpx_clients())
+
+
+@pytest.fixture
+def assert_response_status_mock(mocker: MockerFixture):
+    return mocker.patch('mlaide._api_client.async_api.run_api.assert_response_status')
+
+
+def test_create_run_should_create_and_return_new_run(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='POST',
+                            url='https://mlaide.com/projects/project key/runs',
+                            match_headers=client.get_headers(),
+                            match_content=b'{"name": "run name"}',
+                            json={'name': 'saved'})
+
+    run = run_api.RunDto(name='run name')
+
+    # act
+    saved_run = asyncio.run(run_api.create_run(client=client, project_key='project key', run=run))
+
+    # assert
+    assert saved_run.name == 'saved'
+    assert httpx_mock.get_request() is not None
+
+
+def test_create_run_should_assert_status_code(client, httpx_mock, assert_response_status_mock):
+    # arrange
+    httpx_mock.add_response(method='POST',
+                            url='https://mlaide.com/projects/project key/runs',
+                            status_code=500,
+                            json={'code': 500, 'message': 'error'})
+
+    run = run_api.RunDto(name='run name')
+
+    # act
+    asyncio.run(run_api.create_run(client=client, project_key='project key', run=run))
+
+    # assert
+    assert_response_status_mock.assert_called_once()
+
+
+def test_partial_update_run_should_update_run(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='PATCH',
+                            url='https://mlaide.com/projects/project key/runs/38',
+                            match_headers={'x-api-key': 'xyz', 'content-type': 'application/merge-patch+json'},
+                            match_content=b'{"name": "run name"}',
+                            status_code=204)
+
+    run = run_api.RunDto(name='run name')
+
+    # act
+    asyncio.run(run_api.partial_update_run(client=client, project_key='project key', run_key=38, run=run))
+
+    # assert
+    assert httpx_mock.get_request() is not None
+
+
+def test_update_run_parameters_should_update_run_parameters(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='PATCH',
+                            url='https://mlaide.com/projects/project key/runs/38/parameters',
+                            match_headers={'x-api-key': 'xyz', 'content-type': 'application/merge-patch+json'},
+                            match_content=b'{"foo": "bar"}',
+                            status_code=204)
+
+    # act
+    asyncio.run(run_api.update_run_parameters(client=client, project_key='project key', run_key=38,
+                                              parameters={'foo': 'bar'}))
+
+    # assert
+    assert httpx_mock.get_request() is not None
+
+
+def test_update_run_metrics_should_update_run_metrics(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='PATCH',
+                            url='https://mlaide.com/projects/project key/runs/38/metrics',
+                            match_headers={'x-api-key': 'xyz', 'content-type': 'application/merge-patch+json'},
+                            match_content=b'{"foo": "bar"}',
+                            status_code=204)
+
+    # act
+    asyncio.run(run_api.update_run_metrics(client=client, project_key='project key', run_key=38,
+                                           metrics={'foo': 'bar'}))
+
+    # assert
+    assert httpx_mock.get_request() is not None
+
+
+def test_update_run_metrics_should_send_one_request_per_chunk_if_payload_is_too_large(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='PATCH',
+                            url='https://mlaide.com/projects/project key/runs/38/metrics',
+                            status_code=204)
+    client.max_payload_size = 40
+
+    metrics = {'a': 'x' * 20, 'b': 'y' * 20}
+
+    # act
+    asyncio.run(run_api.update_run_metrics(client=client, project_key='project key', run_key=38, metrics=metrics))
+
+    # assert
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_attach_artifact_to_run_should_attach_artifact(client, httpx_mock):
+    # arrange
+    httpx_mock.add_response(method='PUT',
+                            url='https://mlaide.com/projects/project key/runs/38/artifacts/my-artifact/2',
+                            match_headers={'x-api-key': 'xyz'},
+                            status_code=204)
+
+    # act
+    asyncio.run(run_api.attach_artifact_to_run(client=client, project_key='project key', run_key=38,
+                                               artifact_name='my-artifact', artifact_version=2))
+
+    # assert
+    assert httpx_mock.get_request() is not None
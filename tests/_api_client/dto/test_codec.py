@@ -0,0 +1,86 @@
+from datetime import datetime, timezone
+
+import pytest
+from dataclasses_json import DataClassJsonMixin
+
+from mlaide._api_client.dto import ArtifactDto, ExperimentDto, GitDto, RunDto, StatusDto, UploadDto, UploadPartDto
+from mlaide._api_client.dto.artifact_dto import ArtifactFileDto, ModelDto, ModelRevisionDto
+from mlaide._api_client.dto.artifact_ref_dto import ArtifactRefDto
+from mlaide._api_client.dto.experiment_ref_dto import ExperimentRefDto
+from mlaide._api_client.dto import codec
+
+now = datetime(2021, 3, 4, 5, 6, 7, 890000, tzinfo=timezone.utc)
+
+dtos = [
+    RunDto(created_at=now,
+           created_by={'userId': 'u1'},
+           end_time=None,
+           experiment_refs=[ExperimentRefDto('exp-1')],
+           git=GitDto(is_dirty=True, commit_time=now, commit_hash='abc', repository_uri='git@host:repo.git'),
+           key=3,
+           metrics={'acc': 0.9, 'loss': [1.0, 0.5]},
+           name='run',
+           parameters={'lr': 0.1},
+           start_time=now,
+           status=StatusDto.RUNNING,
+           used_artifacts=[ArtifactRefDto('data', 1), ArtifactRefDto('model', None)]),
+    ArtifactDto(created_at=now,
+                files=[ArtifactFileDto('f1', 'model.pkl')],
+                metadata={'key': 'value'},
+                model=ModelDto(created_at=now,
+                               model_revisions=[ModelRevisionDto('PRODUCTION', 'NONE', created_at=now, note='n')],
+                               stage='PRODUCTION'),
+                name='model',
+                type='model',
+                version=2),
+    ExperimentDto(key='exp', name='experiment', tags=['a', 'b'], created_at=now),
+    UploadDto(upload_id='u', file_name='f', parts=[UploadPartDto(0, 'hash')]),
+    RunDto()
+]
+
+
+@pytest.mark.parametrize('dto', dtos)
+def test_encode_should_return_same_dict_as_dataclasses_json(dto):
+    # act
+    d = codec.encode(dto)
+
+    # assert
+    assert d == dto.to_dict()
+
+
+@pytest.mark.parametrize('dto', dtos)
+def test_to_dict_without_none_values_should_remove_top_level_none_values(dto):
+    # act
+    d = dto.to_dict_without_none_values()
+
+    # assert
+    assert d == {k: v for k, v in dto.to_dict().items() if v is not None}
+
+
+@pytest.mark.parametrize('dto', dtos)
+def test_from_dict_should_return_same_dto_as_dataclasses_json(dto):
+    # arrange
+    d = dto.to_dict()
+    d['unknownField'] = 'ignored'
+
+    # act
+    decoded = type(dto).from_dict(d)
+
+    # assert
+    assert decoded == DataClassJsonMixin.from_dict.__func__(type(dto), d)
+    assert decoded == dto
+
+
+def test_from_dict_should_use_defaults_for_missing_fields():
+    # act
+    run = RunDto.from_dict({'name': 'run', 'status': 'FAILED', 'startTime': '2021-03-04T05:06:07.890000+00:00'})
+
+    # assert
+    assert run == RunDto(name='run', status=StatusDto.FAILED, start_time=now)
+    assert isinstance(run.status, StatusDto)
+
+
+def test_from_dict_should_raise_error_for_missing_required_fields():
+    # act & assert
+    with pytest.raises(TypeError):
+        RunDto.from_dict({'git': {'commitHash': 'abc'}})
@@ -0,0 +1,268 @@
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+from mlaide._api_client._transport import instrument
+from mlaide._api_client.api import experiment_api
+from mlaide._api_client.async_api import experiment_api as async_experiment_api
+from mlaide._api_client.client import Client, AuthenticatedClient
+from mlaide._api_client.dto import ExperimentDto
+from mlaide.error import ServerError
+
+EXPERIMENT = b'{"key": "exp-1", "name": "Experiment"}'
+
+
+class StubExperimentServer(object):
+    """Serves experiments on localhost, so that requests pass through the transport of the client"""
+
+    def __init__(self):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                self.__respond(200 if self.path.endswith('exp-1') else 500)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                self.__respond(200)
+
+            def __respond(self, status: int):
+                body = EXPERIMENT if status == 200 else b''
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.__http_server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}'.format(self.__http_server.server_address[1])
+        threading.Thread(target=self.__http_server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def shutdown(self):
+        self.__http_server.shutdown()
+        self.__http_server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubExperimentServer()
+    yield server
+    server.shutdown()
+
+
+def test_get_httpx_client_should_return_same_client_for_every_call():
+    # arrange
+    client = Client(base_url='https://mlaide.com')
+
+    # act
+    first = client.get_httpx_client()
+    second = client.get_httpx_client()
+
+    # assert
+    assert first is second
+    client.close()
+
+
+def test_get_httpx_client_should_create_only_one_client_when_called_concurrently():
+    # arrange
+    client = Client(base_url='https://mlaide.com')
+
+    # act
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        httpx_clients = list(executor.map(lambda _: client.get_httpx_client(), range(32)))
+
+    # assert
+    assert all(c is httpx_clients[0] for c in httpx_clients)
+    client.close()
+
+
+def test_get_httpx_client_should_use_configured_timeout():
+    # arrange
+    client = Client(base_url='https://mlaide.com', timeout=2.5)
+
+    # act
+    httpx_client = client.get_httpx_client()
+
+    # assert
+    assert httpx_client.timeout.connect == 2.5
+    assert httpx_client.timeout.read == 2.5
+    client.close()
+
+
+def test_close_should_close_httpx_client_and_create_new_one_on_next_use():
+    # arrange
+    client = Client(base_url='https://mlaide.com')
+    first = client.get_httpx_client()
+
+    # act
+    client.close()
+
+    # assert
+    assert first.is_closed
+    assert client.get_httpx_client() is not first
+    client.close()
+
+
+def test_exit_context_manager_should_close_httpx_client():
+    # act
+    with AuthenticatedClient(base_url='https://mlaide.com', api_key='xyz') as client:
+        httpx_client = client.get_httpx_client()
+
+    # assert
+    assert httpx_client.is_closed
+
+
+def test_exit_async_context_manager_should_close_async_httpx_client():
+    # arrange
+    async def use_client():
+        async with Client(base_url='https://mlaide.com') as client:
+            return client.get_async_httpx_client()
+
+    # act
+    async_httpx_client = asyncio.run(use_client())
+
+    # assert
+    assert async_httpx_client.is_closed
+
+
+def test_authenticated_client_get_headers_should_return_api_key():
+    # arrange
+    client = AuthenticatedClient(base_url='https://mlaide.com', api_key='xyz')
+
+    # act
+    headers = client.get_headers()
+
+    # assert
+    assert headers == {'x-api-key': 'xyz'}
+
+
+def test_get_request_stats_should_contain_requests_per_endpoint(stub_server):
+    # arrange
+    client = Client(base_url=stub_server.url)
+
+    # act
+    experiment_api.get_experiment(client=client, project_key='p', experiment_key='exp-1')
+    experiment_api.get_experiment(client=client, project_key='p', experiment_key='exp-1')
+    experiment_api.create_experiment(client=client, project_key='p', experiment=ExperimentDto(name='exp-1'))
+    client.close()
+
+    # assert
+    stats = client.get_request_stats()
+    get_experiment = stats['experiment_api.get_experiment']
+    assert get_experiment.requests == 2
+    assert get_experiment.errors == 0
+    assert get_experiment.request_bytes == 0
+    assert get_experiment.response_bytes == 2 * len(EXPERIMENT)
+    assert get_experiment.duration.count == 2
+    assert 0 < get_experiment.time_to_first_byte.max <= get_experiment.duration.max
+    assert stats['experiment_api.create_experiment'].request_bytes > 0
+
+
+def test_add_request_listener_should_invoke_listener_with_every_request(stub_server):
+    # arrange
+    client = Client(base_url=stub_server.url)
+    events = []
+    client.add_request_listener(events.append)
+
+    # act
+    experiment_api.get_experiment(client=client, project_key='p', experiment_key='exp-1')
+    with pytest.raises(ServerError):
+        experiment_api.get_experiment(client=client, project_key='p', experiment_key='exp-2')
+    client.close()
+
+    # assert
+    assert [(e.endpoint, e.method, e.status_code, e.failed) for e in events] == [
+        ('experiment_api.get_experiment', 'GET', 200, False),
+        ('experiment_api.get_experiment', 'GET', 500, True)]
+    assert events[0].url == stub_server.url + '/projects/p/experiments/exp-1'
+
+
+def test_request_should_succeed_if_listener_raises_exception(stub_server):
+    # arrange
+    client = Client(base_url=stub_server.url)
+
+    def listener(_):
+        raise RuntimeError('metrics system unavailable')
+
+    client.add_request_listener(listener)
+
+    # act
+    result = experiment_api.get_experiment(client=client, project_key='p', experiment_key='exp-1')
+    client.close()
+
+    # assert
+    assert result.name == 'Experiment'
+    assert client.get_request_stats()['experiment_api.get_experiment'].requests == 1
+
+
+def test_get_request_stats_should_count_failed_connections_as_errors(stub_server):
+    # arrange
+    url = stub_server.url
+    stub_server.shutdown()
+    client = Client(base_url=url)
+    events = []
+    client.add_request_listener(events.append)
+
+    # act
+    with pytest.raises(httpx.ConnectError):
+        experiment_api.get_experiment(client=client, project_key='p', experiment_key='exp-1')
+    client.close()
+
+    # assert
+    assert client.get_request_stats()['experiment_api.get_experiment'].errors == 1
+    assert events[0].error == 'ConnectError'
+    assert events[0].status_code is None
+
+
+def test_get_request_stats_should_contain_requests_of_async_endpoints(stub_server):
+    # arrange
+    async def get_experiments(client: Client):
+        async with client:
+            await asyncio.gather(*[async_experiment_api.get_experiment(client=client, project_key='p',
+                                                                       experiment_key='exp-1') for _ in range(3)])
+
+    client = Client(base_url=stub_server.url)
+
+    # act
+    asyncio.run(get_experiments(client))
+
+    # assert
+    stats = client.get_request_stats()['experiment_api.get_experiment']
+    assert stats.requests == 3
+    assert stats.response_bytes == 3 * len(EXPERIMENT)
+
+
+def test_get_request_stats_should_contain_requests_sent_through_proxy_from_environment(stub_server, monkeypatch):
+    # arrange
+    for name in ('ALL_PROXY', 'all_proxy', 'NO_PROXY', 'no_proxy', 'http_proxy'):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv('HTTP_PROXY', stub_server.url)
+    client = Client(base_url='http://mlaide.invalid')
+
+    # act
+    result = experiment_api.get_experiment(client=client, project_key='p', experiment_key='exp-1')
+    client.close()
+
+    # assert
+    assert result.name == 'Experiment'
+    stats = client.get_request_stats()['experiment_api.get_experiment']
+    assert stats.requests == 1
+    assert stats.response_bytes == len(EXPERIMENT)
+
+
+def test_instrument_should_return_client_unchanged_if_httpx_has_no_transport_attributes(mocker):
+    # arrange
+    httpx_client = mocker.Mock(spec=['request', 'close'])
+
+    # act
+    result = instrument(httpx_client, lambda event: None)
+
+    # assert
+    assert result is httpx_client
+    assert not hasattr(result, '_transport')
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from mlaide._api_client._instrumentation import RequestStats, current_endpoint, endpoint, UNKNOWN_ENDPOINT
+from mlaide.model import LatencyHistogram, RequestEvent
+
+
+@endpoint
+def get_something():
+    return current_endpoint()
+
+
+@endpoint
+async def get_something_async():
+    await asyncio.sleep(0)
+    return current_endpoint()
+
+
+def test_endpoint_should_name_requests_of_decorated_function_by_module_and_function():
+    # act
+    result = get_something()
+
+    # assert
+    assert result == 'test_instrumentation.get_something'
+    assert current_endpoint() == UNKNOWN_ENDPOINT
+
+
+def test_endpoint_should_name_requests_of_decorated_coroutine_function():
+    # act
+    result = asyncio.run(get_something_async())
+
+    # assert
+    assert result == 'test_instrumentation.get_something_async'
+
+
+def test_add_should_aggregate_requests_per_endpoint():
+    # arrange
+    stats = RequestStats()
+
+    # act
+    stats.add(RequestEvent(endpoint='run_api.create_run', method='POST', url='u', status_code=200,
+                           request_bytes=10, response_bytes=100, time_to_first_byte=0.01, duration=0.02))
+    stats.add(RequestEvent(endpoint='run_api.create_run', method='POST', url='u', status_code=500,
+                           request_bytes=20, response_bytes=5, time_to_first_byte=0.03, duration=0.04))
+    stats.add(RequestEvent(endpoint='run_api.create_run', method='POST', url='u', duration=1.0,
+                           error='ConnectError'))
+    stats.add(RequestEvent(endpoint='experiment_api.get_experiment', method='GET', url='u', status_code=404,
+                           time_to_first_byte=0.01, duration=0.01))
+
+    # assert
+    result = stats.snapshot()
+    create_run = result['run_api.create_run']
+    assert create_run.requests == 3
+    assert create_run.errors == 2
+    assert create_run.request_bytes == 30
+    assert create_run.response_bytes == 105
+    assert create_run.time_to_first_byte.count == 2
+    assert create_run.duration.count == 3
+    assert create_run.duration.max == 1.0
+    assert result['experiment_api.get_experiment'].errors == 1
+
+
+def test_snapshot_should_return_copy_and_start_over_if_reset():
+    # arrange
+    stats = RequestStats()
+    stats.add(RequestEvent(endpoint='e', method='GET', url='u', status_code=200, duration=0.1))
+    copied = stats.snapshot()
+    stats.add(RequestEvent(endpoint='e', method='GET', url='u', status_code=200, duration=0.1))
+
+    # act
+    result = stats.snapshot(reset=True)
+
+    # assert
+    assert copied['e'].requests == 1
+    assert result['e'].requests == 2
+    assert stats.snapshot() == {}
+
+
+@pytest.mark.parametrize('percent, expected', [(0, 0.001), (50, 0.0015), (100, 0.1)])
+def test_percentile_should_interpolate_within_bucket(percent: float, expected: float):
+    # arrange
+    histogram = LatencyHistogram()
+    for latency in [0.001, 0.0015, 0.002, 0.1]:
+        histogram.add(latency)
+
+    # act
+    result = histogram.percentile(percent)
+
+    # assert
+    assert result == pytest.approx(expected)
+
+
+def test_percentile_should_return_none_for_empty_histogram():
+    assert LatencyHistogram().percentile(50) is None
+    assert LatencyHistogram().mean is None
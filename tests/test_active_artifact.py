@@ -1,11 +1,17 @@
 from pytest_mock.plugin import MockerFixture
-from zipfile import ZipInfo
+from zipfile import ZipFile, ZipInfo
+import cloudpickle
 import pytest
+import gzip
+import pickle
+import mmap
 import io
 
 from mlaide import ModelStage
+from mlaide._artifact_cache import ArtifactCache
 from mlaide.active_artifact import ActiveArtifact, Artifact
 from mlaide._api_client.dto import ArtifactDto
+from mlaide.model import ArtifactFile
 
 
 @pytest.fixture
@@ -61,7 +67,7 @@ def test_download_should_download_and_extract_zip_file(active_artifact_with_load
                                                        download_artifact_mock,
                                                        mocker: MockerFixture):
     # arrange
-    zip_mock = mocker.patch('mlaide.active_artifact.ZipFile')
+    zip_mock = mocker.patch('mlaide._compression.ZipFile')
     zip_object = zip_mock.return_value.__enter__()
 
     zip_bytes = io.BytesIO(initial_bytes=bytes('abc', 'utf-8'))
@@ -82,7 +88,7 @@ def test_download_should_cache_downloaded_file_and_download_only_once(
         download_artifact_mock,
         mocker: MockerFixture):
     # arrange
-    zip_mock = mocker.patch('mlaide.active_artifact.ZipFile')
+    zip_mock = mocker.patch('mlaide._compression.ZipFile')
 
     zip_bytes = io.BytesIO(initial_bytes=bytes('abc', 'utf-8'))
     download_artifact_mock.return_value = (zip_bytes, 'artifact.zip')
@@ -95,3 +101,232 @@ def test_download_should_cache_downloaded_file_and_download_only_once(
     download_artifact_mock.assert_called_once()
     assert zip_mock.call_count == 2
     assert zip_mock.call_args_list == [mocker.call(zip_bytes), mocker.call(zip_bytes)]
+
+
+@pytest.fixture
+def download_file_mock(mocker: MockerFixture):
+    return mocker.patch('mlaide.active_artifact.artifact_api.download_file')
+
+
+def test_load_should_download_only_the_requested_file(client_mock,
+                                                      get_artifact_mock,
+                                                      mapper_dto_to_artifact,
+                                                      download_file_mock,
+                                                      download_artifact_mock):
+    # arrange
+    mapper_dto_to_artifact.return_value = Artifact(name='a name', version=1, files=[
+        ArtifactFile(file_id='id-1', file_name='data.csv'),
+        ArtifactFile(file_id='id-2', file_name='schema.json')])
+    active_artifact = ActiveArtifact(api_client=client_mock.return_value, project_key='project key',
+                                     artifact_name='a name', artifact_version=1)
+    download_file_mock.return_value = io.BytesIO(b'{}')
+
+    # act
+    file = active_artifact.load('schema.json')
+
+    # assert
+    assert file.read() == b'{}'
+    download_file_mock.assert_called_once_with(client=client_mock.return_value,
+                                               project_key='project key',
+                                               artifact_name='a name',
+                                               artifact_version=1,
+                                               file_id='id-2')
+    download_artifact_mock.assert_not_called()
+
+
+def test_load_and_download_should_decompress_files_of_compressed_artifact(client_mock,
+                                                                         get_artifact_mock,
+                                                                         mapper_dto_to_artifact,
+                                                                         download_file_mock,
+                                                                         download_artifact_mock,
+                                                                         tmp_path):
+    # arrange
+    mapper_dto_to_artifact.return_value = Artifact(name='a name', version=1, metadata={'mlaide.compression': 'gzip'},
+                                                   files=[ArtifactFile(file_id='id-1', file_name='data.csv')])
+    compressed_content = gzip.compress(b'a,b\n1,2\n')
+    download_file_mock.return_value = io.BytesIO(compressed_content)
+    zip_bytes = io.BytesIO()
+    with ZipFile(zip_bytes, 'w') as z:
+        z.writestr('data.csv', compressed_content)
+    zip_bytes.seek(0)
+    download_artifact_mock.return_value = (zip_bytes, 'artifact.zip')
+    active_artifact = ActiveArtifact(api_client=client_mock.return_value, project_key='project key',
+                                     artifact_name='a name', artifact_version=1)
+
+    # act
+    file = active_artifact.load('data.csv')
+    active_artifact.download(str(tmp_path))
+
+    # assert
+    assert file.read() == b'a,b\n1,2\n'
+    assert (tmp_path / 'data.csv').read_bytes() == b'a,b\n1,2\n'
+
+
+def test_load_should_fall_back_to_zip_if_server_does_not_provide_single_file(client_mock,
+                                                                             get_artifact_mock,
+                                                                             mapper_dto_to_artifact,
+                                                                             download_file_mock,
+                                                                             download_artifact_mock):
+    # arrange
+    mapper_dto_to_artifact.return_value = Artifact(name='a name', version=1, files=[
+        ArtifactFile(file_id='id-2', file_name='schema.json')])
+    active_artifact = ActiveArtifact(api_client=client_mock.return_value, project_key='project key',
+                                     artifact_name='a name', artifact_version=1)
+    download_file_mock.return_value = None
+    zip_bytes = io.BytesIO()
+    with ZipFile(zip_bytes, 'w') as z:
+        z.writestr('schema.json', '{"a": 1}')
+    zip_bytes.seek(0)
+    download_artifact_mock.return_value = (zip_bytes, 'artifact.zip')
+
+    # act
+    file = active_artifact.load('schema.json')
+
+    # assert
+    assert file.read() == b'{"a": 1}'
+    download_artifact_mock.assert_called_once()
+
+
+def test_download_should_download_artifact_only_once_if_artifact_cache_is_used(client_mock,
+                                                                              get_artifact_mock,
+                                                                              mapper_dto_to_artifact,
+                                                                              download_artifact_mock,
+                                                                              download_file_mock,
+                                                                              tmp_path):
+    # arrange
+    mapper_dto_to_artifact.return_value = Artifact(name='a name', version=1, files=[
+        ArtifactFile(file_id='id-1', file_name='data.txt')])
+    zip_bytes = io.BytesIO()
+    with ZipFile(zip_bytes, 'w') as z:
+        z.writestr('data.txt', 'file content')
+    zip_bytes.seek(0)
+    download_artifact_mock.return_value = (zip_bytes, 'artifact.zip')
+    artifact_cache = ArtifactCache(str(tmp_path / 'cache'), max_size=1000)
+
+    def create_active_artifact():
+        return ActiveArtifact(api_client=client_mock.return_value, project_key='project key',
+                              artifact_name='a name', artifact_version=1, artifact_cache=artifact_cache)
+
+    # act
+    create_active_artifact().download(str(tmp_path / 'first'))
+    create_active_artifact().download(str(tmp_path / 'second'))
+    file = create_active_artifact().load('data.txt')
+
+    # assert
+    download_artifact_mock.assert_called_once()
+    download_file_mock.assert_not_called()
+    assert (tmp_path / 'first' / 'data.txt').read_text() == 'file content'
+    assert (tmp_path / 'second' / 'data.txt').read_text() == 'file content'
+    # both downloads are hard links to the cached file
+    assert (tmp_path / 'first' / 'data.txt').stat().st_nlink == 3
+    assert file.read() == b'file content'
+    assert artifact_cache.stats.hits == 2
+
+
+def test_load_model_should_deserialize_model_file(active_artifact_with_loaded_artifact: ActiveArtifact,
+                                                  download_artifact_mock,
+                                                  mocker: MockerFixture):
+    # arrange
+    zip_bytes = io.BytesIO()
+    with ZipFile(zip_bytes, 'w') as z:
+        z.writestr('model.pkl', cloudpickle.dumps({'weights': [1, 2, 3]}))
+    zip_bytes.seek(0)
+    download_artifact_mock.return_value = (zip_bytes, 'artifact.zip')
+
+    # act
+    model = active_artifact_with_loaded_artifact.load_model()
+
+    # assert
+    assert model == {'weights': [1, 2, 3]}
+
+
+def test_load_model_should_memory_map_buffer_files_from_artifact_cache(client_mock,
+                                                                     get_artifact_mock,
+                                                                     mapper_dto_to_artifact,
+                                                                     download_artifact_mock,
+                                                                     tmp_path):
+    # arrange
+    weights = bytearray(b'w' * 5000)
+    buffers = []
+    model_bytes = cloudpickle.dumps({'weights': pickle.PickleBuffer(weights)}, protocol=5,
+                                    buffer_callback=buffers.append)
+    mapper_dto_to_artifact.return_value = Artifact(name='a name', version=1, files=[
+        ArtifactFile(file_id='id-1', file_name='model.pkl'),
+        ArtifactFile(file_id='id-2', file_name='model-buffer-0.bin')])
+    zip_bytes = io.BytesIO()
+    with ZipFile(zip_bytes, 'w') as z:
+        z.writestr('model.pkl', model_bytes)
+        z.writestr('model-buffer-0.bin', buffers[0].raw().tobytes())
+    zip_bytes.seek(0)
+    download_artifact_mock.return_value = (zip_bytes, 'artifact.zip')
+    artifact_cache = ArtifactCache(str(tmp_path / 'cache'), max_size=100_000)
+    active_artifact = ActiveArtifact(api_client=client_mock.return_value, project_key='project key',
+                                     artifact_name='a name', artifact_version=1, artifact_cache=artifact_cache)
+
+    # act
+    model = active_artifact.load_model()
+
+    # assert
+    assert isinstance(model['weights'], mmap.mmap)
+    assert model['weights'][:] == weights
+    download_artifact_mock.assert_called_once()
+
+
+@pytest.fixture
+def get_artifact_if_modified_mock(mocker: MockerFixture):
+    return mocker.patch('mlaide.active_artifact.artifact_api.get_artifact_if_modified')
+
+
+def test_refresh_should_not_check_artifact_that_was_requested_with_version(active_artifact_with_loaded_artifact,
+                                                                           get_artifact_if_modified_mock):
+    # act
+    changed = active_artifact_with_loaded_artifact.refresh()
+
+    # assert
+    assert not changed
+    get_artifact_if_modified_mock.assert_not_called()
+
+
+def test_refresh_should_switch_to_new_version_of_stage(client_mock,
+                                                       get_artifact_mock,
+                                                       get_artifact_if_modified_mock,
+                                                       mocker: MockerFixture):
+    # arrange
+    get_artifact_if_modified_mock.side_effect = [(ArtifactDto(name='a name', version=1), '"v1"'),
+                                                 (ArtifactDto(name='a name', version=2), '"v2"'),
+                                                 (None, '"v2"')]
+    active_artifact = ActiveArtifact(api_client=client_mock.return_value, project_key='project key',
+                                     artifact_name='a name', artifact_version=None,
+                                     model_stage=ModelStage.PRODUCTION)
+
+    # act
+    first_refresh = active_artifact.refresh()
+    second_refresh = active_artifact.refresh()
+
+    # assert
+    assert first_refresh
+    assert not second_refresh
+    assert active_artifact.artifact.version == 2
+    get_artifact_mock.assert_not_called()
+    assert get_artifact_if_modified_mock.call_args_list == [
+        mocker.call(client=client_mock.return_value, project_key='project key', artifact_name='a name',
+                    artifact_version=None, model_stage=ModelStage.PRODUCTION.value),
+        mocker.call(client=client_mock.return_value, project_key='project key', artifact_name='a name',
+                    artifact_version=None, model_stage=ModelStage.PRODUCTION.value, etag='"v1"'),
+        mocker.call(client=client_mock.return_value, project_key='project key', artifact_name='a name',
+                    artifact_version=None, model_stage=ModelStage.PRODUCTION.value, etag='"v2"')]
+
+
+def test_refresh_should_return_false_if_server_returns_same_version(client_mock,
+                                                                    get_artifact_mock,
+                                                                    get_artifact_if_modified_mock):
+    # arrange
+    get_artifact_if_modified_mock.return_value = (ArtifactDto(name='a name', version=1), None)
+    active_artifact = ActiveArtifact(api_client=client_mock.return_value, project_key='project key',
+                                     artifact_name='a name', artifact_version=None)
+
+    # act
+    changed = active_artifact.refresh()
+
+    # assert
+    assert not changed
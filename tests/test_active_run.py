@@ -1,16 +1,25 @@
 from pytest_mock.plugin import MockerFixture
 from datetime import datetime
 from os import path
+import gzip
+import hashlib
+import httpx
+import json
 import pytest
 import io
+from mlaide._api_client.dto.artifact_dto import ArtifactFileDto
 from mlaide._api_client.dto.file_hash_dto import FileHashDto
+from mlaide._api_client.dto.upload_dto import UploadDto, UploadPartDto
 
 from mlaide.active_run import \
-    ActiveRun, get_file_hash, get_file_content, extract_filename, \
+    ActiveRun, get_file_hash, get_file_hashes, get_file_content, extract_filename, \
     ArtifactDto, Artifact, ArtifactRef, \
     Experiment, ExperimentDto, \
     Git, Run, RunDto, RunStatus, \
     StatusDto
+from mlaide.background_writer import BackgroundWriterOptions
+from mlaide.connection_options import ConnectionOptions
+from mlaide.error import ArtifactUploadError
 from mlaide.model import model
 from mlaide.model.in_memory_artifact_file import InMemoryArtifactFile
 from mlaide.model.local_artifact_file import LocalArtifactFile
@@ -150,7 +159,6 @@ def test_log_metric_epoch_should_add_epoch_metric_to_run_and_call_update_on_api(
         'client': client_mock.return_value,
         'metrics': {
             'the-key': {
-                'epoch-1': 'the value',
                 'epoch-2': 'the value'
             }
         },
@@ -162,6 +170,21 @@ def test_log_metric_epoch_should_add_epoch_metric_to_run_and_call_update_on_api(
     assert len(run_api_mock.update_run_metrics.call_args_list) == 2
 
 
+def test_log_metric_epoch_should_replace_scalar_metric_with_epochs(active_run, client_mock, run_api_mock):
+    # arrange
+    active_run.log_metric('the-key', 'scalar value')
+
+    # act
+    run = active_run.log_metric_epoch('the-key', 'epoch-1', 'the value')
+
+    # assert
+    assert run.metrics == {'the-key': {'epoch-1': 'the value'}}
+    run_api_mock.update_run_metrics.assert_called_with(client=client_mock.return_value,
+                                                       project_key='project key',
+                                                       run_key=active_run.run.key,
+                                                       metrics={'the-key': {'epoch-1': 'the value'}})
+
+
 def test_log_parameter_should_add_parameter_to_run_and_call_update_on_api(active_run, client_mock, run_api_mock):
     # arrange
 
@@ -176,6 +199,50 @@ def test_log_parameter_should_add_parameter_to_run_and_call_update_on_api(active
                                                                parameters={'the-key': 3})
 
 
+def test_log_metrics_should_add_all_metrics_to_run_and_call_update_on_api_once(active_run, client_mock, run_api_mock):
+    # act
+    run = active_run.log_metrics({'acc': 0.9, 'loss': 0.1})
+
+    # assert
+    assert run.metrics == {'acc': 0.9, 'loss': 0.1}
+    run_api_mock.update_run_metrics.assert_called_once_with(client=client_mock.return_value,
+                                                            project_key='project key',
+                                                            run_key=active_run.run.key,
+                                                            metrics={'acc': 0.9, 'loss': 0.1})
+
+
+def test_log_metrics_epoch_should_add_epoch_of_all_metrics_and_call_update_on_api_once(active_run,
+                                                                                        client_mock,
+                                                                                        run_api_mock):
+    # arrange
+    active_run.log_metrics_epoch('epoch-1', {'acc': 0.8, 'loss': 0.2})
+
+    # act
+    run = active_run.log_metrics_epoch('epoch-2', {'acc': 0.9, 'loss': 0.1})
+
+    # assert
+    assert run.metrics == {'acc': {'epoch-1': 0.8, 'epoch-2': 0.9}, 'loss': {'epoch-1': 0.2, 'epoch-2': 0.1}}
+    assert run_api_mock.update_run_metrics.call_count == 2
+    run_api_mock.update_run_metrics.assert_called_with(client=client_mock.return_value,
+                                                       project_key='project key',
+                                                       run_key=active_run.run.key,
+                                                       metrics={'acc': {'epoch-2': 0.9}, 'loss': {'epoch-2': 0.1}})
+
+
+def test_log_parameters_should_add_all_parameters_to_run_and_call_update_on_api_once(active_run,
+                                                                                      client_mock,
+                                                                                      run_api_mock):
+    # act
+    run = active_run.log_parameters({'lr': 0.01, 'epochs': 10})
+
+    # assert
+    assert run.parameters == {'lr': 0.01, 'epochs': 10}
+    run_api_mock.update_run_parameters.assert_called_once_with(client=client_mock.return_value,
+                                                               project_key='project key',
+                                                               run_key=active_run.run.key,
+                                                               parameters={'lr': 0.01, 'epochs': 10})
+
+
 def test_log_model_should_create_an_artifact_and_attach_the_serialized_model_as_file(active_run,
                                                                                      client_mock,
                                                                                      artifact_api_mock,
@@ -185,7 +252,7 @@ def test_log_model_should_create_an_artifact_and_attach_the_serialized_model_as_
     # arrange
     serialized_files = [InMemoryArtifactFile('model.pkl', io.BytesIO(bytes('foo', 'utf-8')))]
     model_serializer_mock = mocker.patch('mlaide.active_run._model_deser')
-    model_serializer_mock.serialize.return_value = serialized_files
+    model_serializer_mock.serialize.return_value.__enter__.return_value = serialized_files
 
     get_file_hash_mock = mocker.patch('mlaide.active_run.get_file_hash')
     get_file_hash_mock.return_value = '123456'
@@ -265,6 +332,41 @@ def test_add_artifact_should_create_an_artifact_with_files_from_memory_if_same_a
         file=file_content)
 
 
+def test_add_artifact_should_upload_compressed_files_and_record_codec_in_metadata(client_mock,
+                                                                                 active_run: ActiveRun,
+                                                                                 artifact_api_mock,
+                                                                                 dto_to_artifact_mock):
+    # arrange
+    content = b'feature,label\n' + b'0.5,1\n' * 1000
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = None
+    dto_to_artifact_mock.return_value = Artifact(name='created artifact', version=2)
+    uploaded_files = []
+    artifact_api_mock.upload_file.side_effect = lambda file, **kwargs: uploaded_files.append((kwargs, file.read()))
+
+    artifact = NewArtifact('my artifact', 'dataset', [InMemoryArtifactFile('data.csv', io.BytesIO(content))],
+                           metadata={'k': 'v'}, compression='gzip')
+
+    # act
+    active_run.add_artifact(artifact)
+
+    # assert
+    artifact_api_mock.create_artifact.assert_called_once_with(
+        client=client_mock.return_value,
+        project_key='project key',
+        artifact=ArtifactDto(name='my artifact', type='dataset', metadata={
+            'k': 'v',
+            'mlaide.compression': 'gzip',
+            'mlaide.compression.file-hashes': json.dumps({'data.csv': hashlib.sha256(content).hexdigest()})}),
+        run_key=47)
+    assert len(uploaded_files) == 1
+    upload_arguments, uploaded_content = uploaded_files[0]
+    assert upload_arguments['filename'] == 'data.csv'
+    # The stored hash describes the uploaded (compressed) content
+    assert upload_arguments['file_hash'] == hashlib.sha256(uploaded_content).hexdigest()
+    assert gzip.decompress(uploaded_content) == content
+    assert len(uploaded_content) < len(content) / 10
+
+
 def test_add_artifact_should_create_an_artifact_with_files_from_local_filesystem_if_same_artifact_does_not_exist(
     client_mock, 
     active_run: ActiveRun, 
@@ -318,6 +420,38 @@ def test_add_artifact_should_create_an_artifact_with_files_from_local_filesystem
         file=file_content)
 
 
+def test_add_artifact_should_close_opened_local_file_after_upload(client_mock,
+                                                                  active_run: ActiveRun,
+                                                                  artifact_api_mock,
+                                                                  dto_to_artifact_mock,
+                                                                  mocker: MockerFixture):
+    # arrange
+    get_file_hash_mock = mocker.patch('mlaide.active_run.get_file_hash')
+    get_file_hash_mock.return_value = FileHashDto('data.txt', '123abc')
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = None
+    dto_to_artifact_mock.return_value = Artifact(name='created artifact', version=2)
+    get_file_content_mock = mocker.patch('mlaide.active_run.get_file_content')
+
+    # act
+    active_run.add_artifact(NewArtifact('my artifact', 'dataset', [LocalArtifactFile('data.txt')]))
+
+    # assert
+    get_file_content_mock.return_value.close.assert_called_once()
+
+
+def test_get_file_content_should_open_local_file_for_streaming(tmp_path):
+    # arrange
+    file = tmp_path / 'data.txt'
+    file.write_bytes(b'content')
+
+    # act
+    with get_file_content(str(file)) as content:
+        chunks = list(content)
+
+    # assert
+    assert chunks == [b'content']
+
+
 def test_set_completed_status_should_set_status_and_end_time_in_run(active_run, mocker: MockerFixture):
     # arrange
     now = datetime.now()
@@ -421,3 +555,292 @@ def test_get_file_hash_should_return_file_hash_of_LocalArtifactFile(mocker: Mock
     assert hash.fileName == 'data.txt'
     assert hash.fileHash == '1234'
     file_utils_mock.calculate_checksum_of_file.assert_called_once_with('/path/to/file/data.txt')
+
+
+def test_log_metric_with_background_writer_should_send_metrics_on_flush(client_mock,
+                                                                        create_run_mock,
+                                                                        run_to_dto_mock,
+                                                                        dto_to_run_mock,
+                                                                        run_api_mock):
+    # arrange
+    active_run = ActiveRun(api_client=client_mock.return_value,
+                           project_key='project key',
+                           experiment=Experiment(name='my experiment'),
+                           run_name='run name',
+                           background_writer_options=BackgroundWriterOptions())
+
+    # act
+    run = active_run.log_metric('the-key', 'the value')
+    active_run.flush()
+
+    # assert
+    assert run.metrics == {'the-key': 'the value'}
+    run_api_mock.update_run_metrics.assert_called_once_with(client=client_mock.return_value,
+                                                            project_key='project key',
+                                                            run_key=47,
+                                                            metrics={'the-key': 'the value'})
+    active_run.set_completed_status()
+
+
+def test_set_completed_status_with_background_writer_should_flush_before_updating_status(client_mock,
+                                                                                         create_run_mock,
+                                                                                         run_to_dto_mock,
+                                                                                         dto_to_run_mock,
+                                                                                         run_api_mock):
+    # arrange
+    active_run = ActiveRun(api_client=client_mock.return_value,
+                           project_key='project key',
+                           experiment=Experiment(name='my experiment'),
+                           run_name='run name',
+                           background_writer_options=BackgroundWriterOptions())
+
+    # act
+    active_run.log_parameter('lr', 0.01)
+    active_run.set_completed_status()
+
+    # assert
+    called_functions = [call[0] for call in run_api_mock.method_calls]
+    assert called_functions.index('update_run_parameters') < called_functions.index('partial_update_run')
+
+
+def test_get_file_hash_should_use_hash_cache_for_LocalArtifactFile(mocker: MockerFixture):
+    # arrange
+    file = LocalArtifactFile('data.txt')
+    file_utils_mock = mocker.patch('mlaide.active_run._file_utils')
+    getcwd_mock = mocker.patch('mlaide.active_run.getcwd')
+    getcwd_mock.return_value = '/path/to/file'
+    hash_cache = mocker.Mock()
+    hash_cache.get_or_compute.return_value = 'cached hash'
+
+    # act
+    hash = get_file_hash(file, hash_cache)
+
+    # assert
+    assert hash.fileHash == 'cached hash'
+    hash_cache.get_or_compute.assert_called_once_with('/path/to/file/data.txt',
+                                                      file_utils_mock.calculate_checksum_of_file)
+
+
+def test_get_file_hashes_should_return_hashes_in_order_of_files_when_hashing_in_parallel(mocker: MockerFixture):
+    # arrange
+    files = [InMemoryArtifactFile(f'file-{i}.txt', io.BytesIO(bytes(str(i), 'utf-8'))) for i in range(20)]
+    get_file_hash_mock = mocker.patch('mlaide.active_run.get_file_hash')
+    get_file_hash_mock.side_effect = lambda file, hash_cache: FileHashDto(file.file_name, file.file_name + '-hash')
+
+    # act
+    hashes = get_file_hashes(files, max_workers=4)
+
+    # assert
+    assert hashes == [FileHashDto(f'file-{i}.txt', f'file-{i}.txt-hash') for i in range(20)]
+
+
+def test_get_file_hashes_should_flush_hash_cache_once(mocker: MockerFixture):
+    # arrange
+    files = [InMemoryArtifactFile('a.txt', io.BytesIO(b'a')), InMemoryArtifactFile('b.txt', io.BytesIO(b'b'))]
+    hash_cache = mocker.Mock()
+
+    # act
+    get_file_hashes(files, max_workers=2, hash_cache=hash_cache)
+
+    # assert
+    hash_cache.flush.assert_called_once_with()
+
+
+def test_get_file_hashes_should_hash_sequentially_if_only_one_worker_is_configured(mocker: MockerFixture):
+    # arrange
+    files = [InMemoryArtifactFile('a.txt', io.BytesIO(b'a')), InMemoryArtifactFile('b.txt', io.BytesIO(b'b'))]
+    executor_mock = mocker.patch('mlaide.active_run.ThreadPoolExecutor')
+
+    # act
+    hashes = get_file_hashes(files, max_workers=1)
+
+    # assert
+    assert [h.fileName for h in hashes] == ['a.txt', 'b.txt']
+    executor_mock.assert_not_called()
+
+
+def test_add_artifact_should_hash_files_with_configured_number_of_workers(client_mock,
+                                                                          create_run_mock,
+                                                                          run_to_dto_mock,
+                                                                          dto_to_run_mock,
+                                                                          artifact_api_mock,
+                                                                          mocker: MockerFixture):
+    # arrange
+    get_file_hashes_mock = mocker.patch('mlaide.active_run.get_file_hashes')
+    get_file_hashes_mock.return_value = [FileHashDto('data.txt', '123abc')]
+    active_run = ActiveRun(api_client=client_mock.return_value,
+                           project_key='project key',
+                           experiment=Experiment(name='my experiment'),
+                           run_name='run name',
+                           options=ConnectionOptions(hash_workers=3, hash_cache_enabled=False))
+    files = [InMemoryArtifactFile('data.txt', io.BytesIO(b'foo'))]
+
+    # act
+    active_run.add_artifact(NewArtifact('my artifact', 'dataset', files))
+
+    # assert
+    get_file_hashes_mock.assert_called_once_with(files, 3, None)
+
+
+def test_add_artifact_should_upload_all_files_and_raise_error_for_failed_uploads(client_mock,
+                                                                                 active_run: ActiveRun,
+                                                                                 artifact_api_mock,
+                                                                                 dto_to_artifact_mock,
+                                                                                 mocker: MockerFixture):
+    # arrange
+    get_file_hashes_mock = mocker.patch('mlaide.active_run.get_file_hashes')
+    get_file_hashes_mock.return_value = [FileHashDto('a.txt', 'a'), FileHashDto('b.txt', 'b'),
+                                         FileHashDto('c.txt', 'c')]
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = None
+    dto_to_artifact_mock.return_value = Artifact(name='created artifact', version=2)
+    upload_error = IOError('connection reset')
+
+    def upload_file(**kwargs):
+        if kwargs['filename'] == 'b.txt':
+            raise upload_error
+
+    artifact_api_mock.upload_file.side_effect = upload_file
+
+    files = [InMemoryArtifactFile(name, io.BytesIO(b'foo')) for name in ['a.txt', 'b.txt', 'c.txt']]
+
+    # act
+    with pytest.raises(ArtifactUploadError) as error:
+        active_run.add_artifact(NewArtifact('my artifact', 'dataset', files))
+
+    # assert
+    assert error.value.errors == {'b.txt': upload_error}
+    assert sorted(c.kwargs['filename'] for c in artifact_api_mock.upload_file.call_args_list) == \
+        ['a.txt', 'b.txt', 'c.txt']
+
+
+def test_add_artifact_should_upload_large_local_files_in_parts(client_mock,
+                                                              create_run_mock,
+                                                              run_to_dto_mock,
+                                                              dto_to_run_mock,
+                                                              artifact_api_mock,
+                                                              dto_to_artifact_mock,
+                                                              mocker: MockerFixture,
+                                                              monkeypatch,
+                                                              tmp_path):
+    # arrange
+    monkeypatch.chdir(tmp_path)
+    upload_file_in_parts_mock = mocker.patch('mlaide.active_run.upload_file_in_parts')
+    get_file_hashes_mock = mocker.patch('mlaide.active_run.get_file_hashes')
+    get_file_hashes_mock.return_value = [FileHashDto('large.bin', 'a'), FileHashDto('small.bin', 'b')]
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = None
+    dto_to_artifact_mock.return_value = Artifact(name='created artifact', version=2)
+    (tmp_path / 'large.bin').write_bytes(b'x' * 100)
+    (tmp_path / 'small.bin').write_bytes(b'x' * 99)
+    active_run = ActiveRun(api_client=client_mock.return_value,
+                           project_key='project key',
+                           experiment=Experiment(name='my experiment'),
+                           run_name='run name',
+                           options=ConnectionOptions(hash_cache_enabled=False,
+                                                     cache_directory=str(tmp_path / 'cache'),
+                                                     chunked_upload_threshold=100,
+                                                     chunked_upload_part_size=10))
+    files = [LocalArtifactFile('large.bin'), LocalArtifactFile('small.bin')]
+
+    # act
+    active_run.add_artifact(NewArtifact('my artifact', 'dataset', files))
+
+    # assert
+    upload_file_in_parts_mock.assert_called_once_with(client=client_mock.return_value,
+                                                      project_key='project key',
+                                                      artifact_name='created artifact',
+                                                      artifact_version=2,
+                                                      filename='large.bin',
+                                                      file_hash='a',
+                                                      path='large.bin',
+                                                      part_size=10,
+                                                      manifest_directory=str(tmp_path / 'cache' / 'uploads'),
+                                                      source_hash=None)
+    assert artifact_api_mock.upload_file.call_args.kwargs['filename'] == 'small.bin'
+
+
+def test_add_artifact_should_upload_large_local_files_in_single_request_by_default(client_mock,
+                                                                                 create_run_mock,
+                                                                                 run_to_dto_mock,
+                                                                                 dto_to_run_mock,
+                                                                                 artifact_api_mock,
+                                                                                 dto_to_artifact_mock,
+                                                                                 mocker: MockerFixture,
+                                                                                 monkeypatch,
+                                                                                 tmp_path):
+    # arrange
+    monkeypatch.chdir(tmp_path)
+    upload_file_in_parts_mock = mocker.patch('mlaide.active_run.upload_file_in_parts')
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = None
+    (tmp_path / 'large.bin').write_bytes(b'x' * 100)
+    active_run = ActiveRun(api_client=client_mock.return_value,
+                           project_key='project key',
+                           experiment=Experiment(name='my experiment'),
+                           run_name='run name',
+                           options=ConnectionOptions(hash_cache_enabled=False, chunked_upload_part_size=10))
+
+    # act
+    active_run.add_artifact(NewArtifact('my artifact', 'dataset', [LocalArtifactFile('large.bin')]))
+
+    # assert
+    upload_file_in_parts_mock.assert_not_called()
+    assert artifact_api_mock.upload_file.call_args.kwargs['filename'] == 'large.bin'
+
+
+def test_add_artifact_should_resume_interrupted_chunked_upload_into_same_artifact_version(client_mock,
+                                                                                         create_run_mock,
+                                                                                         run_to_dto_mock,
+                                                                                         dto_to_run_mock,
+                                                                                         artifact_api_mock,
+                                                                                         dto_to_artifact_mock,
+                                                                                         mocker: MockerFixture,
+                                                                                         monkeypatch,
+                                                                                         tmp_path):
+    # arrange
+    monkeypatch.chdir(tmp_path)
+    mocker.patch('mlaide._chunked_upload.time.sleep')
+    chunked_artifact_api_mock = mocker.patch('mlaide._chunked_upload.artifact_api')
+    chunked_artifact_api_mock.create_upload.return_value = UploadDto(upload_id='upload-1')
+    chunked_artifact_api_mock.get_upload.return_value = UploadDto(
+        upload_id='upload-1', parts=[UploadPartDto(0, 'a'), UploadPartDto(1, 'b')])
+    interrupted = True
+
+    def upload_part(**kwargs):
+        if interrupted and kwargs['part_index'] == 2:
+            raise httpx.ConnectError('connection reset')
+
+    chunked_artifact_api_mock.upload_part.side_effect = upload_part
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = None
+    dto_to_artifact_mock.return_value = Artifact(name='my artifact', version=2,
+                                                 files=[ArtifactFileDto('file-1', 'small.bin')])
+    (tmp_path / 'large.bin').write_bytes(b'x' * 25)
+    (tmp_path / 'small.bin').write_bytes(b'x' * 5)
+    active_run = ActiveRun(api_client=client_mock.return_value,
+                           project_key='project key',
+                           experiment=Experiment(name='my experiment'),
+                           run_name='run name',
+                           options=ConnectionOptions(hash_cache_enabled=False,
+                                                     cache_directory=str(tmp_path / 'cache'),
+                                                     chunked_upload_threshold=10,
+                                                     chunked_upload_part_size=10))
+    new_artifact = NewArtifact('my artifact', 'dataset',
+                               [LocalArtifactFile('large.bin'), LocalArtifactFile('small.bin')])
+    with pytest.raises(ArtifactUploadError):
+        active_run.add_artifact(new_artifact)
+    interrupted = False
+    chunked_artifact_api_mock.upload_part.reset_mock()
+    artifact_api_mock.upload_file.reset_mock()
+
+    # act
+    active_run.add_artifact(new_artifact)
+
+    # assert
+    artifact_api_mock.create_artifact.assert_called_once()
+    assert artifact_api_mock.get_artifact.call_args.kwargs['artifact_version'] == 2
+    chunked_artifact_api_mock.create_upload.assert_called_once()
+    assert [c.kwargs['part_index'] for c in chunked_artifact_api_mock.upload_part.call_args_list] == [2]
+    artifact_api_mock.upload_file.assert_not_called()
+    chunked_artifact_api_mock.complete_upload.assert_called_once_with(client=client_mock.return_value,
+                                                                      project_key='project key',
+                                                                      artifact_name='my artifact',
+                                                                      artifact_version=2,
+                                                                      upload_id='upload-1')
@@ -0,0 +1,183 @@
+import multiprocessing
+import os
+import threading
+import pytest
+
+from mlaide import _artifact_cache
+from mlaide._artifact_cache import ArtifactCache, _FileLock
+from mlaide.model import ArtifactCacheStats
+
+
+requires_file_locks = pytest.mark.skipif(_artifact_cache.fcntl is None,
+                                         reason='file locks are not supported on this platform')
+
+
+def write_files(content: bytes):
+    def populate(directory: str):
+        os.makedirs(directory)
+        with open(os.path.join(directory, 'data.bin'), 'wb') as file:
+            file.write(content)
+
+    return populate
+
+
+def populate_in_other_process(cache_directory: str, counter):
+    def populate(directory: str):
+        with counter.get_lock():
+            counter.value += 1
+        write_files(b'x' * 10)(directory)
+
+    cache = ArtifactCache(cache_directory, max_size=1000)
+    with cache.get_or_add('project', 'artifact', 1, populate) as directory:
+        assert os.path.getsize(os.path.join(directory, 'data.bin')) == 10
+
+
+def test_get_should_return_none_and_count_miss_if_artifact_is_not_cached(tmp_path):
+    # arrange
+    cache = ArtifactCache(str(tmp_path), max_size=1000)
+
+    # act
+    with cache.get('project', 'artifact', 1) as directory:
+        # assert
+        assert directory is None
+    assert cache.stats == ArtifactCacheStats(hits=0, misses=1, evictions=0)
+    assert os.listdir(tmp_path) == []
+
+
+def test_get_should_return_none_if_artifact_was_cached_with_other_files(tmp_path):
+    # arrange
+    cache = ArtifactCache(str(tmp_path), max_size=1000)
+    with cache.get_or_add('project', 'artifact', 1, write_files(b'abc'), file_ids=['id-1']):
+        pass
+
+    # act
+    with cache.get('project', 'artifact', 1, file_ids=['id-2', 'id-1']) as directory:
+        # assert
+        assert directory is None
+    with cache.get('project', 'artifact', 1, file_ids=['id-1']) as directory:
+        assert directory is not None
+
+
+def test_get_or_add_should_populate_entry_only_once(tmp_path):
+    # arrange
+    cache = ArtifactCache(str(tmp_path), max_size=1000)
+    calls = []
+
+    def populate(directory: str):
+        calls.append(directory)
+        write_files(b'abc')(directory)
+
+    # act
+    with cache.get_or_add('project', 'artifact', 1, populate):
+        pass
+    with cache.get_or_add('project', 'artifact', 1, populate) as directory:
+        # assert
+        with open(os.path.join(directory, 'data.bin'), 'rb') as file:
+            assert file.read() == b'abc'
+    with cache.get('project', 'artifact', 1) as directory:
+        assert directory is not None
+
+    assert len(calls) == 1
+    assert cache.stats == ArtifactCacheStats(hits=2, misses=1, evictions=0)
+
+
+def test_get_or_add_should_not_publish_entry_if_populate_fails(tmp_path):
+    # arrange
+    cache = ArtifactCache(str(tmp_path), max_size=1000)
+
+    def populate(directory: str):
+        write_files(b'abc')(directory)
+        raise IOError('download failed')
+
+    # act
+    with pytest.raises(IOError):
+        with cache.get_or_add('project', 'artifact', 1, populate):
+            pass
+
+    # assert
+    with cache.get('project', 'artifact', 1) as directory:
+        assert directory is None
+    assert [name for name in os.listdir(tmp_path) if not name.startswith('.locks')] == []
+
+
+def test_get_or_add_should_evict_least_recently_used_entries_when_exceeding_max_size(tmp_path):
+    # arrange
+    cache = ArtifactCache(str(tmp_path), max_size=250)
+    for version in [1, 2]:
+        with cache.get_or_add('project', 'artifact', version, write_files(b'x' * 100)):
+            pass
+    # access version 1, so that version 2 is the least recently used entry
+    for entry in os.listdir(tmp_path):
+        if not entry.startswith('.'):
+            os.utime(tmp_path / entry, (1, 1))
+    with cache.get('project', 'artifact', 1):
+        pass
+
+    # act
+    with cache.get_or_add('project', 'artifact', 3, write_files(b'x' * 100)):
+        pass
+
+    # assert
+    with cache.get('project', 'artifact', 1) as directory:
+        assert directory is not None
+    with cache.get('project', 'artifact', 2) as directory:
+        assert directory is None
+    assert cache.stats.evictions == 1
+    assert len(os.listdir(tmp_path / '.locks')) == 2
+
+
+@requires_file_locks
+def test_get_or_add_should_not_evict_entries_that_are_in_use(tmp_path):
+    # arrange
+    cache = ArtifactCache(str(tmp_path), max_size=150)
+    with cache.get_or_add('project', 'artifact', 1, write_files(b'x' * 100)):
+        pass
+
+    # act
+    with cache.get('project', 'artifact', 1) as directory:
+        with cache.get_or_add('project', 'artifact', 2, write_files(b'x' * 100)):
+            pass
+
+        # assert
+        assert os.path.isdir(directory)
+    assert cache.stats.evictions == 0
+
+
+@requires_file_locks
+def test_get_or_add_should_populate_entry_only_once_across_processes(tmp_path):
+    # arrange
+    counter = multiprocessing.Value('i', 0)
+    processes = [multiprocessing.Process(target=populate_in_other_process, args=(str(tmp_path), counter))
+                 for _ in range(4)]
+
+    # act
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    # assert
+    assert [process.exitcode for process in processes] == [0, 0, 0, 0]
+    assert counter.value == 1
+
+
+@requires_file_locks
+def test_file_lock_should_lock_new_file_if_file_was_removed_while_waiting(tmp_path):
+    # arrange
+    path = str(tmp_path / 'entry.lock')
+    locked_existing_file = []
+
+    def wait_for_lock():
+        with _FileLock(path):
+            locked_existing_file.append(os.path.exists(path))
+
+    # act
+    with _FileLock(path):
+        thread = threading.Thread(target=wait_for_lock)
+        thread.start()
+        thread.join(0.2)
+        os.remove(path)
+    thread.join()
+
+    # assert
+    assert locked_existing_file == [True]
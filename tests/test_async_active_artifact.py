@@ -0,0 +1,96 @@
+from pytest_mock.plugin import MockerFixture
+from zipfile import ZipFile
+import asyncio
+import io
+import pathlib
+import pytest
+
+from mlaide.async_active_artifact import AsyncActiveArtifact, Artifact
+from mlaide.model import ArtifactFile
+
+
+@pytest.fixture
+def client_mock(mocker: MockerFixture):
+    return mocker.patch('mlaide.async_active_artifact.Client')
+
+
+@pytest.fixture
+def download_artifact_mock(mocker: MockerFixture):
+    mock = mocker.patch('mlaide.async_active_artifact.artifact_api.download_artifact', autospec=True)
+
+    zip_bytes = io.BytesIO()
+    with ZipFile(zip_bytes, 'w') as z:
+        z.writestr('data.txt', 'file content')
+        z.writestr('sub/other.txt', 'other content')
+    zip_bytes.seek(0)
+
+    mock.return_value = (zip_bytes, 'artifact.zip')
+    return mock
+
+
+@pytest.fixture
+def active_artifact(client_mock):
+    return AsyncActiveArtifact(client_mock.return_value, 'project key', Artifact(name='a name', version=1))
+
+
+def test_load_should_return_content_of_single_file(active_artifact, download_artifact_mock):
+    # act
+    file = asyncio.run(active_artifact.load('data.txt'))
+
+    # assert
+    assert file.read() == b'file content'
+    download_artifact_mock.assert_called_once_with(client=active_artifact._AsyncActiveArtifact__api_client,
+                                                   project_key='project key',
+                                                   artifact_name='a name',
+                                                   artifact_version=1)
+
+
+def test_download_should_extract_all_files_and_download_only_once(active_artifact, download_artifact_mock, tmp_path):
+    # act
+    asyncio.run(active_artifact.download(str(tmp_path / 'first')))
+    asyncio.run(active_artifact.download(str(tmp_path / 'second')))
+
+    # assert
+    download_artifact_mock.assert_called_once()
+    assert (tmp_path / 'first' / 'data.txt').read_text() == 'file content'
+    assert (tmp_path / 'second' / 'sub' / 'other.txt').read_text() == 'other content'
+
+
+def test_load_model_should_deserialize_model_file(active_artifact, download_artifact_mock, mocker: MockerFixture):
+    # arrange
+    deserialize_mock = mocker.patch('mlaide.async_active_artifact._model_deser.deserialize')
+    deserialize_mock.side_effect = lambda directory: (pathlib.Path(directory) / 'model.pkl').read_bytes()
+    zip_bytes = io.BytesIO()
+    with ZipFile(zip_bytes, 'w') as z:
+        z.writestr('model.pkl', 'pickled model')
+    zip_bytes.seek(0)
+    download_artifact_mock.return_value = (zip_bytes, 'artifact.zip')
+
+    # act
+    model = asyncio.run(active_artifact.load_model())
+
+    # assert
+    assert model == b'pickled model'
+    assert not pathlib.Path(deserialize_mock.call_args[0][0]).exists()
+
+
+def test_load_should_download_only_the_requested_file_if_file_id_is_known(client_mock,
+                                                                          download_artifact_mock,
+                                                                          mocker: MockerFixture):
+    # arrange
+    download_file_mock = mocker.patch('mlaide.async_active_artifact.artifact_api.download_file', autospec=True)
+    download_file_mock.return_value = io.BytesIO(b'single file')
+    active_artifact = AsyncActiveArtifact(client_mock.return_value, 'project key', Artifact(
+        name='a name', version=1, files=[ArtifactFile(file_id='id-1', file_name='data.txt')]))
+
+    # act
+    file = asyncio.run(active_artifact.load('data.txt'))
+
+    # assert
+    assert file.read() == b'single file'
+    download_file_mock.assert_called_once_with(client=client_mock.return_value,
+                                               project_key='project key',
+                                               artifact_name='a name',
+                                               artifact_version=1,
+                                               file_id='id-1')
+    download_artifact_mock.assert_not_called()
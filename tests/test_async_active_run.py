@@ -0,0 +1,208 @@
+from pytest_mock.plugin import MockerFixture
+import asyncio
+import gzip
+import hashlib
+import io
+import pytest
+
+from mlaide._api_client.dto import ArtifactDto, FileHashDto, RunDto, StatusDto
+from mlaide.async_active_run import AsyncActiveRun
+from mlaide.connection_options import ConnectionOptions
+from mlaide.error import ArtifactUploadError
+from mlaide.model import Artifact, InMemoryArtifactFile, NewArtifact, Run, RunStatus
+
+
+@pytest.fixture
+def client_mock(mocker: MockerFixture):
+    return mocker.patch('mlaide.async_active_run.Client')
+
+
+@pytest.fixture
+def run_api_mock(mocker: MockerFixture):
+    return mocker.patch('mlaide.async_active_run.run_api', autospec=True)
+
+
+@pytest.fixture
+def artifact_api_mock(mocker: MockerFixture):
+    return mocker.patch('mlaide.async_active_run.artifact_api', autospec=True)
+
+
+@pytest.fixture
+def active_run(client_mock):
+    return AsyncActiveRun(api_client=client_mock.return_value, project_key='project key', run=Run(key=47))
+
+
+def test_log_metric_should_add_metric_to_run_and_call_update_on_api(active_run, client_mock, run_api_mock):
+    # act
+    run = asyncio.run(active_run.log_metric('the-key', 'the value'))
+
+    # assert
+    assert run.metrics == {'the-key': 'the value'}
+    run_api_mock.update_run_metrics.assert_called_once_with(client=client_mock.return_value,
+                                                            project_key='project key',
+                                                            run_key=47,
+                                                            metrics={'the-key': 'the value'})
+
+
+def test_log_metric_epoch_should_send_only_new_epoch(active_run, client_mock, run_api_mock):
+    # act
+    asyncio.run(active_run.log_metric_epoch('the-key', 'epoch-1', 1))
+    run = asyncio.run(active_run.log_metric_epoch('the-key', 'epoch-2', 2))
+
+    # assert
+    assert run.metrics == {'the-key': {'epoch-1': 1, 'epoch-2': 2}}
+    run_api_mock.update_run_metrics.assert_called_with(client=client_mock.return_value,
+                                                       project_key='project key',
+                                                       run_key=47,
+                                                       metrics={'the-key': {'epoch-2': 2}})
+
+
+def test_log_parameters_should_add_parameters_to_run_and_call_update_on_api(active_run, client_mock, run_api_mock):
+    # act
+    run = asyncio.run(active_run.log_parameters({'lr': 0.1, 'epochs': 3}))
+
+    # assert
+    assert run.parameters == {'lr': 0.1, 'epochs': 3}
+    run_api_mock.update_run_parameters.assert_called_once_with(client=client_mock.return_value,
+                                                               project_key='project key',
+                                                               run_key=47,
+                                                               parameters={'lr': 0.1, 'epochs': 3})
+
+
+def test_add_artifact_should_create_an_artifact_and_upload_files_if_same_artifact_does_not_exist(
+        active_run, client_mock, artifact_api_mock, mocker: MockerFixture):
+    # arrange
+    get_file_hashes_mock = mocker.patch('mlaide.async_active_run.get_file_hashes')
+    get_file_hashes_mock.return_value = [FileHashDto('data.txt', '123abc')]
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = None
+    artifact_api_mock.create_artifact.return_value = ArtifactDto(name='created artifact', version=2)
+
+    file_content = io.BytesIO(bytes('foo', 'utf-8'))
+    artifact = NewArtifact('my artifact', 'dataset', [InMemoryArtifactFile('data.txt', file_content)])
+
+    # act
+    created_artifact = asyncio.run(active_run.add_artifact(artifact))
+
+    # assert
+    assert created_artifact == Artifact(name='created artifact', version=2)
+    artifact_api_mock.create_artifact.assert_called_once_with(
+        client=client_mock.return_value,
+        project_key='project key',
+        artifact=ArtifactDto(name='my artifact', type='dataset', metadata=None),
+        run_key=47)
+    artifact_api_mock.upload_file.assert_called_once_with(
+        client=client_mock.return_value,
+        project_key='project key',
+        artifact_name='created artifact',
+        artifact_version=2,
+        filename='data.txt',
+        file_hash='123abc',
+        file=file_content)
+
+
+def test_add_artifact_should_attach_existing_artifact_to_run(active_run, client_mock, artifact_api_mock,
+                                                            run_api_mock, mocker: MockerFixture):
+    # arrange
+    get_file_hashes_mock = mocker.patch('mlaide.async_active_run.get_file_hashes')
+    get_file_hashes_mock.return_value = [FileHashDto('data.txt', '123abc')]
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = ArtifactDto(name='x', version=3)
+
+    artifact = NewArtifact('my artifact', 'dataset', [InMemoryArtifactFile('data.txt', io.BytesIO(b'foo'))])
+
+    # act
+    asyncio.run(active_run.add_artifact(artifact))
+
+    # assert
+    artifact_api_mock.upload_file.assert_not_called()
+    run_api_mock.attach_artifact_to_run.assert_called_once_with(client=client_mock.return_value,
+                                                                artifact_name='x',
+                                                                artifact_version=3,
+                                                                project_key='project key',
+                                                                run_key=47)
+
+
+def test_set_completed_status_should_invoke_run_api_with_new_status(active_run, client_mock, run_api_mock):
+    # act
+    run = asyncio.run(active_run.set_completed_status())
+
+    # assert
+    assert run.status == RunStatus.COMPLETED
+    assert run.end_time is not None
+    run_api_mock.partial_update_run.assert_called_once_with(client=client_mock.return_value,
+                                                            project_key='project key',
+                                                            run_key=47,
+                                                            run=RunDto(status=StatusDto.COMPLETED))
+
+
+def test_add_artifact_should_upload_compressed_files_with_hash_of_compressed_content(
+        active_run, artifact_api_mock, mocker: MockerFixture):
+    # arrange
+    content = b'0.5,1\n' * 1000
+    get_file_hashes_mock = mocker.patch('mlaide.async_active_run.get_file_hashes')
+    get_file_hashes_mock.return_value = [FileHashDto('data.csv', hashlib.sha256(content).hexdigest())]
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = None
+    artifact_api_mock.create_artifact.return_value = ArtifactDto(name='created artifact', version=2)
+    uploaded_files = []
+
+    async def upload_file(file, **kwargs):
+        uploaded_files.append((kwargs['file_hash'], file.read()))
+
+    artifact_api_mock.upload_file.side_effect = upload_file
+    artifact = NewArtifact('my artifact', 'dataset', [InMemoryArtifactFile('data.csv', io.BytesIO(content))],
+                           compression='gzip')
+
+    # act
+    asyncio.run(active_run.add_artifact(artifact))
+
+    # assert
+    metadata = artifact_api_mock.create_artifact.call_args.kwargs['artifact'].metadata
+    assert metadata['mlaide.compression.file-hashes'] == f'{{"data.csv": "{hashlib.sha256(content).hexdigest()}"}}'
+    [(file_hash, uploaded_content)] = uploaded_files
+    assert gzip.decompress(uploaded_content) == content
+    assert file_hash == hashlib.sha256(uploaded_content).hexdigest()
+
+
+def test_add_artifact_should_upload_all_files_and_raise_error_for_failed_uploads(
+        active_run, artifact_api_mock, mocker: MockerFixture):
+    # arrange
+    get_file_hashes_mock = mocker.patch('mlaide.async_active_run.get_file_hashes')
+    get_file_hashes_mock.side_effect = lambda files, max_workers, hash_cache: [FileHashDto(file.file_name, 'hash')
+                                                                              for file in files]
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = None
+    artifact_api_mock.create_artifact.return_value = ArtifactDto(name='created artifact', version=2)
+    upload_error = IOError('connection reset')
+
+    async def upload_file(**kwargs):
+        if kwargs['filename'] == 'b.txt':
+            raise upload_error
+
+    artifact_api_mock.upload_file.side_effect = upload_file
+
+    files = [InMemoryArtifactFile(name, io.BytesIO(b'foo')) for name in ['a.txt', 'b.txt', 'c.txt']]
+
+    # act
+    with pytest.raises(ArtifactUploadError) as error:
+        asyncio.run(active_run.add_artifact(NewArtifact('my artifact', 'dataset', files)))
+
+    # assert
+    assert error.value.errors == {'b.txt': upload_error}
+    assert artifact_api_mock.upload_file.call_count == 3
+
+
+def test_add_artifact_should_hash_files_with_hash_workers_and_hash_cache(client_mock, run_api_mock, artifact_api_mock,
+                                                                         mocker: MockerFixture):
+    # arrange
+    hash_cache_mock = mocker.Mock()
+    get_file_hashes_mock = mocker.patch('mlaide.async_active_run.get_file_hashes')
+    get_file_hashes_mock.return_value = [FileHashDto('data.txt', '123abc')]
+    artifact_api_mock.find_artifact_by_file_hashes.return_value = ArtifactDto(name='x', version=3)
+    active_run = AsyncActiveRun(api_client=client_mock.return_value, project_key='project key', run=Run(key=47),
+                                options=ConnectionOptions(hash_workers=3, hash_cache_enabled=True),
+                                hash_cache=hash_cache_mock)
+    files = [InMemoryArtifactFile('data.txt', io.BytesIO(b'data'))]
+
+    # act
+    asyncio.run(active_run.add_artifact(NewArtifact('x', 'dataset', files)))
+
+    # assert
+    get_file_hashes_mock.assert_called_once_with(files, 3, hash_cache_mock)
@@ -0,0 +1,107 @@
+from pytest_mock.plugin import MockerFixture
+import asyncio
+import pytest
+
+from mlaide import AsyncMLAideClient, ConnectionOptions, ModelStage
+from mlaide._api_client.dto import ArtifactDto, ExperimentDto
+
+
+@pytest.fixture
+def artifact_api_mock(mocker: MockerFixture):
+    return mocker.patch('mlaide.async_client.artifact_api', autospec=True)
+
+
+@pytest.fixture
+def experiment_api_mock(mocker: MockerFixture):
+    return mocker.patch('mlaide.async_client.experiment_api', autospec=True)
+
+
+def test_init_should_raise_value_error_if_project_key_is_none():
+    with pytest.raises(ValueError):
+        # noinspection PyTypeChecker
+        AsyncMLAideClient(None)
+
+
+def test_init_should_use_merge_provided_options_with_default_options(monkeypatch):
+    # arrange
+    monkeypatch.setenv('MLAIDE_API_KEY', 'the api key')
+
+    # act
+    client = AsyncMLAideClient('project key', options=ConnectionOptions(server_url='http://my-server.com'))
+
+    # assert
+    assert client.options.api_key == 'the api key'
+    assert client.options.server_url == 'http://my-server.com'
+    assert client.api_client.base_url == 'http://my-server.com'
+
+
+def test_create_experiment_should_create_experiment_and_return_active_experiment(experiment_api_mock):
+    # arrange
+    experiment_api_mock.create_experiment.return_value = ExperimentDto(key='exp-key', name='exp')
+    client = AsyncMLAideClient('project key')
+
+    # act
+    active_experiment = asyncio.run(client.create_experiment('exp'))
+
+    # assert
+    assert active_experiment.experiment.key == 'exp-key'
+    experiment_api_mock.create_experiment.assert_called_once_with(client=client.api_client,
+                                                                  project_key='project key',
+                                                                  experiment=ExperimentDto(name='exp'))
+
+
+def test_get_artifact_should_load_artifact_and_return_active_artifact(artifact_api_mock):
+    # arrange
+    artifact_api_mock.get_artifact.return_value = ArtifactDto(name='a name', version=5)
+    client = AsyncMLAideClient('project key')
+
+    # act
+    active_artifact = asyncio.run(client.get_artifact('a name', 5))
+
+    # assert
+    assert active_artifact.artifact.name == 'a name'
+    assert active_artifact.artifact.version == 5
+    artifact_api_mock.get_artifact.assert_called_once_with(client=client.api_client,
+                                                           project_key='project key',
+                                                           artifact_name='a name',
+                                                           artifact_version=5,
+                                                           model_stage=None)
+
+
+def test_load_model_should_return_result_of_load_model_of_artifact(artifact_api_mock, mocker: MockerFixture):
+    # arrange
+    artifact_api_mock.get_artifact.return_value = ArtifactDto(name='model name', version=2)
+    load_model_mock = mocker.patch('mlaide.async_client.AsyncActiveArtifact.load_model', autospec=True)
+    load_model_mock.return_value = 'the deserialized model'
+    client = AsyncMLAideClient('project key')
+
+    # act
+    model = asyncio.run(client.load_model('model name', stage=ModelStage.PRODUCTION))
+
+    # assert
+    assert model == 'the deserialized model'
+    assert artifact_api_mock.get_artifact.call_args.kwargs['model_stage'] == ModelStage.PRODUCTION.value
+
+
+def test_load_model_should_raise_error_when_version_and_stage_are_defined():
+    # arrange
+    client = AsyncMLAideClient('project key')
+
+    # act
+    with pytest.raises(ValueError):
+        asyncio.run(client.load_model('model name', version=3, stage=ModelStage.PRODUCTION))
+
+
+def test_exit_context_manager_should_close_api_client(mocker: MockerFixture):
+    # arrange
+    async def use_client():
+        async with AsyncMLAideClient('project key') as client:
+            return client
+
+    aclose_mock = mocker.patch('mlaide._api_client.client.Client.aclose', autospec=True)
+
+    # act
+    client = asyncio.run(use_client())
+
+    # assert
+    aclose_mock.assert_called_once_with(client.api_client)
@@ -0,0 +1,179 @@
+import gc
+import threading
+import weakref
+
+import pytest
+
+from mlaide.background_writer import BackgroundWriter, BackgroundWriterOptions, BackpressureStrategy, merge_patch
+
+
+class BlockingSender(object):
+    """Records all sent values. Sending blocks until `release()` was called."""
+
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.__released = threading.Event()
+        if not blocked:
+            self.__released.set()
+
+    def __call__(self, values):
+        self.__released.wait()
+        self.sent.append(values)
+
+    def release(self):
+        self.__released.set()
+
+
+def test_merge_patch_should_merge_nested_dicts():
+    # arrange
+    target = {'loss': {'1': 0.5}, 'acc': 0.1}
+
+    # act
+    merged = merge_patch(target, {'loss': {'2': 0.4}, 'acc': 0.2, 'f1': 0.3})
+
+    # assert
+    assert merged == {'loss': {'1': 0.5, '2': 0.4}, 'acc': 0.2, 'f1': 0.3}
+
+
+def test_merge_patch_should_not_modify_nested_dicts_of_patch():
+    # arrange
+    patch = {'loss': {'1': 0.5}}
+    target = merge_patch({}, patch)
+
+    # act
+    merge_patch(target, {'loss': {'2': 0.4}})
+
+    # assert
+    assert patch == {'loss': {'1': 0.5}}
+
+
+def test_flush_should_send_all_logged_metrics_and_parameters():
+    # arrange
+    send_metrics = BlockingSender()
+    send_parameters = BlockingSender()
+    writer = BackgroundWriter(send_metrics, send_parameters)
+
+    # act
+    writer.log_metrics({'acc': 0.1})
+    writer.log_parameters({'lr': 0.01})
+    writer.flush()
+
+    # assert
+    assert send_metrics.sent == [{'acc': 0.1}]
+    assert send_parameters.sent == [{'lr': 0.01}]
+    writer.close()
+
+
+def test_worker_should_coalesce_values_queued_while_a_request_is_in_flight():
+    # arrange
+    send_metrics = BlockingSender(blocked=True)
+    writer = BackgroundWriter(send_metrics, BlockingSender())
+    writer.log_metrics({'loss': {'1': 0.9}})
+
+    # act
+    for epoch in range(2, 6):
+        writer.log_metrics({'loss': {str(epoch): 1 / epoch}})
+    send_metrics.release()
+    writer.flush()
+
+    # assert
+    assert len(send_metrics.sent) <= 2
+    assert send_metrics.sent[-1]['loss']['5'] == 0.2
+    writer.close()
+
+
+def test_flush_should_raise_error_of_worker():
+    # arrange
+    def send_metrics(_):
+        raise ValueError('server not reachable')
+
+    writer = BackgroundWriter(send_metrics, BlockingSender())
+    writer.log_metrics({'acc': 0.1})
+
+    # act + assert
+    with pytest.raises(ValueError):
+        writer.flush()
+    writer.close()
+
+
+def test_drop_oldest_should_discard_oldest_values_when_queue_is_full():
+    # arrange
+    send_metrics = BlockingSender(blocked=True)
+    options = BackgroundWriterOptions(max_queue_size=2, backpressure=BackpressureStrategy.DROP_OLDEST)
+    writer = BackgroundWriter(send_metrics, BlockingSender(), options)
+    writer.log_metrics({'in-flight': 0})
+    while writer_queue_is_not_taken(writer):
+        pass
+
+    # act
+    for i in range(1, 6):
+        writer.log_metrics({str(i): i})
+    send_metrics.release()
+    writer.flush()
+
+    # assert
+    sent_keys = {k for sent in send_metrics.sent for k in sent.keys()}
+    assert {'4', '5'} <= sent_keys
+    assert '1' not in sent_keys
+    writer.close()
+
+
+def test_spill_to_disk_should_send_all_values_when_queue_is_full(tmp_path):
+    # arrange
+    send_metrics = BlockingSender(blocked=True)
+    options = BackgroundWriterOptions(max_queue_size=2,
+                                      backpressure=BackpressureStrategy.SPILL_TO_DISK,
+                                      spill_directory=str(tmp_path))
+    writer = BackgroundWriter(send_metrics, BlockingSender(), options)
+    writer.log_metrics({'in-flight': 0})
+    while writer_queue_is_not_taken(writer):
+        pass
+
+    # act
+    for i in range(1, 11):
+        writer.log_metrics({'loss': {str(i): i}})
+    send_metrics.release()
+    writer.flush()
+
+    # assert
+    merged = {}
+    for sent in send_metrics.sent:
+        merge_patch(merged, sent)
+    assert merged == {'in-flight': 0, 'loss': {str(i): i for i in range(1, 11)}}
+    writer.close()
+
+
+def test_log_metrics_should_raise_error_after_close():
+    # arrange
+    writer = BackgroundWriter(BlockingSender(), BlockingSender())
+    writer.close()
+
+    # act + assert
+    with pytest.raises(RuntimeError):
+        writer.log_metrics({'acc': 0.1})
+
+
+def test_writer_should_be_garbage_collected_and_stop_worker_if_no_values_are_pending():
+    # arrange
+    sender = BlockingSender()
+    writer = BackgroundWriter(sender, BlockingSender())
+    writer.log_metrics({'acc': 0.1})
+    writer.flush()
+    # noinspection PyUnresolvedReferences
+    worker = writer._BackgroundWriter__worker
+    writer_ref = weakref.ref(writer)
+
+    # act
+    del writer
+    gc.collect()
+
+    # assert
+    assert writer_ref() is None
+    worker.join(5)
+    assert not worker.is_alive()
+    assert sender.sent == [{'acc': 0.1}]
+
+
+def writer_queue_is_not_taken(writer: BackgroundWriter) -> bool:
+    # noinspection PyUnresolvedReferences
+    return not writer._BackgroundWriter__queue.empty()
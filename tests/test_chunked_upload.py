@@ -0,0 +1,158 @@
+from pytest_mock.plugin import MockerFixture
+import hashlib
+import json
+import re
+import httpx
+import pytest
+from pytest_httpx import to_response
+
+from mlaide._chunked_upload import upload_file_in_parts, _get_manifest_path, _load_manifest
+
+
+class StubUploadServer(object):
+    """Implements the chunked upload endpoints of the ML Aide server in memory"""
+
+    def __init__(self, httpx_mock, failing_requests: int = 0):
+        self.uploads = {}
+        self.completed = {}
+        self.failing_requests = failing_requests
+        self.failing_parts = set()
+        base = r'https://mlaide\.com/projects/pk/artifacts/artifact/3/uploads'
+        httpx_mock.add_callback(self.create_upload, method='POST', url=re.compile(base + r'$'))
+        httpx_mock.add_callback(self.get_upload, method='GET', url=re.compile(base + r'/[^/]+$'))
+        httpx_mock.add_callback(self.upload_part, method='PUT', url=re.compile(base + r'/[^/]+/parts/\d+\?.*'))
+        httpx_mock.add_callback(self.complete_upload, method='POST', url=re.compile(base + r'/[^/]+/complete$'))
+
+    def create_upload(self, request: httpx.Request, ext):
+        upload_id = 'upload-{}'.format(len(self.uploads))
+        self.uploads[upload_id] = {}
+        return to_response(json={'uploadId': upload_id, **json.loads(request.read())})
+
+    def get_upload(self, request: httpx.Request, ext):
+        upload_id = request.url.path.split('/')[-1]
+        if upload_id not in self.uploads:
+            return to_response(status_code=404)
+        parts = [{'partIndex': index, 'partHash': hashlib.sha256(content).hexdigest()}
+                 for index, content in self.uploads[upload_id].items()]
+        return to_response(json={'uploadId': upload_id, 'parts': parts})
+
+    def upload_part(self, request: httpx.Request, ext):
+        if self.failing_requests > 0:
+            self.failing_requests -= 1
+            raise httpx.ConnectError('connection reset', request=request)
+        segments = request.url.path.split('/')
+        if int(segments[-1]) in self.failing_parts:
+            raise httpx.ConnectError('connection reset', request=request)
+        content = request.read()
+        assert hashlib.sha256(content).hexdigest() == httpx.QueryParams(request.url.query)['part-hash']
+        self.uploads[segments[-3]][int(segments[-1])] = content
+        return to_response(status_code=204)
+
+    def complete_upload(self, request: httpx.Request, ext):
+        upload_id = request.url.path.split('/')[-2]
+        parts = self.uploads.pop(upload_id)
+        self.completed[upload_id] = b''.join(parts[index] for index in sorted(parts))
+        return to_response(status_code=204)
+
+
+@pytest.fixture
+def assert_all_responses_were_requested() -> bool:
+    # The stub server registers all endpoints, even if a test does not use all of them
+    return False
+
+
+@pytest.fixture
+def client(mocker: MockerFixture):
+    client = mocker.patch('mlaide._api_client.api.artifact_api.Client')()
+    client.base_url = 'https://mlaide.com'
+    client.get_headers.side_effect = lambda: {'x-api-key': 'xyz'}
+    client.get_httpx_client.return_value = httpx.Client()
+    yield client
+    client.get_httpx_client.return_value.close()
+
+
+@pytest.fixture(autouse=True)
+def sleep_mock(mocker: MockerFixture):
+    return mocker.patch('mlaide._chunked_upload.time.sleep')
+
+
+def upload(client, tmp_path, file):
+    upload_file_in_parts(client=client,
+                         project_key='pk',
+                         artifact_name='artifact',
+                         artifact_version=3,
+                         filename='model.bin',
+                         file_hash='abc',
+                         path=str(file),
+                         part_size=1000,
+                         manifest_directory=str(tmp_path / 'uploads'))
+
+
+def test_upload_file_in_parts_should_upload_all_parts_and_complete_upload(client, httpx_mock, tmp_path):
+    # arrange
+    server = StubUploadServer(httpx_mock)
+    file = tmp_path / 'model.bin'
+    file.write_bytes(bytes(range(256)) * 10)
+
+    # act
+    upload(client, tmp_path, file)
+
+    # assert
+    assert server.completed == {'upload-0': file.read_bytes()}
+    assert len([r for r in httpx_mock.get_requests() if r.method == 'PUT']) == 3
+    assert list((tmp_path / 'uploads').iterdir()) == []
+
+
+def test_upload_file_in_parts_should_retry_part_after_connection_error(client, httpx_mock, tmp_path, sleep_mock):
+    # arrange
+    server = StubUploadServer(httpx_mock, failing_requests=2)
+    file = tmp_path / 'model.bin'
+    file.write_bytes(b'x' * 2500)
+
+    # act
+    upload(client, tmp_path, file)
+
+    # assert
+    assert server.completed == {'upload-0': file.read_bytes()}
+    assert [c.args[0] for c in sleep_mock.call_args_list] == [1.0, 2.0]
+
+
+def test_upload_file_in_parts_should_resume_from_manifest_after_failed_upload(client, httpx_mock, tmp_path):
+    # arrange
+    server = StubUploadServer(httpx_mock)
+    file = tmp_path / 'model.bin'
+    file.write_bytes(b'x' * 2500)
+    server.failing_parts = {2}
+    with pytest.raises(httpx.ConnectError):
+        upload(client, tmp_path, file)
+    manifest = _load_manifest(_get_manifest_path(str(tmp_path / 'uploads'), 'pk', 'artifact', 'model.bin', 'abc'))
+    server.failing_parts = set()
+    request_count = len(httpx_mock.get_requests())
+
+    # act
+    upload(client, tmp_path, file)
+
+    # assert
+    assert manifest.completed_parts == [0, 1]
+    assert server.completed == {'upload-0': file.read_bytes()}
+    assert [r.url.path for r in httpx_mock.get_requests()[request_count:] if r.method == 'PUT'] == \
+        ['/projects/pk/artifacts/artifact/3/uploads/upload-0/parts/2']
+
+
+def test_upload_file_in_parts_should_start_new_upload_if_server_discarded_upload(client, httpx_mock, tmp_path):
+    # arrange
+    server = StubUploadServer(httpx_mock)
+    server.uploads = {'upload-0': {}}
+    file = tmp_path / 'model.bin'
+    file.write_bytes(b'x' * 1500)
+    manifest_path = _get_manifest_path(str(tmp_path / 'uploads'), 'pk', 'artifact', 'model.bin', 'abc')
+    (tmp_path / 'uploads').mkdir()
+    with open(manifest_path, 'w') as f:
+        json.dump({'upload_id': 'expired', 'artifact_version': 3, 'file_hash': 'abc', 'file_size': 1500, 'part_size': 1000,
+                   'completed_parts': [0]}, f)
+
+    # act
+    upload(client, tmp_path, file)
+
+    # assert
+    assert server.completed == {'upload-1': file.read_bytes()}
@@ -1,4 +1,5 @@
 from pytest_mock.plugin import MockerFixture
+import os
 import pytest
 
 from mlaide import MLAideClient, ConnectionOptions, ModelStage
@@ -19,6 +20,11 @@ def mock_active_artifact(mocker: MockerFixture):
     return mocker.patch('mlaide.client.ActiveArtifact')
 
 
+@pytest.fixture
+def mock_artifact_cache(mocker: MockerFixture):
+    return mocker.patch('mlaide.client.ArtifactCache')
+
+
 @pytest.fixture
 def mock_get_git_metadata(mocker: MockerFixture):
     return mocker.patch('mlaide.client.get_git_metadata')
@@ -61,28 +67,72 @@ def test_init_should_create_authenticated_client(mock_authenticated_client):
     client = MLAideClient('project key', options=ConnectionOptions(server_url='http://my-server.com', api_key='the key'))
 
     # assert
-    mock_authenticated_client.assert_called_once_with(base_url='http://my-server.com', api_key='the key')
+    mock_authenticated_client.assert_called_once_with(base_url='http://my-server.com',
+                                                      api_key='the key',
+                                                      timeout=30.0,
+                                                      max_connections=10,
+                                                      max_keepalive_connections=5,
+                                                      max_payload_size=1024 * 1024)
     assert client.api_client == mock_authenticated_client.return_value
 
 
-def test_get_artifact_should_instantiate_new_active_artifact_with_correct_arguments(
-        mock_authenticated_client, mock_active_artifact):
+def test_init_should_pass_connection_pool_options_to_authenticated_client(mock_authenticated_client):
+    # act
+    MLAideClient('project key', options=ConnectionOptions(server_url='http://my-server.com',
+                                                          api_key='the key',
+                                                          timeout=3.5,
+                                                          max_connections=20,
+                                                          max_keepalive_connections=15,
+                                                          max_payload_size=2048))
+
+    # assert
+    mock_authenticated_client.assert_called_once_with(base_url='http://my-server.com',
+                                                      api_key='the key',
+                                                      timeout=3.5,
+                                                      max_connections=20,
+                                                      max_keepalive_connections=15,
+                                                      max_payload_size=2048)
+
+
+def test_close_should_close_api_client(mock_authenticated_client):
     # arrange
     client = MLAideClient('project key')
 
+    # act
+    client.close()
+
+    # assert
+    mock_authenticated_client.return_value.close.assert_called_once()
+
+
+def test_exit_context_manager_should_close_api_client(mock_authenticated_client):
+    # act
+    with MLAideClient('project key') as client:
+        assert client.api_client == mock_authenticated_client.return_value
+
+    # assert
+    mock_authenticated_client.return_value.close.assert_called_once()
+
+
+def test_get_artifact_should_instantiate_new_active_artifact_with_correct_arguments(
+        mock_authenticated_client, mock_active_artifact, mock_artifact_cache):
+    # arrange
+    client = MLAideClient('project key', options=ConnectionOptions(artifact_cache_enabled=True))
+
     # act
     active_artifact = client.get_artifact('a name', 5)
 
     # assert
     mock_active_artifact.assert_called_once_with(
-        mock_authenticated_client.return_value, 'project key', 'a name', 5)
+        mock_authenticated_client.return_value, 'project key', 'a name', 5,
+        artifact_cache=mock_artifact_cache.return_value)
     assert active_artifact == mock_active_artifact.return_value
 
 
 def test_load_model_should_instantiate_new_active_artifact_with_correct_arguments_and_return_result_of_load_model(
-        mock_authenticated_client, mock_active_artifact):
+        mock_authenticated_client, mock_active_artifact, mock_artifact_cache):
     # arrange
-    client = MLAideClient('project key')
+    client = MLAideClient('project key', options=ConnectionOptions(artifact_cache_enabled=True))
     mock_active_artifact.return_value.load_model.return_value = "the deserialized model"
 
     # act
@@ -90,20 +140,24 @@ def test_load_model_should_instantiate_new_active_artifact_with_correct_argument
 
     # assert
     mock_active_artifact.assert_called_once_with(
-        mock_authenticated_client.return_value, 'project key', 'model name', 7, None)
+        mock_authenticated_client.return_value, 'project key', 'model name', 7, None,
+        artifact_cache=mock_artifact_cache.return_value)
     assert model == "the deserialized model"
 
 
-def test_load_model_should_pass_stage_to_active_artifact(mock_authenticated_client, mock_active_artifact):
+def test_load_model_should_pass_stage_to_active_artifact(mock_authenticated_client,
+                                                        mock_active_artifact,
+                                                        mock_artifact_cache):
     # arrange
-    client = MLAideClient('project key')
+    client = MLAideClient('project key', options=ConnectionOptions(artifact_cache_enabled=True))
 
     # act
     client.load_model('model name', stage=ModelStage.PRODUCTION)
 
     # assert
     mock_active_artifact.assert_called_once_with(
-        mock_authenticated_client.return_value, 'project key', 'model name', None, ModelStage.PRODUCTION)
+        mock_authenticated_client.return_value, 'project key', 'model name', None, ModelStage.PRODUCTION,
+        artifact_cache=mock_artifact_cache.return_value)
 
 
 def test_load_model_should_raise_error_when_version_and_stage_are_defined():
@@ -113,3 +167,106 @@ def test_load_model_should_raise_error_when_version_and_stage_are_defined():
     # act
     with pytest.raises(ValueError):
         client.load_model('model name', version=3, stage=ModelStage.PRODUCTION)
+
+
+def test_init_should_create_artifact_cache_in_cache_directory(mock_authenticated_client, mock_artifact_cache):
+    # act
+    client = MLAideClient('project key', options=ConnectionOptions(cache_directory='/tmp/mlaide-cache',
+                                                                   artifact_cache_enabled=True,
+                                                                   artifact_cache_max_size=1000))
+
+    # assert
+    mock_artifact_cache.assert_called_once_with(os.path.join('/tmp/mlaide-cache', 'artifacts'), 1000)
+    assert client.artifact_cache_stats == mock_artifact_cache.return_value.stats
+
+
+def test_init_should_not_create_artifact_cache_by_default(mock_authenticated_client, mock_artifact_cache):
+    # act
+    client = MLAideClient('project key')
+
+    # assert
+    mock_artifact_cache.assert_not_called()
+    assert client.artifact_cache_stats is None
+
+
+def test_load_model_should_return_cached_model_if_model_cache_is_enabled(mock_authenticated_client,
+                                                                         mock_active_artifact,
+                                                                         mock_artifact_cache):
+    # arrange
+    client = MLAideClient('project key', options=ConnectionOptions(artifact_cache_enabled=True,
+                                                                   model_cache_max_entries=2))
+    mock_active_artifact.return_value.artifact.version = 3
+    mock_active_artifact.return_value.load_model.return_value = "the deserialized model"
+
+    # act
+    first = client.load_model('model name')
+    second = client.load_model('model name')
+    third = client.load_model('model name', 3)
+
+    # assert
+    assert first == second == third == "the deserialized model"
+    mock_active_artifact.assert_called_once_with(
+        mock_authenticated_client.return_value, 'project key', 'model name', None, None,
+        artifact_cache=mock_artifact_cache.return_value)
+    mock_active_artifact.return_value.load_model.assert_called_once()
+
+
+def test_watch_model_should_watch_production_stage_of_model(mock_authenticated_client,
+                                                            mock_active_artifact,
+                                                            mock_artifact_cache,
+                                                            mocker: MockerFixture):
+    # arrange
+    mock_model_watcher = mocker.patch('mlaide.client.ModelWatcher')
+    client = MLAideClient('project key', options=ConnectionOptions(artifact_cache_enabled=True))
+
+    # act
+    watcher = client.watch_model('model name', interval=5)
+
+    # assert
+    mock_active_artifact.assert_called_once_with(
+        mock_authenticated_client.return_value, 'project key', 'model name', None, ModelStage.PRODUCTION,
+        artifact_cache=mock_artifact_cache.return_value)
+    mock_model_watcher.assert_called_once_with(mock_active_artifact.return_value, interval=5, on_change=None)
+    assert watcher == mock_model_watcher.return_value
+
+
+def test_stats_should_return_request_stats_of_api_client(mock_authenticated_client):
+    # arrange
+    client = MLAideClient('project key')
+
+    # act
+    result = client.stats(reset=True)
+
+    # assert
+    assert result == mock_authenticated_client.return_value.get_request_stats.return_value
+    mock_authenticated_client.return_value.get_request_stats.assert_called_once_with(reset=True)
+
+
+def test_add_request_listener_should_add_listener_to_api_client(mock_authenticated_client):
+    # arrange
+    client = MLAideClient('project key')
+    listener = print
+
+    # act
+    client.add_request_listener(listener)
+
+    # assert
+    mock_authenticated_client.return_value.add_request_listener.assert_called_once_with(listener)
+
+
+def test_close_should_close_hash_cache_that_is_shared_by_all_runs(mock_authenticated_client, mocker: MockerFixture):
+    # arrange
+    hash_cache_mock = mocker.patch('mlaide.client.FileHashCache')
+    active_experiment_mock = mocker.patch('mlaide.client.ActiveExperiment')
+    client = MLAideClient('project key', ConnectionOptions(hash_cache_enabled=True))
+    client.create_experiment('first experiment')
+    client.create_experiment('second experiment')
+
+    # act
+    client.close()
+
+    # assert
+    hash_cache_mock.assert_called_once()
+    assert [c.kwargs['hash_cache'] for c in active_experiment_mock.call_args_list] == \
+        [hash_cache_mock.return_value] * 2
+    hash_cache_mock.return_value.close.assert_called_once_with()
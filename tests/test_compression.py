@@ -0,0 +1,79 @@
+import hashlib
+import io
+import os
+from zipfile import ZipFile
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from mlaide import _compression
+from mlaide.model import InMemoryArtifactFile, LocalArtifactFile
+
+
+def test_resolve_codec_should_use_gzip_for_auto_if_zstandard_is_not_installed(mocker: MockerFixture):
+    # arrange
+    mocker.patch('mlaide._compression.zstandard', None)
+
+    # act / assert
+    assert _compression.resolve_codec('auto') == 'gzip'
+    assert _compression.resolve_codec('none') is None
+    assert _compression.resolve_codec(None) is None
+    with pytest.raises(ValueError, match='zstandard'):
+        _compression.resolve_codec('zstd')
+
+
+def test_resolve_codec_should_raise_error_for_unknown_codec():
+    # act / assert
+    with pytest.raises(ValueError, match="'brotli'"):
+        _compression.resolve_codec('brotli')
+
+
+@pytest.mark.parametrize('codec', ['gzip', 'zstd'])
+def test_compressed_copy_should_compress_file_into_temporary_file(codec, tmp_path):
+    # arrange
+    if codec == 'zstd':
+        pytest.importorskip('zstandard')
+    content = b'0.25,0.75,1\n' * 10_000
+    (tmp_path / 'data.csv').write_bytes(content)
+
+    # act
+    with _compression.compressed_copy(LocalArtifactFile(str(tmp_path / 'data.csv')), codec) as compressed:
+        with open(compressed.path, 'rb') as file:
+            compressed_content = file.read()
+
+    # assert
+    assert _compression.decompress_bytes(io.BytesIO(compressed_content), codec).read() == content
+    assert len(compressed_content) < len(content) / 10
+    assert compressed.file_hash == hashlib.sha256(compressed_content).hexdigest()
+    assert not os.path.exists(compressed.path)
+
+
+def test_compressed_copy_should_rewind_in_memory_file():
+    # arrange
+    file_content = io.BytesIO(b'abc')
+
+    # act
+    with _compression.compressed_copy(InMemoryArtifactFile('data.txt', file_content), 'gzip'):
+        pass
+
+    # assert
+    assert file_content.tell() == 0
+
+
+def test_extract_zip_should_decompress_files(tmp_path):
+    # arrange
+    zip_bytes = io.BytesIO()
+    with ZipFile(zip_bytes, 'w') as z:
+        for name, content in [('data.txt', b'file content'), ('sub/other.txt', b'other content')]:
+            compressed = io.BytesIO()
+            _compression.compress(io.BytesIO(content), compressed, 'gzip')
+            z.writestr(name, compressed.getvalue())
+    zip_bytes.seek(0)
+
+    # act
+    _compression.extract_zip(zip_bytes, str(tmp_path), 'gzip')
+
+    # assert
+    assert (tmp_path / 'data.txt').read_bytes() == b'file content'
+    assert (tmp_path / 'sub' / 'other.txt').read_bytes() == b'other content'
+    assert sorted(os.listdir(tmp_path)) == ['data.txt', 'sub']
@@ -0,0 +1,113 @@
+import hashlib
+import io
+
+from mlaide import _file_utils
+
+
+def test_calculate_checksum_of_file_should_return_sha256_of_file_content(tmp_path):
+    # arrange
+    content = bytes(range(256)) * 1000
+    file = tmp_path / 'data.bin'
+    file.write_bytes(content)
+
+    # act
+    checksum = _file_utils.calculate_checksum_of_file(str(file), buffer_size=1000)
+
+    # assert
+    assert checksum == hashlib.sha256(content).hexdigest()
+
+
+def test_calculate_checksum_of_file_should_return_sha256_of_empty_file(tmp_path):
+    # arrange
+    file = tmp_path / 'empty.bin'
+    file.write_bytes(b'')
+
+    # act
+    checksum = _file_utils.calculate_checksum_of_file(str(file))
+
+    # assert
+    assert checksum == hashlib.sha256(b'').hexdigest()
+
+
+def test_calculate_checksum_of_bytes_should_return_sha256_and_rewind_stream():
+    # arrange
+    content = b'x' * 5000
+    stream = io.BytesIO(content)
+
+    # act
+    checksum = _file_utils.calculate_checksum_of_bytes(stream, buffer_size=1024)
+
+    # assert
+    assert checksum == hashlib.sha256(content).hexdigest()
+    assert stream.tell() == 0
+
+
+def test_chunked_file_reader_should_yield_chunks_of_fixed_size(tmp_path):
+    # arrange
+    file = tmp_path / 'data.bin'
+    file.write_bytes(b'\0' * 2500)
+
+    # act
+    with _file_utils.ChunkedFileReader(file.open('rb'), chunk_size=1000) as reader:
+        chunks = list(reader)
+
+    # assert
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+
+
+def test_chunked_file_reader_should_close_wrapped_file(tmp_path):
+    # arrange
+    file = tmp_path / 'data.bin'
+    file.write_bytes(b'abc')
+    opened_file = file.open('rb')
+
+    # act
+    with _file_utils.ChunkedFileReader(opened_file):
+        pass
+
+    # assert
+    assert opened_file.closed
+
+
+def test_buffer_reader_should_yield_chunks_and_compute_length_by_seeking():
+    # arrange
+    content = bytearray(b'abcdefghij' * 250)
+    reader = _file_utils.BufferReader(memoryview(content), chunk_size=1000)
+
+    # act
+    chunks = list(reader)
+    length = reader.seek(0, io.SEEK_END)
+    reader.seek(0)
+
+    # assert
+    assert b''.join(chunks) == content
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert length == 2500
+    assert _file_utils.calculate_checksum_of_bytes(reader) == hashlib.sha256(content).hexdigest()
+
+
+def test_spooled_file_should_keep_small_content_in_memory():
+    # arrange
+    spooled_file = _file_utils.SpooledFile(max_memory_size=10)
+
+    # act
+    spooled_file.write(b'12345')
+    spooled_file.write(b'67890')
+
+    # assert
+    assert spooled_file.in_memory
+    assert spooled_file.rewind().read() == b'1234567890'
+
+
+def test_spooled_file_should_move_content_to_temporary_file_when_exceeding_max_memory_size():
+    # arrange
+    spooled_file = _file_utils.SpooledFile(max_memory_size=10)
+
+    # act
+    spooled_file.write(b'12345')
+    spooled_file.write(b'678901')
+    spooled_file.write(b'2')
+
+    # assert
+    assert not spooled_file.in_memory
+    assert spooled_file.rewind().read() == b'123456789012'
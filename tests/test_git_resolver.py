@@ -0,0 +1,161 @@
+import os
+import subprocess
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from mlaide import git_resolver
+from mlaide.git_resolver import get_git_metadata
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    git_resolver._cache.clear()
+    yield
+    git_resolver._cache.clear()
+
+
+def _git(directory: Path, *args: str) -> str:
+    env = dict(os.environ,
+               GIT_AUTHOR_NAME='author', GIT_AUTHOR_EMAIL='author@mlaide.com',
+               GIT_COMMITTER_NAME='committer', GIT_COMMITTER_EMAIL='committer@mlaide.com',
+               GIT_COMMITTER_DATE='2021-03-04T05:06:07+0130')
+    return subprocess.run(['git', *args], cwd=directory, env=env, stdout=subprocess.PIPE, check=True,
+                          text=True).stdout.strip()
+
+
+@pytest.fixture
+def repository(tmp_path: Path, monkeypatch) -> Path:
+    _git(tmp_path, 'init', '-q')
+    _git(tmp_path, 'remote', 'add', 'origin', 'git@github.com:MLAide/python-client.git')
+    (tmp_path / 'file.txt').write_text('content')
+    _git(tmp_path, 'add', 'file.txt')
+    _git(tmp_path, 'commit', '-q', '-m', 'initial commit')
+    (tmp_path / 'sub').mkdir()
+    monkeypatch.chdir(tmp_path / 'sub')
+    return tmp_path
+
+
+def test_get_git_metadata_should_return_none_outside_of_repository(tmp_path: Path, monkeypatch):
+    # arrange
+    monkeypatch.chdir(tmp_path)
+
+    # act
+    git = get_git_metadata()
+
+    # assert
+    assert git is None
+
+
+def test_get_git_metadata_should_read_metadata_from_git_directory(repository: Path):
+    # act
+    git = get_git_metadata()
+
+    # assert
+    assert git.commit_hash == _git(repository, 'rev-parse', 'HEAD')
+    assert git.commit_time == datetime(2021, 3, 4, 5, 6, 7, tzinfo=timezone(timedelta(hours=1, minutes=30)))
+    assert git.is_dirty is False
+    assert git.repository_uri == 'git@github.com:MLAide/python-client.git'
+
+
+def test_get_git_metadata_should_read_packed_refs_and_objects(repository: Path):
+    # arrange
+    _git(repository, 'gc', '-q')
+
+    # act
+    git = get_git_metadata()
+
+    # assert
+    assert git.commit_hash == _git(repository, 'rev-parse', 'HEAD')
+    assert git.commit_time == datetime(2021, 3, 4, 5, 6, 7, tzinfo=timezone(timedelta(hours=1, minutes=30)))
+
+
+def test_get_git_metadata_should_read_metadata_of_worktree(repository: Path, tmp_path_factory, monkeypatch):
+    # arrange
+    worktree = tmp_path_factory.mktemp('worktree') / 'tree'
+    _git(repository, 'worktree', 'add', '-q', '-b', 'feature', str(worktree))
+    monkeypatch.chdir(worktree)
+
+    # act
+    git = get_git_metadata()
+
+    # assert
+    assert git.commit_hash == _git(repository, 'rev-parse', 'HEAD')
+    assert git.repository_uri == 'git@github.com:MLAide/python-client.git'
+
+
+def test_get_git_metadata_should_return_none_as_repository_uri_if_remote_does_not_exist(repository: Path):
+    # act
+    git = get_git_metadata(remote_name='upstream')
+
+    # assert
+    assert git.repository_uri is None
+
+
+def test_get_git_metadata_should_detect_changes_of_tracked_files(repository: Path):
+    # arrange
+    (repository / 'file.txt').write_text('changed')
+
+    # act
+    git = get_git_metadata()
+
+    # assert
+    assert git.is_dirty is True
+
+
+def test_get_git_metadata_should_ignore_untracked_files_by_default(repository: Path):
+    # arrange
+    (repository / 'untracked.txt').write_text('untracked')
+
+    # act
+    git = get_git_metadata()
+    git_with_untracked_files = get_git_metadata(untracked_files=True)
+
+    # assert
+    assert git.is_dirty is False
+    assert git_with_untracked_files.is_dirty is True
+
+
+def test_get_git_metadata_should_skip_dirty_check(repository: Path, mocker: MockerFixture):
+    # arrange
+    run_mock = mocker.patch('mlaide.git_resolver.subprocess.run')
+
+    # act
+    git = get_git_metadata(dirty_check=False)
+
+    # assert
+    assert git.is_dirty is None
+    run_mock.assert_not_called()
+
+
+def test_get_git_metadata_should_return_unknown_dirty_state_if_dirty_check_times_out(repository: Path,
+                                                                                      mocker: MockerFixture):
+    # arrange
+    run_mock = mocker.patch('mlaide.git_resolver.subprocess.run',
+                            side_effect=subprocess.TimeoutExpired(cmd='git status', timeout=0.5))
+
+    # act
+    git = get_git_metadata(dirty_check_timeout=0.5)
+
+    # assert
+    assert git.is_dirty is None
+    assert run_mock.call_args.kwargs['timeout'] == 0.5
+
+
+def test_get_git_metadata_should_cache_metadata_until_head_changes(repository: Path, mocker: MockerFixture):
+    # arrange
+    is_dirty_spy = mocker.spy(git_resolver, '_is_dirty')
+    first = get_git_metadata()
+
+    # act
+    second = get_git_metadata()
+    _git(repository, 'commit', '-q', '--allow-empty', '-m', 'second commit')
+    third = get_git_metadata()
+
+    # assert
+    assert second is first
+    assert third.commit_hash == _git(repository, 'rev-parse', 'HEAD')
+    assert third.commit_hash != first.commit_hash
+    assert is_dirty_spy.call_count == 2
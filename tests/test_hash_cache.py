@@ -0,0 +1,148 @@
+import os
+import sqlite3
+
+import pytest
+from pytest_mock.plugin import MockerFixture
+
+from mlaide._hash_cache import FileHashCache
+
+
+def test_get_or_compute_should_compute_hash_only_once_for_unchanged_file(tmp_path, mocker: MockerFixture):
+    # arrange
+    file = tmp_path / 'data.csv'
+    file.write_text('a,b,c')
+    compute_hash = mocker.Mock(return_value='the hash')
+    cache = FileHashCache(str(tmp_path / 'cache'))
+
+    # act
+    first = cache.get_or_compute(str(file), compute_hash)
+    second = cache.get_or_compute(str(file), compute_hash)
+
+    # assert
+    assert first == 'the hash'
+    assert second == 'the hash'
+    compute_hash.assert_called_once_with(str(file))
+    cache.close()
+
+
+def test_get_or_compute_should_persist_hashes_across_instances(tmp_path, mocker: MockerFixture):
+    # arrange
+    file = tmp_path / 'data.csv'
+    file.write_text('a,b,c')
+    FileHashCache(str(tmp_path / 'cache')).get_or_compute(str(file), lambda _: 'the hash')
+    compute_hash = mocker.Mock(return_value='another hash')
+
+    # act
+    file_hash = FileHashCache(str(tmp_path / 'cache')).get_or_compute(str(file), compute_hash)
+
+    # assert
+    assert file_hash == 'the hash'
+    compute_hash.assert_not_called()
+
+
+def test_get_or_compute_should_compute_hash_again_if_file_was_modified(tmp_path, mocker: MockerFixture):
+    # arrange
+    file = tmp_path / 'data.csv'
+    file.write_text('a,b,c')
+    cache = FileHashCache(str(tmp_path / 'cache'))
+    cache.get_or_compute(str(file), lambda _: 'old hash')
+
+    file.write_text('a,b,c,d')
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    compute_hash = mocker.Mock(return_value='new hash')
+
+    # act
+    file_hash = cache.get_or_compute(str(file), compute_hash)
+
+    # assert
+    assert file_hash == 'new hash'
+    compute_hash.assert_called_once()
+    cache.close()
+
+
+def test_get_or_compute_should_not_cache_hash_if_file_changes_while_hashing(tmp_path, mocker: MockerFixture):
+    # arrange
+    file = tmp_path / 'data.csv'
+    file.write_text('a,b,c')
+    cache = FileHashCache(str(tmp_path / 'cache'))
+
+    def modify_while_hashing(path):
+        with open(path, 'a') as f:
+            f.write(',d')
+        return 'stale hash'
+
+    cache.get_or_compute(str(file), modify_while_hashing)
+    compute_hash = mocker.Mock(return_value='current hash')
+
+    # act
+    file_hash = cache.get_or_compute(str(file), compute_hash)
+
+    # assert
+    assert file_hash == 'current hash'
+    cache.close()
+
+
+def test_get_or_compute_should_evict_least_recently_used_entries(tmp_path, mocker: MockerFixture):
+    # arrange
+    mocker.patch('mlaide._hash_cache._EVICTION_INTERVAL', 1)
+    files = []
+    for i in range(3):
+        file = tmp_path / f'data-{i}.csv'
+        file.write_text(str(i))
+        files.append(str(file))
+    cache = FileHashCache(str(tmp_path / 'cache'), max_entries=2)
+    for file in files:
+        cache.get_or_compute(file, lambda path: path + '-hash')
+    compute_hash = mocker.Mock(return_value='recomputed')
+
+    # act
+    first_file_hash = cache.get_or_compute(files[0], compute_hash)
+
+    # assert
+    assert first_file_hash == 'recomputed'
+    cache.close()
+
+
+def test_get_or_compute_should_write_last_used_of_hits_only_on_flush(tmp_path, mocker: MockerFixture):
+    # arrange
+    file = tmp_path / 'data.csv'
+    file.write_text('a,b,c')
+    time_mock = mocker.patch('mlaide._hash_cache.time.time', return_value=100.0)
+    cache = FileHashCache(str(tmp_path / 'cache'))
+    cache.get_or_compute(str(file), lambda _: 'the hash')
+    time_mock.return_value = 200.0
+
+    def read_last_used():
+        with sqlite3.connect(str(tmp_path / 'cache' / 'file-hashes.sqlite')) as connection:
+            return connection.execute("SELECT last_used FROM file_hashes").fetchone()[0]
+
+    # act
+    cache.get_or_compute(str(file), lambda _: 'another hash')
+    last_used_before_flush = read_last_used()
+    cache.flush()
+
+    # assert
+    assert last_used_before_flush == 100.0
+    assert read_last_used() == 200.0
+    cache.close()
+
+
+def test_get_or_compute_should_compute_hash_without_cache_if_database_cannot_be_created(tmp_path,
+                                                                                       mocker: MockerFixture):
+    # arrange
+    file = tmp_path / 'data.csv'
+    file.write_text('a,b,c')
+    # the cache directory cannot be created below a regular file
+    cache = FileHashCache(str(file / 'cache'))
+    compute_hash = mocker.Mock(return_value='the hash')
+
+    # act
+    with pytest.warns(RuntimeWarning):
+        first = cache.get_or_compute(str(file), compute_hash)
+    second = cache.get_or_compute(str(file), compute_hash)
+    cache.close()
+
+    # assert
+    assert (first, second) == ('the hash', 'the hash')
+    assert compute_hash.call_count == 2
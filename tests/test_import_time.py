@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Generous budget for slow CI machines, `import mlaide.client` takes about 150 ms on a developer machine
+IMPORT_TIME_BUDGET_SECONDS = 1.0
+PROJECT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_mlaide_client(code: str = 'import mlaide.client') -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=PROJECT_DIRECTORY, capture_output=True, text=True, check=True)
+
+
+def test_import_should_stay_within_budget():
+    # act
+    result = _import_mlaide_client()
+
+    # assert
+    # Each line of -X importtime has the format "import time: <self us> | <cumulative us> | <indentation><module>"
+    cumulative_times = [int(line.split('|')[1])
+                        for line in result.stderr.splitlines()
+                        if line.startswith('import time:') and line.split('|')[2] in (' mlaide', ' mlaide.client')]
+    assert len(cumulative_times) > 0
+    assert sum(cumulative_times) / 1_000_000 < IMPORT_TIME_BUDGET_SECONDS
+
+
+@pytest.mark.parametrize('module', ['httpx', 'git', 'cloudpickle', 'asyncio'])
+def test_import_should_not_import_module(module: str):
+    # act
+    result = _import_mlaide_client(f'import sys, mlaide.client; print({module!r} in sys.modules)')
+
+    # assert
+    assert result.stdout.strip() == 'False'
+
+
+def test_lazy_attributes_should_be_resolved_on_access():
+    # act
+    result = _import_mlaide_client('import mlaide; print(mlaide.MLAideClient.__module__, mlaide.ModelStage.__name__)')
+
+    # assert
+    assert result.stdout.strip() == 'mlaide.client ModelStage'
+
+
+def test_api_clients_should_be_importable_from_package():
+    # act
+    from mlaide import AuthenticatedClient, Client
+
+    # assert
+    assert AuthenticatedClient.__module__ == Client.__module__ == 'mlaide._api_client.client'
+    assert issubclass(AuthenticatedClient, Client)
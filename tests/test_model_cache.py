@@ -0,0 +1,130 @@
+from pytest_mock.plugin import MockerFixture
+import threading
+import time
+import pytest
+
+from mlaide._model_cache import ModelCache, estimate_size
+
+
+def test_get_or_load_should_load_model_only_once():
+    # arrange
+    cache = ModelCache(max_entries=2)
+    calls = []
+
+    def load():
+        calls.append(1)
+        return 'model'
+
+    # act
+    first = cache.get_or_load(('model', 1), load)
+    second = cache.get_or_load(('model', 1), load)
+
+    # assert
+    assert first == second == 'model'
+    assert len(calls) == 1
+
+
+def test_get_or_load_should_evict_least_recently_used_model_when_exceeding_max_entries():
+    # arrange
+    cache = ModelCache(max_entries=2)
+    cache.get_or_load(1, lambda: 'model 1')
+    cache.get_or_load(2, lambda: 'model 2')
+    cache.get_or_load(1, lambda: 'reloaded model 1')
+
+    # act
+    cache.get_or_load(3, lambda: 'model 3')
+
+    # assert
+    assert cache.get_or_load(1, lambda: 'reloaded model 1') == 'model 1'
+    assert cache.get_or_load(2, lambda: 'reloaded model 2') == 'reloaded model 2'
+
+
+def test_get_or_load_should_evict_models_when_exceeding_max_bytes():
+    # arrange
+    cache = ModelCache(max_entries=10, max_bytes=100, size_of=lambda model: 60)
+    cache.get_or_load(1, lambda: 'model 1')
+
+    # act
+    cache.get_or_load(2, lambda: 'model 2')
+
+    # assert
+    assert cache.get_or_load(1, lambda: 'reloaded model 1') == 'reloaded model 1'
+
+
+def test_get_or_load_should_not_estimate_size_if_max_bytes_is_not_set(mocker: MockerFixture):
+    # arrange
+    estimate_size_mock = mocker.patch('mlaide._model_cache.estimate_size')
+    cache = ModelCache(max_entries=10)
+
+    # act
+    cache.get_or_load(1, lambda: 'model 1')
+
+    # assert
+    estimate_size_mock.assert_not_called()
+
+
+def test_get_or_load_should_load_model_only_once_for_concurrent_requests():
+    # arrange
+    cache = ModelCache(max_entries=2)
+    calls = []
+    started = threading.Event()
+
+    def load():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return object()
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('key', load))) for _ in range(5)]
+
+    # act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # assert
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(result is results[0] for result in results)
+
+
+def test_get_or_load_should_not_cache_failed_loads():
+    # arrange
+    cache = ModelCache(max_entries=2)
+
+    def fail():
+        raise IOError('download failed')
+
+    # act
+    with pytest.raises(IOError):
+        cache.get_or_load('key', fail)
+
+    # assert
+    assert cache.get_or_load('key', lambda: 'model') == 'model'
+
+
+def test_get_version_should_return_resolved_version_until_ttl_expires():
+    # arrange
+    now = [100.0]
+    cache = ModelCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    cache.set_version(('model', None), 4)
+
+    # act
+    now[0] = 109.0
+    version_before_expiry = cache.get_version(('model', None))
+    now[0] = 110.0
+    version_after_expiry = cache.get_version(('model', None))
+
+    # assert
+    assert version_before_expiry == 4
+    assert version_after_expiry is None
+
+
+def test_estimate_size_should_return_size_of_serialized_model():
+    # act
+    size = estimate_size(b'x' * 1000)
+
+    # assert
+    assert 1000 < size < 1100
@@ -0,0 +1,290 @@
+import io
+import json
+import mmap
+import os
+import pickle
+import shutil
+import sys
+import types
+from zipfile import ZipFile
+
+import cloudpickle
+import pytest
+
+from mlaide import _model_deser, model_flavor
+from mlaide.model import InMemoryArtifactFile, LocalArtifactFile
+from mlaide.model_flavor import ModelFlavor, register_model_flavor
+
+
+class Estimator(object):
+    # The sklearn flavor detects models by the module of their class
+    __module__ = 'sklearn.linear_model'
+
+    def __init__(self, weights, bias):
+        self.weights = weights
+        self.bias = bias
+
+    def __reduce_ex__(self, protocol):
+        return type(self), (pickle.PickleBuffer(self.weights), pickle.PickleBuffer(self.bias))
+
+
+class TextModel(object):
+    def __init__(self, text: str):
+        self.text = text
+
+
+class TextFlavor(ModelFlavor):
+    name = 'text'
+
+    def can_serialize(self, model):
+        return isinstance(model, TextModel)
+
+    def serialize(self, model, staging_directory, buffer_min_size=0):
+        return [InMemoryArtifactFile(file_name='model.txt', file_content=io.BytesIO(model.text.encode('utf-8')))]
+
+    def properties(self, model):
+        return {'encoding': 'utf-8'}
+
+    def deserialize(self, directory, properties):
+        with open(f'{directory}/model.txt', 'r', encoding=properties['encoding']) as file:
+            return TextModel(file.read())
+
+
+class Module(object):
+    # The base class of torch modules, without torch
+    __module__ = 'torch.nn.modules.module'
+
+
+class Linear(Module):
+    def __init__(self, size: int = 0):
+        self.weight = [0.0] * size
+
+    def state_dict(self):
+        return {'weight': self.weight}
+
+    def load_state_dict(self, state):
+        self.weight = state['weight']
+
+
+def fake_torch(mocker):
+    """Replaces torch with pickle and records the arguments of `torch.load`"""
+    def load(path, weights_only=False):
+        load_kwargs.append({'weights_only': weights_only})
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+
+    load_kwargs = []
+    torch = types.SimpleNamespace(save=pickle.dump, load=load, load_kwargs=load_kwargs)
+    mocker.patch.dict(sys.modules, {'torch': torch})
+    return torch
+
+
+class Model(object):
+    # A keras model that writes a SavedModel without tensorflow
+    __module__ = 'keras.engine.training'
+
+    def save(self, directory, save_format):
+        os.makedirs(os.path.join(directory, 'variables'))
+        with open(os.path.join(directory, 'saved_model.pb'), 'wb') as file:
+            file.write(b'graph')
+        with open(os.path.join(directory, 'variables', 'variables.index'), 'wb') as file:
+            file.write(b'index')
+        with open(os.path.join(directory, 'variables', 'variables.data-00000-of-00001'), 'wb') as file:
+            file.write(b'\0' * 2000)
+
+
+@pytest.fixture
+def restore_flavors(mocker):
+    mocker.patch.object(model_flavor, '_flavors', list(model_flavor._flavors))
+
+
+def write_files(files, directory):
+    for file in files:
+        if isinstance(file, LocalArtifactFile):
+            target = directory / file.artifact_file_name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(file.file_name, target)
+        else:
+            with open(directory / file.file_name, 'wb') as target:
+                for chunk in file.file_content:
+                    target.write(chunk)
+
+
+def test_serialize_should_store_sklearn_model_in_model_pkl_and_record_flavor_in_manifest(tmp_path):
+    # arrange
+    model = Estimator(bytearray(b'w' * 5000), bytearray(b'b' * 10))
+
+    # act
+    with _model_deser.serialize(model) as files:
+        write_files(files, tmp_path)
+
+    # assert
+    assert [file.file_name for file in files] == ['model.pkl', 'flavor.json']
+    assert json.loads((tmp_path / 'flavor.json').read_text()) == {'flavor': 'sklearn', 'properties': {}}
+    assert (tmp_path / 'model.pkl').stat().st_size > 5000
+    assert _model_deser.deserialize(str(tmp_path)).bias == bytearray(b'b' * 10)
+
+
+def test_serialize_should_store_large_buffers_as_separate_files_that_are_memory_mapped(tmp_path):
+    # arrange
+    model = Estimator(bytearray(b'w' * 5000), bytearray(b'b' * 10))
+
+    # act
+    with _model_deser.serialize(model, buffer_min_size=1000) as files:
+        write_files(files, tmp_path)
+    restored_model = _model_deser.deserialize(str(tmp_path))
+
+    # assert
+    assert [file.file_name for file in files] == ['model.pkl', 'model-buffer-0.bin', 'flavor.json']
+    assert (tmp_path / 'model.pkl').stat().st_size < 1000
+    assert isinstance(restored_model.weights, mmap.mmap)
+    assert restored_model.weights[:] == b'w' * 5000
+    assert restored_model.bias == bytearray(b'b' * 10)
+
+
+def test_serialize_should_pickle_models_of_unknown_frameworks(tmp_path):
+    # act
+    with _model_deser.serialize({'weights': [1, 2, 3]}) as files:
+        write_files(files, tmp_path)
+
+    # assert
+    assert json.loads((tmp_path / 'flavor.json').read_text())['flavor'] == 'pickle'
+    assert _model_deser.deserialize(str(tmp_path)) == {'weights': [1, 2, 3]}
+
+
+def test_deserialize_should_unpickle_model_pkl_of_artifact_without_manifest(tmp_path):
+    # arrange
+    (tmp_path / 'model.pkl').write_bytes(cloudpickle.dumps({'weights': [1, 2, 3]}))
+
+    # act
+    model = _model_deser.deserialize(str(tmp_path))
+
+    # assert
+    assert model == {'weights': [1, 2, 3]}
+
+
+def test_registered_flavor_should_take_precedence_and_be_used_to_load_the_model(restore_flavors, tmp_path):
+    # arrange
+    register_model_flavor(TextFlavor())
+
+    # act
+    with _model_deser.serialize(TextModel('hello')) as files:
+        write_files(files, tmp_path)
+    model = _model_deser.deserialize(str(tmp_path))
+
+    # assert
+    assert [file.file_name for file in files] == ['model.txt', 'flavor.json']
+    assert json.loads((tmp_path / 'flavor.json').read_text()) == {'flavor': 'text', 'properties': {'encoding': 'utf-8'}}
+    assert isinstance(model, TextModel)
+    assert model.text == 'hello'
+
+
+def test_deserialize_should_raise_error_if_flavor_is_not_registered(tmp_path):
+    # arrange
+    (tmp_path / 'flavor.json').write_text(json.dumps({'flavor': 'unknown', 'properties': {}}))
+
+    # act / assert
+    with pytest.raises(ValueError, match="'unknown'"):
+        _model_deser.deserialize(str(tmp_path))
+
+
+def test_get_buffer_file_names_should_order_files_by_index():
+    # act
+    file_names = model_flavor.get_buffer_file_names(
+        ['model-buffer-10.bin', 'model.pkl', 'model-buffer-2.bin', 'data.txt', 'model-buffer-0.bin'])
+
+    # assert
+    assert file_names == ['model-buffer-0.bin', 'model-buffer-2.bin', 'model-buffer-10.bin']
+
+
+def test_find_model_flavor_should_detect_framework_by_class_names_without_importing_it():
+    # arrange
+    booster = type('Booster', (object,), {'__module__': 'xgboost.core'})()
+    classifier = type('XGBClassifier', (type('XGBModel', (object,), {'__module__': 'xgboost.sklearn'}),),
+                      {'__module__': 'xgboost.sklearn'})()
+    module = type('Linear', (type('Module', (object,), {'__module__': 'torch.nn.modules.module'}),),
+                  {'__module__': 'my_package.model'})()
+
+    # act / assert
+    assert model_flavor.find_model_flavor(booster).name == 'xgboost'
+    assert model_flavor.find_model_flavor(classifier).name == 'xgboost'
+    assert model_flavor.find_model_flavor(module).name == 'torch'
+
+
+def test_torch_flavor_should_store_state_dict_and_load_it_into_new_module(mocker, tmp_path):
+    # arrange
+    torch = fake_torch(mocker)
+
+    # act
+    with _model_deser.serialize(Linear(2)) as files:
+        write_files(files, tmp_path)
+    model = _model_deser.deserialize(str(tmp_path))
+
+    # assert
+    with open(tmp_path / 'model.pt', 'rb') as file:
+        assert pickle.load(file) == {'weight': [0.0, 0.0]}
+    assert isinstance(model, Linear)
+    assert model.weight == [0.0, 0.0]
+    assert torch.load_kwargs == [{'weights_only': True}]
+
+
+def test_torch_flavor_should_create_module_with_registered_constructor(mocker, restore_flavors, tmp_path):
+    # arrange
+    fake_torch(mocker)
+    class_names = []
+
+    def create_module(class_name):
+        class_names.append(class_name)
+        return Linear(5)
+
+    register_model_flavor(model_flavor.TorchFlavor(create_module=create_module))
+    module = Linear(2)
+    module.weight = [1.0, 2.0]
+
+    # act
+    with _model_deser.serialize(module) as files:
+        write_files(files, tmp_path)
+    model = _model_deser.deserialize(str(tmp_path))
+
+    # assert
+    assert class_names == [f'{Linear.__module__}:Linear']
+    assert model.weight == [1.0, 2.0]
+
+
+def test_keras_flavor_should_upload_large_files_from_staging_directory_and_pack_small_files(mocker, tmp_path):
+    # arrange
+    mocker.patch.object(model_flavor.KerasFlavor, 'pack_max_file_size', 1000)
+
+    # act
+    with _model_deser.serialize(Model()) as files:
+        local_files = [file for file in files if isinstance(file, LocalArtifactFile)]
+        staged_files_exist = all(os.path.isfile(file.file_name) for file in local_files)
+        write_files(files, tmp_path / 'artifact')
+
+    # assert
+    assert sorted(file.artifact_file_name for file in local_files) == \
+        ['saved_model.zip', 'variables/variables.data-00000-of-00001']
+    assert staged_files_exist
+    assert not any(os.path.exists(file.file_name) for file in local_files)
+    with ZipFile(tmp_path / 'artifact' / 'saved_model.zip') as pack:
+        assert sorted(pack.namelist()) == ['saved_model.pb', 'variables/variables.index']
+
+
+def test_keras_flavor_should_restore_saved_model_directory(mocker, tmp_path):
+    # arrange
+    mocker.patch.object(model_flavor.KerasFlavor, 'pack_max_file_size', 1000)
+    with _model_deser.serialize(Model()) as files:
+        write_files(files, tmp_path)
+
+    def load_model(directory):
+        return sorted(os.path.relpath(os.path.join(root, file_name), directory).replace(os.sep, '/')
+                      for root, _, file_names in os.walk(directory) for file_name in file_names)
+
+    keras = types.SimpleNamespace(models=types.SimpleNamespace(load_model=load_model))
+    mocker.patch.dict(sys.modules, {'tensorflow': types.SimpleNamespace(keras=keras)})
+
+    # act
+    restored_files = _model_deser.deserialize(str(tmp_path))
+
+    # assert
+    assert restored_files == ['saved_model.pb', 'variables/variables.data-00000-of-00001', 'variables/variables.index']
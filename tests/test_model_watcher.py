@@ -0,0 +1,79 @@
+from pytest_mock.plugin import MockerFixture
+import threading
+import pytest
+
+from mlaide.model import Artifact
+from mlaide.model_watcher import ModelWatcher
+
+
+@pytest.fixture
+def artifact_mock(mocker: MockerFixture):
+    artifact = mocker.MagicMock()
+    artifact.artifact = Artifact(name='model', version=1)
+    artifact.load_model.return_value = 'model 1'
+    artifact.refresh.return_value = False
+    return artifact
+
+
+def test_init_should_load_current_model(artifact_mock):
+    # act
+    with ModelWatcher(artifact_mock, interval=60) as watcher:
+        # assert
+        assert watcher.model == 'model 1'
+        assert watcher.version == 1
+
+
+def test_check_should_swap_model_if_version_changed(artifact_mock, mocker: MockerFixture):
+    # arrange
+    on_change = mocker.MagicMock()
+    with ModelWatcher(artifact_mock, interval=60, on_change=on_change) as watcher:
+        artifact_mock.refresh.return_value = True
+        artifact_mock.artifact = Artifact(name='model', version=2)
+        artifact_mock.load_model.return_value = 'model 2'
+
+        # act
+        changed = watcher.check()
+
+        # assert
+        assert changed
+        assert watcher.model == 'model 2'
+        assert watcher.version == 2
+        on_change.assert_called_once_with('model 2', 2)
+
+
+def test_watcher_should_check_periodically_and_keep_model_on_error(artifact_mock):
+    # arrange
+    checked = threading.Event()
+    error = IOError('server not available')
+
+    def refresh():
+        checked.set()
+        raise error
+
+    artifact_mock.refresh.side_effect = refresh
+
+    # act
+    with ModelWatcher(artifact_mock, interval=0.01) as watcher:
+        assert checked.wait(5)
+
+    # assert
+    assert watcher.model == 'model 1'
+    assert watcher.last_error is error
+
+
+def test_check_should_load_new_version_again_if_loading_failed(artifact_mock):
+    # arrange
+    with ModelWatcher(artifact_mock, interval=60) as watcher:
+        artifact_mock.refresh.side_effect = [True, False]
+        artifact_mock.artifact = Artifact(name='model', version=2)
+        artifact_mock.load_model.side_effect = [IOError('download failed'), 'model 2']
+
+        # act
+        with pytest.raises(IOError):
+            watcher.check()
+        changed = watcher.check()
+
+        # assert
+        assert changed
+        assert watcher.model == 'model 2'
+        assert watcher.version == 2
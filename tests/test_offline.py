@@ -0,0 +1,208 @@
+import io
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from mlaide import _artifact_cache, _offline
+from mlaide._api_client.dto import ArtifactDto, ExperimentDto, FileHashDto, RunDto, StatusDto
+from mlaide._offline import OfflineLog
+from mlaide.client import MLAideClient
+from mlaide.connection_options import ConnectionOptions
+from mlaide.model import InMemoryArtifactFile, LocalArtifactFile, NewArtifact, RunStatus
+
+
+@pytest.fixture
+def api_mocks(mocker: MockerFixture):
+    experiment_api = mocker.patch('mlaide._offline.experiment_api')
+    experiment_api.create_experiment.return_value = ExperimentDto(key='experiment-key')
+    run_api = mocker.patch('mlaide._offline.run_api')
+    run_api.create_run.side_effect = [RunDto(key=100), RunDto(key=101)]
+    artifact_api = mocker.patch('mlaide._offline.artifact_api')
+    artifact_api.find_artifact_by_file_hashes.return_value = None
+    artifact_api.create_artifact.return_value = ArtifactDto(name='model', version=3)
+    uploaded_files = {}
+    artifact_api.upload_file.side_effect = lambda **kwargs: uploaded_files.update(
+        {kwargs['filename']: kwargs['file'].read()})
+    return experiment_api, run_api, artifact_api, uploaded_files
+
+
+@pytest.fixture
+def offline_directory(tmp_path: Path) -> Path:
+    return tmp_path / 'offline'
+
+
+def _read_log(log: OfflineLog):
+    with open(log.path) as file:
+        return [json.loads(line) for line in file]
+
+
+def test_offline_log_should_append_records_with_local_keys(offline_directory: Path):
+    # arrange
+    log = OfflineLog(str(offline_directory), 'project key')
+
+    # act
+    experiment_key = log.create_experiment('experiment')
+    first_run_key = log.create_run(RunDto(name='first run', status=StatusDto.RUNNING), experiment_key)
+    second_run_key = log.create_run(RunDto(name='second run', status=StatusDto.RUNNING), experiment_key)
+    log.log_metrics(first_run_key, {'accuracy': 0.9})
+
+    # assert
+    records = _read_log(log)
+    log.close()
+    assert experiment_key == 'offline-1'
+    assert (first_run_key, second_run_key) == (-1, -2)
+    assert [record['op'] for record in records] == \
+           ['open', 'create_experiment', 'create_run', 'create_run', 'log_metrics']
+    assert records[0]['project_key'] == 'project key'
+    assert records[2]['run'] == {'name': 'first run', 'status': 'RUNNING'}
+
+
+def test_offline_log_should_store_artifact_files_by_content_hash(offline_directory: Path, tmp_path: Path,
+                                                                 monkeypatch):
+    # arrange
+    monkeypatch.chdir(tmp_path)
+    Path('weights.bin').write_bytes(b'local content')
+    log = OfflineLog(str(offline_directory), 'project key')
+    artifact = NewArtifact(name='model', type='model', files=[
+        InMemoryArtifactFile('model.pkl', io.BytesIO(b'in memory content')),
+        LocalArtifactFile('weights.bin')
+    ])
+    file_hashes = [FileHashDto('model.pkl', 'hash-1'), FileHashDto('weights.bin', 'hash-2')]
+
+    # act
+    log.add_artifact(-1, artifact, file_hashes, model=True)
+
+    # assert
+    log.close()
+    assert (offline_directory / 'objects' / 'hash-1').read_bytes() == b'in memory content'
+    assert (offline_directory / 'objects' / 'hash-2').read_bytes() == b'local content'
+    assert _read_log(log)[1]['files'] == [{'file_name': 'model.pkl', 'file_hash': 'hash-1'},
+                                          {'file_name': 'weights.bin', 'file_hash': 'hash-2'}]
+
+
+def test_offline_run_should_be_synced_to_server(api_mocks, tmp_path: Path, mocker: MockerFixture):
+    # arrange
+    experiment_api, run_api, artifact_api, uploaded_files = api_mocks
+    mocker.patch('mlaide.active_experiment.get_git_metadata', return_value=None)
+    options = ConnectionOptions(cache_directory=str(tmp_path), offline=True, hash_cache_enabled=False)
+    with MLAideClient('project key', options) as offline_client:
+        run = offline_client.create_experiment('experiment').start_new_run('run')
+        run.log_parameters({'lr': 0.1})
+        run.log_metrics_epoch('1', {'loss': 0.5})
+        run.log_metrics_epoch('2', {'loss': 0.4})
+        run.log_metric('accuracy', 0.9)
+        run.add_artifact(NewArtifact(name='model', type='model',
+                                     files=[InMemoryArtifactFile('model.pkl', io.BytesIO(b'model'))]))
+        run.set_completed_status()
+
+    client = MLAideClient('project key', ConnectionOptions(cache_directory=str(tmp_path)))
+
+    # act
+    synced = client.sync()
+
+    # assert
+    assert synced == 1
+    assert experiment_api.create_experiment.call_args.kwargs['experiment'] == ExperimentDto(name='experiment')
+    created_run = run_api.create_run.call_args.kwargs['run']
+    assert created_run.name == 'run'
+    assert created_run.experiment_refs[0].experiment_key == 'experiment-key'
+
+    # consecutive metrics and parameters are sent as one merge patch per resource
+    run_api.update_run_parameters.assert_called_once_with(client=client.api_client, project_key='project key',
+                                                          run_key=100, parameters={'lr': 0.1})
+    run_api.update_run_metrics.assert_called_once_with(client=client.api_client, project_key='project key',
+                                                       run_key=100,
+                                                       metrics={'loss': {'1': 0.5, '2': 0.4}, 'accuracy': 0.9})
+
+    assert artifact_api.create_artifact.call_args.kwargs['run_key'] == 100
+    assert uploaded_files == {'model.pkl': b'model'}
+    assert run_api.partial_update_run.call_args.kwargs['run'].status == StatusDto.COMPLETED
+
+    # synced logs and their files are deleted
+    assert os.listdir(tmp_path / 'offline' / 'objects') == ['.lock']
+    assert not [name for name in os.listdir(tmp_path / 'offline') if name.endswith('.wal')]
+
+
+def test_sync_should_continue_where_interrupted_sync_stopped(api_mocks, offline_directory: Path):
+    # arrange
+    experiment_api, run_api, artifact_api, _ = api_mocks
+    log = OfflineLog(str(offline_directory), 'project key')
+    run_key = log.create_run(RunDto(name='run', status=StatusDto.RUNNING), None)
+    log.log_metrics(run_key, {'accuracy': 0.9})
+    log.set_status(run_key, RunStatus.COMPLETED, datetime(2021, 3, 4))
+    log.close()
+    run_api.update_run_metrics.side_effect = [ConnectionError('server not reachable'), None]
+
+    with pytest.raises(ConnectionError):
+        _offline.sync('client', str(offline_directory), 'project key')
+
+    # act
+    synced = _offline.sync('client', str(offline_directory), 'project key')
+
+    # assert
+    assert synced == 1
+    run_api.create_run.assert_called_once()
+    assert run_api.update_run_metrics.call_count == 2
+    assert run_api.update_run_metrics.call_args.kwargs['run_key'] == 100
+    run_api.partial_update_run.assert_called_once()
+
+
+@pytest.mark.skipif(_artifact_cache.fcntl is None, reason='file locks are not supported on this platform')
+def test_sync_should_skip_logs_that_are_still_written(api_mocks, offline_directory: Path):
+    # arrange
+    _, run_api, _, _ = api_mocks
+    log = OfflineLog(str(offline_directory), 'project key')
+    log.create_run(RunDto(name='run', status=StatusDto.RUNNING), None)
+
+    # act
+    synced = _offline.sync('client', str(offline_directory), 'project key')
+
+    # assert
+    log.close()
+    assert synced == 0
+    run_api.create_run.assert_not_called()
+    assert os.path.exists(log.path)
+
+
+def test_sync_should_skip_logs_of_other_projects(api_mocks, offline_directory: Path):
+    # arrange
+    _, run_api, _, _ = api_mocks
+    log = OfflineLog(str(offline_directory), 'other project')
+    log.create_run(RunDto(name='run', status=StatusDto.RUNNING), None)
+    log.close()
+
+    # act
+    synced = _offline.sync('client', str(offline_directory), 'project key')
+
+    # assert
+    assert synced == 0
+    run_api.create_run.assert_not_called()
+
+
+def test_sync_should_attach_existing_artifact_and_register_model(api_mocks, offline_directory: Path):
+    # arrange
+    _, run_api, artifact_api, uploaded_files = api_mocks
+    artifact_api.find_artifact_by_file_hashes.return_value = ArtifactDto(name='model', version=7)
+    log = OfflineLog(str(offline_directory), 'project key')
+    run_key = log.create_run(RunDto(name='run', status=StatusDto.RUNNING), None)
+    log.add_artifact(run_key,
+                     NewArtifact(name='model', type='model',
+                                 files=[InMemoryArtifactFile('model.pkl', io.BytesIO(b'model'))]),
+                     [FileHashDto('model.pkl', 'hash')],
+                     model=True)
+    log.close()
+
+    # act
+    _offline.sync('client', str(offline_directory), 'project key')
+
+    # assert
+    run_api.attach_artifact_to_run.assert_called_once_with(client='client', project_key='project key', run_key=100,
+                                                           artifact_name='model', artifact_version=7)
+    artifact_api.create_artifact.assert_not_called()
+    assert uploaded_files == {}
+    artifact_api.create_model.assert_called_once_with(client='client', project_key='project key',
+                                                      artifact_name='model', artifact_version=7)
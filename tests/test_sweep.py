@@ -0,0 +1,215 @@
+import json
+import multiprocessing
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from mlaide import _sweep
+from mlaide._api_client import AuthenticatedClient
+from mlaide.active_experiment import ActiveExperiment
+from mlaide.connection_options import ConnectionOptions
+from mlaide.model import Experiment, RunStatus
+
+
+class StubRunServer(object):
+    """Serves the run endpoints on localhost, so that worker processes can send real requests"""
+
+    def __init__(self):
+        self.requests = []
+        self.__lock = threading.Lock()
+        self.__next_run_key = 1
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.__read_body()
+                run_key = server.record('POST', self.path, body)
+                self.__respond(200, json.dumps({'key': run_key, 'name': body.get('name'), 'status': 'RUNNING'}))
+
+            def do_PATCH(self):
+                server.record('PATCH', self.path, self.__read_body())
+                self.__respond(204)
+
+            def log_message(self, *args):
+                pass
+
+            def __read_body(self):
+                return json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+
+            def __respond(self, status: int, body: str = None):
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body or '')))
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                if body is not None:
+                    self.wfile.write(body.encode('utf-8'))
+
+        self.__http_server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = 'http://127.0.0.1:{}'.format(self.__http_server.server_address[1])
+        self.__thread = threading.Thread(target=self.__http_server.serve_forever, daemon=True)
+
+    def record(self, method: str, path: str, body) -> int:
+        with self.__lock:
+            self.requests.append((method, path, body))
+            run_key = self.__next_run_key
+            self.__next_run_key += 1
+            return run_key
+
+    def __enter__(self):
+        self.__thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__http_server.shutdown()
+        self.__http_server.server_close()
+
+
+def train(run, parameters):
+    if parameters['lr'] > 0.5:
+        raise ValueError('learning rate too high')
+
+    run.log_metric('accuracy', 1 - parameters['lr'])
+    return parameters['lr'] * parameters['depth']
+
+
+def test_grid_search_should_return_all_combinations():
+    # act
+    trials = _sweep.grid_search({'lr': [0.1, 0.2], 'depth': [3, 5, 7]})
+
+    # assert
+    assert trials == [
+        {'lr': 0.1, 'depth': 3}, {'lr': 0.1, 'depth': 5}, {'lr': 0.1, 'depth': 7},
+        {'lr': 0.2, 'depth': 3}, {'lr': 0.2, 'depth': 5}, {'lr': 0.2, 'depth': 7}
+    ]
+
+
+def test_grid_search_should_raise_error_for_sampled_parameters():
+    with pytest.raises(ValueError):
+        _sweep.grid_search({'lr': lambda rng: rng.uniform(0, 1)})
+
+
+def test_random_search_should_sample_parameters_reproducibly():
+    # arrange
+    space = {'lr': lambda rng: rng.uniform(0.001, 0.1), 'depth': [3, 5, 7]}
+
+    # act
+    trials = _sweep.random_search(space, trials=20, seed=42)
+
+    # assert
+    assert len(trials) == 20
+    assert all(0.001 <= trial['lr'] <= 0.1 and trial['depth'] in [3, 5, 7] for trial in trials)
+    assert trials == _sweep.random_search(space, trials=20, seed=42)
+
+
+def test_run_trial_should_log_parameters_and_set_completed_status(mocker: MockerFixture):
+    # arrange
+    active_run_mock = mocker.patch('mlaide._sweep.ActiveRun')
+    active_run_mock.return_value.run.key = 47
+    mocker.patch('mlaide._sweep._worker_context', _sweep._WorkerContext(
+        client_type=AuthenticatedClient, client_arguments={}, project_key='project key',
+        experiment=Experiment(key='experiment key'), git=None, options=None))
+
+    # act
+    result = _sweep._run_trial(3, {'lr': 0.1, 'depth': 2}, 'trial-3', train)
+
+    # assert
+    active_run = active_run_mock.return_value
+    assert active_run_mock.call_args.kwargs['run_name'] == 'trial-3'
+    active_run.log_parameters.assert_called_once_with({'lr': 0.1, 'depth': 2})
+    active_run.set_completed_status.assert_called_once()
+    active_run.set_failed_status.assert_not_called()
+    assert result.index == 3
+    assert result.status == RunStatus.COMPLETED
+    assert result.run_key == 47
+    assert result.result == pytest.approx(0.2)
+
+
+def test_run_trial_should_set_failed_status_if_training_raises_error(mocker: MockerFixture):
+    # arrange
+    active_run_mock = mocker.patch('mlaide._sweep.ActiveRun')
+    mocker.patch('mlaide._sweep._worker_context', _sweep._WorkerContext(
+        client_type=AuthenticatedClient, client_arguments={}, project_key='project key',
+        experiment=Experiment(key='experiment key'), git=None, options=None))
+
+    # act
+    result = _sweep._run_trial(0, {'lr': 0.9, 'depth': 2}, None, train)
+
+    # assert
+    active_run_mock.return_value.set_failed_status.assert_called_once()
+    active_run_mock.return_value.set_completed_status.assert_not_called()
+    assert result.status == RunStatus.FAILED
+    assert 'learning rate too high' in result.error
+
+
+@pytest.mark.parametrize('start_method', [m for m in ['fork', 'spawn'] if m in multiprocessing.get_all_start_methods()])
+def test_run_sweep_should_execute_each_trial_as_run_in_worker_process(start_method: str, tmp_path: Path):
+    # arrange
+    trials = [{'lr': 0.1, 'depth': 2}, {'lr': 0.9, 'depth': 2}, {'lr': 0.2, 'depth': 3}]
+
+    with StubRunServer() as server:
+        api_client = AuthenticatedClient(base_url=server.url, api_key='the key')
+        # The parent's pooled connections must not be used by the workers
+        api_client.get_httpx_client()
+
+        # act
+        results = _sweep.run_sweep(api_client=api_client,
+                                   project_key='project',
+                                   experiment=Experiment(key='experiment'),
+                                   git=None,
+                                   options=ConnectionOptions(cache_directory=str(tmp_path)),
+                                   train=train,
+                                   trials=trials,
+                                   run_name_prefix='trial',
+                                   max_workers=2,
+                                   mp_context=multiprocessing.get_context(start_method))
+        api_client.close()
+
+    # assert
+    assert [result.status for result in results] == [RunStatus.COMPLETED, RunStatus.FAILED, RunStatus.COMPLETED]
+    assert [result.parameters for result in results] == trials
+    assert results[0].result == pytest.approx(0.2)
+    assert 'learning rate too high' in results[1].error
+
+    created_runs = [body for method, path, body in server.requests if method == 'POST']
+    assert sorted(run['name'] for run in created_runs) == ['trial-0', 'trial-1', 'trial-2']
+    for result in results:
+        run_path = f'/projects/project/runs/{result.run_key}'
+        assert ('PATCH', run_path + '/parameters', result.parameters) in server.requests
+        assert ('PATCH', run_path, {'status': result.status.name}) in server.requests
+
+
+def test_active_experiment_run_sweep_should_run_grid_search_if_number_of_trials_is_not_specified(
+        mocker: MockerFixture):
+    # arrange
+    mocker.patch('mlaide.active_experiment.experiment_api')
+    mocker.patch('mlaide.active_experiment.get_git_metadata', return_value=None)
+    run_sweep_mock = mocker.patch('mlaide.active_experiment._sweep.run_sweep')
+    experiment = ActiveExperiment(mocker.Mock(), 'project key', 'experiment name')
+
+    # act
+    results = experiment.run_sweep(train, {'lr': [0.1, 0.2], 'depth': [3]}, max_workers=3)
+
+    # assert
+    assert results == run_sweep_mock.return_value
+    assert run_sweep_mock.call_args.kwargs['trials'] == [{'lr': 0.1, 'depth': 3}, {'lr': 0.2, 'depth': 3}]
+    assert run_sweep_mock.call_args.kwargs['max_workers'] == 3
+
+
+def test_active_experiment_run_sweep_should_run_random_search_if_number_of_trials_is_specified(
+        mocker: MockerFixture):
+    # arrange
+    mocker.patch('mlaide.active_experiment.experiment_api')
+    mocker.patch('mlaide.active_experiment.get_git_metadata', return_value=None)
+    run_sweep_mock = mocker.patch('mlaide.active_experiment._sweep.run_sweep')
+    experiment = ActiveExperiment(mocker.Mock(), 'project key', 'experiment name')
+    space = {'lr': lambda rng: rng.uniform(0, 1), 'depth': [3, 5]}
+
+    # act
+    experiment.run_sweep(train, space, trials=5, seed=7)
+
+    # assert
+    assert run_sweep_mock.call_args.kwargs['trials'] == _sweep.random_search(space, 5, seed=7)